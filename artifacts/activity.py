@@ -0,0 +1,120 @@
+"""
+통합 활동 로그(ActivityEvent) 갱신
+
+로그인 시도/다운로드 로그/파일 활동 로그가 기록될 때 사용자명, 제품, 카테고리, 파일명을
+복사한 ActivityEvent를 함께 추가합니다. 건별 save()는 post_save, audit 버퍼의
+일괄 기록은 audit.logs_written 시그널로 처리합니다.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import LoginAttempt, DownloadLog, ArtifactActivityLog, ActivityEvent
+from . import audit
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# 원본 로그 모델별 ActivityEvent.source 값
+SOURCES = {
+    LoginAttempt: 'login',
+    DownloadLog: 'download',
+    ArtifactActivityLog: 'artifact',
+}
+
+
+def _artifact_fields(artifact):
+    if artifact is None:
+        return {}
+    return {
+        'product': artifact.product.name,
+        'category': artifact.category.name,
+        'filename': artifact.filename,
+        'version': artifact.version_string,
+    }
+
+
+def _apply_snapshot(event, snapshot):
+    """로그에 보관된 산출물 스냅샷(Artifact.snapshot)으로 표시 필드 채우기"""
+    event.product = snapshot.get('product') or ''
+    event.category = snapshot.get('category') or ''
+    event.filename = snapshot.get('filename') or ''
+    event.version = snapshot.get('version') or ''
+
+
+def event_from_log(log):
+    """원본 로그 인스턴스(저장된 것)로 ActivityEvent 생성 (저장하지 않음)"""
+    source = SOURCES[type(log)]
+    event = ActivityEvent(
+        source=source,
+        source_id=log.pk,
+        username=log.username,
+        ip_address=log.ip_address,
+        user_agent=log.user_agent,
+        created_at=log.created_at,
+    )
+
+    if source == 'login':
+        event.event_type = 'login'
+        event.details = {'success': log.success, 'failure_reason': log.failure_reason}
+    elif source == 'download':
+        event.event_type = 'download'
+        event.details = {'download_type': log.download_type}
+        if log.download_type == 'bulk':
+            if log.snapshot:
+                event.product = log.snapshot.get('product') or ''
+                country = log.snapshot.get('country')
+            else:
+                event.product = log.product.name if log.product else ''
+                country = log.country.code if log.country else None
+            event.details.update({
+                'country': country,
+                'artifact_count': log.artifact_count,
+            })
+        elif log.snapshot:
+            _apply_snapshot(event, log.snapshot)
+        else:
+            for field, value in _artifact_fields(log.artifact).items():
+                setattr(event, field, value)
+    else:
+        event.event_type = log.action
+        if log.artifact:
+            for field, value in _artifact_fields(log.artifact).items():
+                setattr(event, field, value)
+        elif log.artifact_snapshot:
+            _apply_snapshot(event, log.artifact_snapshot)
+        event.details = {'deleted': log.artifact is None and bool(log.artifact_snapshot)}
+    return event
+
+
+def record_events(logs):
+    """
+    원본 로그들에 대한 ActivityEvent 추가 (이미 있는 (source, source_id)는 건너뜀)
+
+    통합 로그 갱신에 실패해도 원본 로그 기록은 유지되도록 savepoint 안에서 처리하고,
+    누락분은 backfill_activity_events 명령으로 다시 채울 수 있습니다.
+    """
+    events = [event_from_log(log) for log in logs if log.pk is not None]
+    if not events:
+        return 0
+    try:
+        with transaction.atomic():
+            ActivityEvent.objects.bulk_create(events, ignore_conflicts=True)
+    except Exception:
+        logger.exception('통합 활동 로그 추가 실패 (%d건)', len(events))
+        return 0
+    return len(events)
+
+
+@receiver(post_save, sender=LoginAttempt)
+@receiver(post_save, sender=DownloadLog)
+@receiver(post_save, sender=ArtifactActivityLog)
+def log_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_events([instance])
+
+
+@receiver(audit.logs_written)
+def logs_written(sender, instances, **kwargs):
+    if sender in SOURCES:
+        record_events(instances)
@@ -0,0 +1,153 @@
+"""
+다운로드 통계
+
+DownloadLog가 기록될 때 (날짜, 다운로드 유형, 산출물, 제품, 국가, 사용자)별 일일 건수
+(DownloadDailyCount)를 증가시켜 두고, 통계 API는 원본 로그 대신 이 집계만 조회합니다.
+건별 save()는 post_save, audit 버퍼의 일괄 기록은 audit.logs_written 시그널로 처리합니다.
+"""
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from collections import Counter
+from .models import Artifact, DownloadLog, DownloadDailyCount
+from . import audit
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# 통계 API group_by 값 -> DownloadDailyCount 필드
+GROUP_FIELDS = {
+    'artifact': 'artifact_id',
+    'product': 'product_id',
+    'country': 'country_id',
+    'user': 'username',
+    'download_type': 'download_type',
+}
+
+SERIES_INTERVALS = {
+    'day': None,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+# count_key() 값의 순서
+COUNT_KEY_FIELDS = ('date', 'download_type', 'artifact_id', 'product_id', 'country_id', 'username')
+
+
+def count_key(log):
+    """DownloadLog -> (date, download_type, artifact_id, product_id, country_id, username)"""
+    if log.download_type == 'bulk' or log.artifact is None:
+        product_id, country_id = log.product_id, log.country_id
+    else:
+        product_id, country_id = log.artifact.product_id, log.artifact.country_id
+    return (
+        timezone.localtime(log.created_at).date(),
+        log.download_type,
+        log.artifact_id,
+        product_id,
+        country_id,
+        log.username,
+    )
+
+
+def add_counts(keys):
+    """
+    집계 키별 건수만큼 DownloadDailyCount 증가
+
+    keys: count_key() 값의 Counter
+    키에 NULL이 없으면 (count=0) 행을 INSERT ... ON CONFLICT DO NOTHING으로 먼저 만든 뒤 F()로 증가시키므로
+    여러 프로세스가 동시에 기록해도 행이 중복되지 않습니다.
+    NULL이 있는 키는 UNIQUE 제약이 적용되지 않으므로 기존 행을 증가시키고 없을 때만 생성합니다.
+    """
+    lookups = [(dict(zip(COUNT_KEY_FIELDS, key)), count) for key, count in keys.items()]
+    with transaction.atomic():
+        DownloadDailyCount.objects.bulk_create(
+            [DownloadDailyCount(**lookup) for lookup, _ in lookups if None not in lookup.values()],
+            ignore_conflicts=True,
+        )
+        for lookup, count in lookups:
+            if not DownloadDailyCount.objects.filter(**lookup).update(count=F('count') + count):
+                DownloadDailyCount.objects.create(count=count, **lookup)
+
+
+def record_downloads(logs):
+    """기록된 다운로드 로그를 일별 집계에 반영 (실패해도 원본 로그 기록은 유지)"""
+    try:
+        add_counts(Counter(count_key(log) for log in logs))
+    except Exception:
+        logger.exception('다운로드 집계 갱신 실패 (%d건)', len(logs))
+
+
+@receiver(post_save, sender=DownloadLog)
+def download_log_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        record_downloads([instance])
+
+
+@receiver(audit.logs_written, sender=DownloadLog)
+def download_logs_written(sender, instances, **kwargs):
+    record_downloads(instances)
+
+
+def rebuild_counts(batch_size=1000):
+    """
+    남아 있는 DownloadLog로 일별 집계 재계산
+
+    보관 기간 정리(prune_audit_logs)로 원본 로그가 삭제된 날짜의 집계는 그대로 두고,
+    가장 오래된 남은 로그의 날짜부터 다시 계산합니다. 반환값: 반영한 로그 건수
+    """
+    oldest = DownloadLog.objects.order_by('created_at').values_list('created_at', flat=True).first()
+    if oldest is None:
+        return 0
+    start_date = timezone.localtime(oldest).date()
+    keys = Counter()
+    total = 0
+    logs = DownloadLog.objects.select_related('artifact').order_by('id')
+    for log in logs.iterator(chunk_size=batch_size):
+        keys[count_key(log)] += 1
+        total += 1
+    with transaction.atomic():
+        DownloadDailyCount.objects.filter(date__gte=start_date).delete()
+        add_counts(keys)
+    return total
+
+
+def top_downloads(queryset, group_by, limit=10):
+    """group_by 기준 다운로드 상위 limit개: [(키 값, 건수)]"""
+    field = GROUP_FIELDS[group_by]
+    rows = (queryset.values(field).annotate(total=Sum('count'))
+            .order_by('-total', field)[:limit])
+    return [(row[field], row['total']) for row in rows]
+
+
+def download_series(queryset, interval='day'):
+    """기간별 다운로드 건수: [(시작 날짜, 건수)]"""
+    trunc = SERIES_INTERVALS[interval]
+    if trunc is not None:
+        queryset = queryset.annotate(period=trunc('date'))
+        field = 'period'
+    else:
+        field = 'date'
+    rows = queryset.values(field).annotate(total=Sum('count')).order_by(field)
+    return [(row[field], row['total']) for row in rows]
+
+
+def describe_artifacts(artifact_ids):
+    """top_downloads(group_by='artifact') 결과 표시용 산출물 정보"""
+    artifacts = Artifact.objects.select_related('product', 'category', 'country').in_bulk(
+        [artifact_id for artifact_id in artifact_ids if artifact_id is not None])
+    return {
+        artifact_id: {
+            'filename': artifact.filename,
+            'product': artifact.product.name,
+            'category': artifact.category.name,
+            'country': artifact.country.code if artifact.country else None,
+            'version': artifact.version_string,
+        }
+        for artifact_id, artifact in artifacts.items()
+    }
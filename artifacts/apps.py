@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ArtifactsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'artifacts'
+
+    def ready(self):
+        # 로그 기록 시 통합 활동 로그(ActivityEvent)와 다운로드 집계 갱신, SQLite 연결 PRAGMA 적용,
+        # 기준 정보 변경 시 스냅샷 무효화, 산출물 삭제 시 Blob 참조 해제, 산출물 생성 시 처리 작업 등록
+        from . import activity, analytics, blobs, db, jobs, reference  # noqa: F401
@@ -0,0 +1,140 @@
+"""
+감사 로그(로그인/다운로드/파일 활동) 기록
+
+요청 처리 중에 로그 테이블에 바로 INSERT하면 SQLite 쓰기 잠금 때문에 요청이 줄을 서게 되므로,
+AUDIT_LOG_MODE에 따라 기록 방식을 고릅니다.
+- 'async' : 프로세스 내 버퍼에 쌓아 두고 백그라운드 스레드가 bulk_create로 모아서 기록
+            (AUDIT_LOG_BATCH_SIZE건이 모이거나 AUDIT_LOG_FLUSH_INTERVAL초가 지나면 기록,
+             프로세스 종료 시 남은 로그 기록). 비정상 종료 시 마지막 주기의 로그는 유실될 수 있음
+- 'sync'  : 요청 안에서 바로 save() (유실 없음)
+
+bulk_create는 post_save 시그널을 보내지 않으므로, 일괄 기록 후에는 logs_written 시그널을 보냅니다.
+(건별 save()로 기록된 로그는 post_save만 발생)
+"""
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.dispatch import Signal
+import atexit
+import logging
+import os
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_MODES = ('sync', 'async')
+
+# 버퍼의 로그를 bulk_create로 기록한 직후 (같은 트랜잭션 안), 인자: sender=모델, instances=기록된 인스턴스 목록
+logs_written = Signal()
+
+
+def audit_log_mode():
+    mode = getattr(settings, 'AUDIT_LOG_MODE', 'async')
+    if mode not in AUDIT_LOG_MODES:
+        raise ValueError(f'알 수 없는 AUDIT_LOG_MODE입니다: {mode}')
+    return mode
+
+
+class AuditLogBuffer:
+    """저장되지 않은 로그 모델 인스턴스를 모아 두었다가 모델별 bulk_create로 기록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = []
+        self._thread = None
+        self._pid = None
+
+    @property
+    def batch_size(self):
+        return getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 100)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 1.0)
+
+    @property
+    def max_pending(self):
+        return getattr(settings, 'AUDIT_LOG_MAX_PENDING', 10000)
+
+    def add(self, instance):
+        with self._lock:
+            self._ensure_thread()
+            self._pending.append(instance)
+            pending = len(self._pending)
+        if pending >= self.max_pending:
+            # DB가 계속 막혀 버퍼가 한도를 넘으면 요청 스레드에서 직접 기록 (메모리 무한 증가 방지)
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+
+    def flush(self):
+        """버퍼의 로그를 모두 기록 (기록한 건수 반환)"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            by_model = {}
+            for instance in batch:
+                by_model.setdefault(type(instance), []).append(instance)
+            written = 0
+            for model, instances in by_model.items():
+                written += self._write(model, instances)
+            return written
+
+    def _write(self, model, instances):
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(instances, batch_size=self.batch_size)
+                logs_written.send(sender=model, instances=instances)
+            return len(instances)
+        except Exception:
+            logger.exception('감사 로그 일괄 기록 실패, 건별로 다시 기록합니다 (%s %d건)',
+                             model.__name__, len(instances))
+        # 일부 행(예: 그 사이 삭제된 산출물 참조) 때문에 전체가 실패한 경우 나머지는 살림
+        written = 0
+        for instance in instances:
+            try:
+                instance.save(force_insert=True)
+                written += 1
+            except Exception:
+                logger.exception('감사 로그 기록 실패로 폐기합니다: %s', model.__name__)
+        return written
+
+    def _ensure_thread(self):
+        # fork된 워커 프로세스(gunicorn --preload 등)에서는 스레드를 새로 띄움
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('감사 로그 기록 스레드 오류')
+            finally:
+                close_old_connections()
+
+
+_buffer = AuditLogBuffer()
+atexit.register(_buffer.flush)
+
+
+def record(instance):
+    """로그 모델 인스턴스(저장 전)를 AUDIT_LOG_MODE에 따라 기록"""
+    if audit_log_mode() == 'sync':
+        instance.save()
+    else:
+        _buffer.add(instance)
+
+
+def flush():
+    """버퍼에 쌓인 로그를 즉시 기록"""
+    return _buffer.flush()
@@ -0,0 +1,165 @@
+"""
+내용 주소 기반 파일 저장 (중복 제거)
+
+산출물 파일은 SHA-256 해시로 이름 붙인 Blob(blobs/ab/cd/<해시>)에 한 번만 저장하고,
+같은 내용의 산출물(다른 국가/버전 등)은 같은 Blob을 참조합니다. Blob.ref_count는 참조하는
+산출물 수이며, 산출물이 삭제되어 0이 되면 커밋 후 Blob과 파일을 지웁니다 (delete_unreferenced_blob).
+
+업로드 파일의 해시는 HashingMemoryFileUploadHandler/HashingTemporaryFileUploadHandler가
+요청 본문을 받으면서 계산하므로 저장 전에 파일을 다시 읽지 않습니다.
+기존 타임스탬프 디렉토리 구조의 파일은 dedupe_artifact_files 명령으로 Blob으로 옮깁니다.
+"""
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import Artifact, Blob
+import hashlib
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+
+
+def blob_name(sha256):
+    """저장소 내 Blob 경로: blobs/ab/cd/<해시> (디렉토리당 파일 수 제한)"""
+    return f'blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def blob_storage():
+    return Blob._meta.get_field('file').storage
+
+
+def content_sha256(content):
+    """파일 내용의 SHA-256 (업로드 핸들러가 계산해 둔 값이 있으면 그대로 사용)"""
+    sha256 = getattr(content, 'sha256', None)
+    if sha256:
+        return sha256
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _save_content(storage, name, content):
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    saved = storage.save(name, content)
+    if saved != name:
+        # 다른 프로세스가 같은 내용을 방금 저장함 - 이름이 바뀐 사본은 삭제
+        storage.delete(saved)
+
+
+def store_blob(content):
+    """
+    파일 내용을 Blob으로 저장하고 참조 수 증가
+
+    같은 해시의 Blob이 있으면 파일은 저장하지 않습니다.
+    임시 파일(temporary_file_path 제공)은 복사하지 않고 Blob 경로로 이동합니다.
+    반환값: Blob
+    """
+    sha256 = content_sha256(content)
+    name = blob_name(sha256)
+    storage = blob_storage()
+    for _attempt in range(2):
+        try:
+            with transaction.atomic():
+                if Blob.objects.filter(sha256=sha256).update(ref_count=F('ref_count') + 1):
+                    # 삭제 도중 중단되어 파일 없이 남은 Blob이면 파일을 다시 저장
+                    if not storage.exists(name):
+                        _save_content(storage, name, content)
+                    return Blob.objects.get(sha256=sha256)
+                # 트랜잭션이 실패해도 남은 파일은 같은 내용이므로 다음 저장 때 재사용됨
+                if not storage.exists(name):
+                    _save_content(storage, name, content)
+                return Blob.objects.create(sha256=sha256, file=name, size=storage.size(name), ref_count=1)
+        except IntegrityError:
+            # 다른 요청이 같은 내용을 먼저 저장한 경우 참조 수만 올림
+            continue
+    raise RuntimeError(f'Blob을 저장하지 못했습니다: {sha256}')
+
+
+def release_blob(blob_id):
+    """참조 수 감소, 0이 되면 커밋 후 Blob과 파일 삭제"""
+    with transaction.atomic():
+        Blob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') - 1)
+        if Blob.objects.filter(pk=blob_id, ref_count__lte=0).exists():
+            transaction.on_commit(lambda: delete_unreferenced_blob(blob_id))
+
+
+def delete_unreferenced_blob(blob_id):
+    """
+    참조 수가 0인 Blob과 파일 삭제
+
+    같은 내용을 저장하는 store_blob은 이 행의 참조 수를 올리므로, 행을 잠그고 참조 수를 다시 확인한 뒤
+    지웁니다. 파일은 삭제 표시 이름(<경로>.deleting)으로 옮겨 두었다가 커밋 후 지우고,
+    트랜잭션이 실패하면 원래 이름으로 되돌립니다.
+    """
+    storage = blob_storage()
+    path = trash = None
+    try:
+        with transaction.atomic():
+            blob = Blob.objects.select_for_update().filter(pk=blob_id, ref_count__lte=0).first()
+            if blob is None:
+                return
+            path = storage.path(blob.file.name)
+            if os.path.exists(path):
+                trash = f'{path}.deleting'
+                os.replace(path, trash)
+            blob.delete()
+    except Exception:
+        if trash is not None:
+            os.replace(trash, path)
+        raise
+    if trash is not None:
+        os.remove(trash)
+
+
+@receiver(post_delete, sender=Artifact)
+def artifact_deleted(sender, instance, **kwargs):
+    if instance.blob_id is not None:
+        try:
+            release_blob(instance.blob_id)
+        except Exception:
+            logger.exception('Blob 참조 해제 실패 (blob_id=%s)', instance.blob_id)
+
+
+class HashingMemoryFileUploadHandler(MemoryFileUploadHandler):
+    """메모리 업로드 핸들러 + 받는 동안 SHA-256 계산 (결과: uploaded_file.sha256)"""
+
+    def new_file(self, *args, **kwargs):
+        # 메모리 핸들러는 new_file에서 StopFutureHandlers를 발생시키므로 먼저 초기화
+        self.digest = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.activated:
+            self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        if uploaded_file is not None:
+            uploaded_file.sha256 = self.digest.hexdigest()
+        return uploaded_file
+
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """임시 파일 업로드 핸들러 + 디스크에 쓰는 동안 SHA-256 계산 (결과: uploaded_file.sha256)"""
+
+    def new_file(self, *args, **kwargs):
+        self.digest = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.digest.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.sha256 = self.digest.hexdigest()
+        return uploaded_file
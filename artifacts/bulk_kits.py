@@ -0,0 +1,419 @@
+"""
+제품별 일괄 다운로드(세일즈 킷) ZIP 생성 및 디스크 캐시
+
+완성된 킷은 MEDIA_ROOT/BULK_KIT_CACHE_DIR 아래에 (산출물 id, 파일 해시) 목록의
+해시를 이름으로 저장합니다. 구성 파일이 하나라도 바뀌면 키가 달라지므로
+오래된 킷이 제공되는 일은 없고, 업로드/삭제 시에는 해당 제품/국가의 킷을 정리합니다.
+전체 용량이 BULK_KIT_CACHE_MAX_BYTES를 넘으면 가장 오래 사용되지 않은 킷부터 삭제합니다.
+
+pptx/xlsx/docx/pdf처럼 이미 압축된 형식은 다시 deflate해도 거의 줄지 않으므로
+확장자와 앞부분 샘플의 압축률을 보고 항목별로 무압축(STORED) 저장을 선택합니다.
+
+BULK_ZIP_WORKERS가 2 이상이면 deflate 항목의 읽기/압축을 스레드 풀에서 병렬로 처리합니다.
+무압축 항목은 복사만 하면 되므로 스풀 파일을 거치지 않고 바로 기록합니다.
+
+읽지 못한 파일은 킷에서 빠지고 stats['skipped']에 세며, 이런 킷은 캐시하지 않습니다.
+"""
+from django.conf import settings
+from django.utils import timezone
+from django.utils.text import slugify
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZIP_STORED, ZIP_DEFLATED
+from .zipstream import ZipStream, compress_file
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import zlib
+
+
+logger = logging.getLogger(__name__)
+
+# ZIP 구성 방식이 바뀌면 올려서 기존 캐시를 재사용하지 않도록 함
+KIT_FORMAT_VERSION = 2
+
+# 이미 압축된 파일 형식 (설정 BULK_ZIP_STORED_EXTENSIONS로 변경 가능)
+DEFAULT_STORED_EXTENSIONS = [
+    '.pptx', '.xlsx', '.docx', '.hwpx', '.pdf',
+    '.zip', '.7z', '.gz', '.rar',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp4', '.mov', '.avi', '.mkv', '.mp3',
+]
+
+
+def compression_policy():
+    """항목별 압축 방식 결정에 쓰는 설정값"""
+    return {
+        'stored_extensions': sorted(ext.lower() for ext in getattr(
+            settings, 'BULK_ZIP_STORED_EXTENSIONS', DEFAULT_STORED_EXTENSIONS)),
+        'deflated_extensions': sorted(ext.lower() for ext in getattr(
+            settings, 'BULK_ZIP_DEFLATED_EXTENSIONS', [])),
+        'sample_size': getattr(settings, 'BULK_ZIP_SAMPLE_SIZE', 64 * 1024),
+        'min_savings': getattr(settings, 'BULK_ZIP_MIN_SAVINGS', 0.1),
+    }
+
+
+def choose_compress_type(filename, fileobj, policy):
+    """
+    항목의 압축 방식 결정
+
+    1. BULK_ZIP_DEFLATED_EXTENSIONS -> 항상 deflate
+    2. BULK_ZIP_STORED_EXTENSIONS -> 무압축 저장
+    3. 그 외: 앞부분 샘플을 빠르게 압축해 보고 절감률이 BULK_ZIP_MIN_SAVINGS 미만이면 무압축
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in policy['deflated_extensions']:
+        return ZIP_DEFLATED
+    if ext in policy['stored_extensions']:
+        return ZIP_STORED
+    if policy['sample_size'] <= 0:
+        return ZIP_DEFLATED
+
+    sample = fileobj.read(policy['sample_size'])
+    fileobj.seek(0)
+    if not sample:
+        return ZIP_STORED
+    savings = 1 - len(zlib.compress(sample, 1)) / len(sample)
+    return ZIP_DEFLATED if savings >= policy['min_savings'] else ZIP_STORED
+
+
+def new_kit_stats():
+    """킷 생성 통계 (DownloadLog.details에 기록)"""
+    return {
+        'files': 0,
+        'skipped': 0,
+        'stored': 0,
+        'deflated': 0,
+        'bytes_in': 0,
+        'bytes_out': 0,
+        'bytes_saved': 0,
+        'compress_cpu_ms': 0.0,
+    }
+
+
+def kit_cache_enabled():
+    return getattr(settings, 'BULK_KIT_CACHE_MAX_BYTES', 0) > 0
+
+
+def kit_cache_root():
+    return Path(settings.MEDIA_ROOT) / getattr(settings, 'BULK_KIT_CACHE_DIR', 'bulk_kits')
+
+
+def archive_name(artifact):
+    """ZIP 내부 경로: 카테고리명/파일명"""
+    return f"{slugify(artifact.category.name)}/{artifact.filename}"
+
+
+def kit_manifest_key(artifacts):
+    """킷 구성 (산출물 id, 파일 해시, ZIP 경로) 목록의 SHA-256"""
+    manifest = [KIT_FORMAT_VERSION, compression_policy()] + [
+        [artifact.id, artifact.checksum or artifact.file.name, archive_name(artifact)]
+        for artifact in artifacts
+    ]
+    raw = json.dumps(manifest, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _kit_dir(product, country):
+    return kit_cache_root() / (country.code if country else 'Global') / str(product.id)
+
+
+def kit_path(product, country, artifacts):
+    return _kit_dir(product, country) / f'{kit_manifest_key(artifacts)}.zip'
+
+
+def open_cached_kit(path):
+    """캐시된 킷 파일을 열어 반환 (없으면 None). 사용 시각을 갱신해 LRU 순서 유지"""
+    try:
+        kit_file = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return kit_file
+
+
+class KitEntry:
+    """ZIP에 넣을 파일 하나 - open_file()은 새 바이너리 파일 객체를 반환"""
+
+    def __init__(self, arcname, filename, open_file, size, date_time):
+        self.arcname = arcname
+        self.filename = filename
+        self.open_file = open_file
+        self.size = size
+        self.date_time = date_time
+
+
+def artifact_entries(artifacts, stats=None):
+    """산출물 목록 -> KitEntry 목록 (파일이 없는 산출물 제외, stats가 있으면 skipped에 셈)"""
+    entries = []
+    for artifact in artifacts:
+        if not artifact.file:
+            continue
+        try:
+            size = artifact.file.size
+        except OSError:
+            # Skip files that can't be read
+            if stats is not None:
+                stats['skipped'] += 1
+            continue
+        storage, name = artifact.file.storage, artifact.file.name
+        entries.append(KitEntry(
+            archive_name(artifact),
+            artifact.filename,
+            lambda storage=storage, name=name: storage.open(name, 'rb'),
+            size,
+            timezone.localtime(artifact.created_at).timetuple()[:6],
+        ))
+    return entries
+
+
+def bulk_zip_workers():
+    return getattr(settings, 'BULK_ZIP_WORKERS', 1)
+
+
+def iter_kit_zip(artifacts, stats=None):
+    """
+    산출물 목록을 ZIP 스트림으로 생성 (bytes 청크 제너레이터)
+
+    각 파일을 BULK_DOWNLOAD_CHUNK_SIZE 단위로 읽어 바로 압축/전송하므로
+    메모리 사용량은 파일 크기와 무관하게 일정합니다.
+    stats(new_kit_stats())를 넘기면 압축 통계를 누적합니다.
+    """
+    if stats is None:
+        stats = new_kit_stats()
+    return iter_zip_entries(artifact_entries(artifacts, stats), stats, workers=bulk_zip_workers())
+
+
+def iter_zip_entries(entries, stats=None, workers=1):
+    """
+    KitEntry 목록을 ZIP 스트림으로 생성
+
+    workers가 2 이상이면 deflate 항목의 읽기/압축을 스레드 풀에서 병렬로 수행하고
+    결과는 원래 순서대로 기록합니다.
+    """
+    if stats is None:
+        stats = new_kit_stats()
+    policy = compression_policy()
+    stream = ZipStream(chunk_size=getattr(settings, 'BULK_DOWNLOAD_CHUNK_SIZE', 64 * 1024))
+    if workers > 1:
+        yield from _iter_parallel(stream, entries, stats, policy, workers)
+    else:
+        for entry in entries:
+            yield from _write_entry(stream, entry, stats, policy)
+    yield from stream.close()
+
+
+def _skip_entry(stats, entry, error):
+    logger.warning('일괄 다운로드 항목을 읽지 못해 제외합니다 (%s): %s', entry.arcname, error)
+    stats['skipped'] += 1
+
+
+def _write_entry(stream, entry, stats, policy, compress_type=None):
+    """항목을 읽으면서 바로 압축/기록 (파일을 열지 못하면 제외)"""
+    try:
+        f = entry.open_file()
+    except Exception as e:
+        _skip_entry(stats, entry, e)
+        return
+    with f:
+        if compress_type is None:
+            compress_type = choose_compress_type(entry.filename, f, policy)
+        yield from stream.write_file(
+            entry.arcname, f,
+            size=entry.size,
+            date_time=entry.date_time,
+            compress_type=compress_type,
+        )
+    _add_entry_stats(stats, stream.entries[-1])
+
+
+def _compress_entry(entry, policy, chunk_size):
+    """
+    작업 스레드: 파일을 열어 압축 방식 결정 후 deflate 항목만 스풀 파일로 압축
+
+    무압축(STORED) 항목은 None을 반환하고 원래 스레드에서 _write_entry()로 바로 기록합니다.
+    """
+    with entry.open_file() as f:
+        compress_type = choose_compress_type(entry.filename, f, policy)
+        if compress_type == ZIP_STORED:
+            return None
+        return compress_file(f, compress_type, chunk_size=chunk_size)
+
+
+def _iter_parallel(stream, entries, stats, policy, workers):
+    # 동시에 처리 중인 항목 수를 제한해 스풀 파일이 무한정 쌓이지 않도록 함
+    window = workers * 2
+    pending = deque()
+    entries = iter(entries)
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bulk-zip')
+    try:
+        while True:
+            while len(pending) < window:
+                entry = next(entries, None)
+                if entry is None:
+                    break
+                pending.append((entry, executor.submit(_compress_entry, entry, policy, stream.chunk_size)))
+            if not pending:
+                break
+
+            entry, future = pending.popleft()
+            try:
+                data = future.result()
+            except Exception as e:
+                _skip_entry(stats, entry, e)
+                continue
+            if data is None:
+                yield from _write_entry(stream, entry, stats, policy, ZIP_STORED)
+                continue
+            try:
+                yield from stream.write_compressed(entry.arcname, data, date_time=entry.date_time)
+            finally:
+                data.close()
+            _add_entry_stats(stats, stream.entries[-1])
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        # 전송이 중단된 경우 이미 압축된 스풀 파일 정리
+        for _, future in pending:
+            if not future.cancelled() and future.exception() is None and future.result():
+                future.result().close()
+
+
+def _add_entry_stats(stats, entry):
+    stats['files'] += 1
+    stats['stored' if entry.compress_type == ZIP_STORED else 'deflated'] += 1
+    stats['bytes_in'] += entry.file_size
+    stats['bytes_out'] += entry.compress_size
+    stats['bytes_saved'] = stats['bytes_in'] - stats['bytes_out']
+    stats['compress_cpu_ms'] = round(stats['compress_cpu_ms'] + entry.cpu_time * 1000, 3)
+
+
+def _stats_path(path):
+    return path.with_suffix('.json')
+
+
+def cached_kit_stats(path):
+    """캐시된 킷을 만들 때 기록한 압축 통계 (없으면 빈 dict)"""
+    try:
+        with open(_stats_path(path), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def iter_kit_zip_and_store(artifacts, path, stats=None):
+    """
+    ZIP 스트림을 클라이언트로 보내면서 동시에 캐시 파일로 기록
+
+    끝까지 생성된 경우에만 임시 파일을 캐시 경로로 옮기므로,
+    중간에 연결이 끊기면 불완전한 킷이 남지 않습니다.
+    캐시 기록은 부가 작업이므로 실패해도(디스크 부족, 전송 중 invalidate_kits가 디렉터리를 삭제 등)
+    전송은 계속하고 킷만 저장하지 않습니다.
+    """
+    if stats is None:
+        stats = new_kit_stats()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.part')
+        tmp_file = os.fdopen(fd, 'wb')
+    except OSError:
+        yield from iter_kit_zip(artifacts, stats)
+        return
+
+    try:
+        for chunk in iter_kit_zip(artifacts, stats):
+            if tmp_file is not None:
+                try:
+                    tmp_file.write(chunk)
+                except OSError:
+                    _discard_part(tmp_file, tmp_path)
+                    tmp_file = None
+            yield chunk
+    except BaseException:
+        if tmp_file is not None:
+            _discard_part(tmp_file, tmp_path)
+        raise
+    if tmp_file is None:
+        return
+    if stats['skipped']:
+        # 빠진 파일이 있는 킷은 다음 요청에서 다시 만들도록 저장하지 않음
+        _discard_part(tmp_file, tmp_path)
+        return
+
+    try:
+        tmp_file.close()
+        os.replace(tmp_path, path)
+    except OSError:
+        _discard_part(tmp_file, tmp_path)
+        return
+    try:
+        with open(_stats_path(path), 'w', encoding='utf-8') as f:
+            json.dump(stats, f)
+    except OSError:
+        pass
+    evict_kits()
+
+
+def _discard_part(tmp_file, tmp_path):
+    try:
+        tmp_file.close()
+    except OSError:
+        pass
+    try:
+        os.unlink(tmp_path)
+    except OSError:
+        pass
+
+
+def invalidate_kits(product, country):
+    """제품/국가의 캐시된 킷 삭제 (업로드/삭제 시 호출)"""
+    shutil.rmtree(_kit_dir(product, country), ignore_errors=True)
+
+
+def evict_kits(max_bytes=None):
+    """
+    전체 킷 용량이 예산을 넘으면 가장 오래 사용되지 않은 파일부터 삭제
+
+    킷(.zip)과 함께 생성 중이거나 남겨진 임시 파일(.part)도 용량에 포함하고,
+    킷 없이 남은 통계 파일(.json)은 바로 삭제합니다.
+    """
+    if max_bytes is None:
+        max_bytes = getattr(settings, 'BULK_KIT_CACHE_MAX_BYTES', 0)
+
+    files = []
+    total = 0
+    for path in kit_cache_root().glob('*/*/*'):
+        if path.suffix not in ('.zip', '.part', '.json'):
+            continue
+        if path.suffix == '.json' and not path.with_suffix('.zip').exists():
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        total += stat.st_size
+        if path.suffix != '.json':
+            files.append((stat.st_mtime, stat.st_size, path))
+
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        if path.suffix == '.zip':
+            stats_path = _stats_path(path)
+            try:
+                total -= stats_path.stat().st_size
+                stats_path.unlink()
+            except OSError:
+                pass
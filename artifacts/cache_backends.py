@@ -0,0 +1,205 @@
+"""
+워커 간 공유 캐시 백엔드
+
+LocMemCache는 프로세스마다 따로 있어 gunicorn 워커 N개면 캐시가 N벌 생기고,
+한 워커에서 올린 세대 카운터(matrix.invalidate_matrix_cache 등)를 다른 워커가 보지 못합니다.
+SQLiteCache는 같은 서버의 모든 워커가 하나의 SQLite 파일(LOCATION)을 공유합니다.
+
+- incr/decr, add는 쓰기 잠금(BEGIN IMMEDIATE) 안에서 처리되어 여러 프로세스가 동시에 호출해도 원자적
+- 정수 값은 INTEGER로, 그 외 값은 pickle로 저장
+- OPTIONS['MAX_SIZE'](bytes) 또는 MAX_ENTRIES를 넘으면 만료된 항목, 그다음 만료 시각이 있는 항목 중
+  오래 전에 저장된 것부터 삭제 (세대 카운터처럼 timeout=None인 항목은 마지막에 삭제)
+"""
+from contextlib import contextmanager
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL,
+    stored_at REAL NOT NULL
+)
+'''
+
+PRAGMAS = (
+    'PRAGMA journal_mode = wal',
+    'PRAGMA synchronous = normal',
+    'PRAGMA busy_timeout = 5000',
+)
+
+# 만료된 항목 -> 만료 시각이 있는 항목 -> 오래 전에 저장된 항목 순으로 삭제
+EVICTION_ORDER = 'expires IS NULL, stored_at, key'
+
+
+class SQLiteCache(BaseCache):
+    """SQLite 파일 기반 공유 캐시 (CACHES LOCATION = DB 파일 경로)"""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._location = str(location)
+        options = params.get('OPTIONS', {})
+        self._max_size = int(options.get('MAX_SIZE', 64 * 1024 * 1024))
+        self._local = threading.local()
+
+    # 연결 (스레드/프로세스별)
+
+    def _connection(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            # fork된 자식 프로세스는 부모의 연결을 쓰지 않음
+            os.makedirs(os.path.dirname(os.path.abspath(self._location)), exist_ok=True)
+            connection = sqlite3.connect(self._location, isolation_level=None)
+            for pragma in PRAGMAS:
+                connection.execute(pragma)
+            connection.execute(SCHEMA)
+            local.connection, local.pid = connection, os.getpid()
+        return local.connection
+
+    @contextmanager
+    def _write(self):
+        """쓰기 트랜잭션 (시작 시 쓰기 잠금을 잡아 읽고-쓰기가 원자적)"""
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    # 값 변환
+
+    @staticmethod
+    def _encode(value):
+        if type(value) is int:
+            return value, 8
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return data, len(data)
+
+    @staticmethod
+    def _decode(value):
+        return value if isinstance(value, int) else pickle.loads(value)
+
+    def _live_value(self, connection, key):
+        """만료되지 않은 항목의 (value,) 행, 없으면 None"""
+        return connection.execute(
+            'SELECT value FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+
+    # BaseCache API
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._live_value(self._connection(), key)
+        return default if row is None else self._decode(row[0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        placeholders = ', '.join('?' * len(key_map))
+        rows = self._connection().execute(
+            f'SELECT key, value FROM cache_entry WHERE key IN ({placeholders}) '
+            f'AND (expires IS NULL OR expires > ?)',
+            (*key_map, time.time()),
+        ).fetchall()
+        return {key_map[key]: self._decode(value) for key, value in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            self._store(connection, key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            if self._live_value(connection, key) is not None:
+                return False
+            self._store(connection, key, value, timeout)
+            return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            cursor = connection.execute(
+                'UPDATE cache_entry SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+                (self.get_backend_timeout(timeout), key, time.time()),
+            )
+            return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            return connection.execute('DELETE FROM cache_entry WHERE key = ?', (key,)).rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._live_value(self._connection(), key) is not None
+
+    def incr(self, key, delta=1, version=None):
+        """원자적 증가 (다른 프로세스의 incr와 겹쳐도 유실 없음)"""
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as connection:
+            row = self._live_value(connection, key)
+            if row is None:
+                raise ValueError("Key '%s' not found" % key)
+            if not isinstance(row[0], int):
+                raise TypeError("Key '%s' is not an integer" % key)
+            value = row[0] + delta
+            connection.execute('UPDATE cache_entry SET value = ? WHERE key = ?', (value, key))
+            return value
+
+    def clear(self):
+        with self._write() as connection:
+            connection.execute('DELETE FROM cache_entry')
+
+    def close(self, **kwargs):
+        # 요청마다 닫지 않고 스레드별 연결을 재사용
+        pass
+
+    # 저장 / 축출
+
+    def _store(self, connection, key, value, timeout):
+        data, size = self._encode(value)
+        connection.execute(
+            'INSERT INTO cache_entry (key, value, size, expires, stored_at) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, '
+            'expires = excluded.expires, stored_at = excluded.stored_at',
+            (key, data, size, self.get_backend_timeout(timeout), time.time()),
+        )
+        self._cull(connection)
+
+    def _cull(self, connection):
+        count, total_size = connection.execute('SELECT count(*), total(size) FROM cache_entry').fetchone()
+        if count <= self._max_entries and total_size <= self._max_size:
+            return
+        connection.execute('DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))
+        count, total_size = connection.execute('SELECT count(*), total(size) FROM cache_entry').fetchone()
+        if count > self._max_entries:
+            # Django 기본 백엔드와 같이 1/CULL_FREQUENCY만큼 삭제 (0이면 전체 삭제)
+            limit = count // self._cull_frequency if self._cull_frequency else count
+            connection.execute(
+                f'DELETE FROM cache_entry WHERE key IN '
+                f'(SELECT key FROM cache_entry ORDER BY {EVICTION_ORDER} LIMIT ?)',
+                (max(limit, count - self._max_entries),),
+            )
+            total_size = connection.execute('SELECT total(size) FROM cache_entry').fetchone()[0]
+        if total_size > self._max_size:
+            # 남는 크기가 MAX_SIZE의 (1 - 1/CULL_FREQUENCY) 이하가 될 때까지 앞에서부터 삭제
+            keep = self._max_size - (self._max_size // self._cull_frequency if self._cull_frequency else self._max_size)
+            connection.execute(
+                f'DELETE FROM cache_entry WHERE key IN ('
+                f'SELECT key FROM (SELECT key, size, sum(size) OVER (ORDER BY {EVICTION_ORDER}) AS running '
+                f'FROM cache_entry) WHERE running - size < ?)',
+                (total_size - keep,),
+            )
+
@@ -0,0 +1,47 @@
+"""
+DB 연결 설정
+
+SQLite는 연결이 만들어질 때(connection_created 시그널) SQLITE_PRAGMAS를 적용합니다.
+- journal_mode=WAL   : 쓰기 중에도 읽기가 막히지 않고, 커밋마다 저널 파일을 새로 쓰지 않음
+- synchronous=NORMAL : WAL에서는 전원 장애 시 마지막 커밋만 유실될 수 있고 DB 파일은 손상되지 않음
+- busy_timeout       : 다른 프로세스가 쓰기 잠금을 잡고 있으면 바로 'database is locked' 대신 대기 (ms)
+- mmap_size          : 읽기를 메모리 매핑으로 처리 (bytes)
+
+journal_mode=WAL은 DB 파일에 기록되므로 한 번 적용되면 이후 연결도 WAL을 사용합니다.
+WAL 모드에서는 db.sqlite3-wal, db.sqlite3-shm 파일이 함께 생기므로 DB 디렉토리에 쓰기 권한이 필요합니다.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+import re
+
+
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+
+
+def sqlite_pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', {})
+
+
+def pragma_statements(pragmas):
+    """{'journal_mode': 'wal', ...} -> ['PRAGMA journal_mode = wal', ...]"""
+    statements = []
+    for name, value in pragmas.items():
+        if not PRAGMA_NAME.match(name) or not re.match(r'^\w+$', str(value)):
+            raise ValueError(f'잘못된 SQLite PRAGMA 설정: {name}={value!r}')
+        statements.append(f'PRAGMA {name} = {value}')
+    return statements
+
+
+def apply_pragmas(cursor, pragmas):
+    """DB-API cursor에 PRAGMA 적용 (bench_db_writes 명령의 sqlite3 연결에서도 사용)"""
+    for statement in pragma_statements(pragmas):
+        cursor.execute(statement)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, sqlite_pragmas())
@@ -0,0 +1,240 @@
+"""
+개별 산출물 파일 전송
+
+DOWNLOAD_BACKEND 설정에 따라 파일 본문 전송을 웹 서버에 맡기거나 Django에서 직접 보냅니다.
+- 'x-accel'    : nginx X-Accel-Redirect (DOWNLOAD_ACCEL_REDIRECT_PREFIX의 internal location)
+- 'x-sendfile' : Apache mod_xsendfile / lighttpd X-Sendfile (파일 절대 경로)
+- 'django'     : Django 응답으로 전송. 실제 OS 파일 객체를 넘기므로 gunicorn 등
+                 WSGI 서버의 wsgi.file_wrapper가 os.sendfile()로 커널에서 바로 복사합니다.
+다운로드 로그 기록과 권한 확인은 어느 방식이든 Django에서 처리합니다.
+
+조건부 요청(If-None-Match/If-Modified-Since)은 파일 해시 기반 ETag와 등록일로
+304를 돌려주고, 'django' 방식에서는 Range 요청(다중 구간 포함)에 206으로 응답합니다.
+웹 서버 위임 방식에서는 Range 처리를 nginx/Apache가 맡습니다.
+"""
+from django.conf import settings
+from django.http import HttpResponse, FileResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.crypto import get_random_string
+from django.utils.http import http_date, parse_http_date_safe
+from urllib.parse import quote
+import mimetypes
+import os
+import re
+
+
+DOWNLOAD_BACKENDS = ('django', 'x-accel', 'x-sendfile')
+
+# 이보다 많은 구간을 요청하면 Range를 무시하고 전체 파일 전송 (과도한 분할 요청 방지)
+MAX_RANGES = 16
+RANGE_CHUNK_SIZE = 64 * 1024
+
+BYTE_RANGE_RE = re.compile(r'^\s*(\d*)\s*-\s*(\d*)\s*$')
+
+
+def download_backend():
+    backend = getattr(settings, 'DOWNLOAD_BACKEND', 'django')
+    if backend not in DOWNLOAD_BACKENDS:
+        raise ValueError(f'알 수 없는 DOWNLOAD_BACKEND입니다: {backend}')
+    return backend
+
+
+def content_disposition(filename):
+    """한글 파일명을 위한 RFC 5987 Content-Disposition 값"""
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
+
+
+def _local_path(field_file):
+    """로컬 파일 시스템 저장소의 절대 경로 (원격 저장소면 None)"""
+    try:
+        return field_file.path
+    except NotImplementedError:
+        return None
+
+
+def artifact_etag(artifact):
+    """파일 해시 기반 강한 ETag (해시가 없으면 id/등록일 기반 약한 ETag)"""
+    if artifact.checksum:
+        return f'"{artifact.checksum}"'
+    return f'W/"{artifact.id}-{int(artifact.created_at.timestamp())}"'
+
+
+def artifact_last_modified(artifact):
+    return int(artifact.created_at.timestamp())
+
+
+def parse_range_header(header, size):
+    """
+    Range 헤더 해석
+
+    반환값: None (Range 없음/해석 불가 -> 전체 전송), [] (만족 가능한 구간 없음 -> 416),
+            [(start, end), ...] (end 포함)
+    """
+    if not header or '=' not in header:
+        return None
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+    specs = spec.split(',')
+    if len(specs) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for item in specs:
+        match = BYTE_RANGE_RE.match(item)
+        if not match:
+            return None
+        first, last = match.groups()
+        if first == '' and last == '':
+            return None
+        if first == '':
+            # 마지막 N 바이트 (suffix range)
+            length = int(last)
+            if length == 0 or size == 0:
+                # 빈 파일에는 만족 가능한 구간이 없음
+                continue
+            ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        if start >= size:
+            continue
+        end = int(last) if last else size - 1
+        ranges.append((start, min(end, size - 1)))
+    return ranges
+
+
+def range_applies(request, etag, last_modified):
+    """If-Range 조건이 있으면 현재 파일과 일치할 때만 Range 적용"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        # If-Range는 강한 ETag 비교만 허용
+        return not etag.startswith('W/') and if_range.strip() == etag
+    if_range_date = parse_http_date_safe(if_range)
+    # 날짜는 Last-Modified와 정확히 같을 때만 일치 (RFC 9110 13.1.5)
+    return if_range_date is not None and if_range_date == last_modified
+
+
+def _iter_file_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            block = f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def _iter_multipart(path, ranges, parts, boundary):
+    for (start, end), part_header in zip(ranges, parts):
+        yield part_header
+        yield from _iter_file_range(path, start, end)
+        yield b'\r\n'
+    yield f'--{boundary}--\r\n'.encode('ascii')
+
+
+def _range_response(path, size, ranges, content_type):
+    """206 Partial Content 응답 (구간이 여러 개면 multipart/byteranges)"""
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response = StreamingHttpResponse(_iter_file_range(path, start, end),
+                                         status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        return response
+
+    boundary = get_random_string(32)
+    parts = [
+        (f'--{boundary}\r\n'
+         f'Content-Type: {content_type}\r\n'
+         f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n').encode('ascii')
+        for start, end in ranges
+    ]
+    length = sum(len(part) + (end - start + 1) + 2 for part, (start, end) in zip(parts, ranges))
+    length += len(f'--{boundary}--\r\n')
+    response = StreamingHttpResponse(_iter_multipart(path, ranges, parts, boundary), status=206,
+                                     content_type=f'multipart/byteranges; boundary={boundary}')
+    response['Content-Length'] = str(length)
+    return response
+
+
+def artifact_file_response(artifact, request=None):
+    """
+    산출물 파일 다운로드 응답 생성
+
+    request를 넘기면 조건부 요청(304)과 Range 요청(206/416)을 처리합니다.
+    """
+    etag = artifact_etag(artifact)
+    last_modified = artifact_last_modified(artifact)
+    if request is not None:
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            if response.status_code == 304:
+                # 304에도 검증자를 실어 클라이언트 캐시가 갱신되도록 함 (RFC 9110 15.4.5)
+                response['ETag'] = etag
+                response['Last-Modified'] = http_date(last_modified)
+            return response
+
+    response = _file_response(artifact, request, etag, last_modified)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    if response.status_code in (200, 206):
+        response['Content-Disposition'] = content_disposition(artifact.filename)
+    return response
+
+
+def _file_response(artifact, request, etag, last_modified):
+    backend = download_backend()
+    path = _local_path(artifact.file)
+    content_type = mimetypes.guess_type(artifact.filename)[0] or 'application/octet-stream'
+
+    if backend == 'x-accel':
+        # nginx internal location: MEDIA_ROOT 기준 상대 경로 (upload_to 경로 그대로)
+        prefix = getattr(settings, 'DOWNLOAD_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(artifact.file.name.replace(os.sep, '/'))
+    elif backend == 'x-sendfile' and path:
+        response = HttpResponse(content_type=content_type)
+        # 한글 경로가 MIME 인코딩되지 않도록 UTF-8 바이트를 그대로 헤더에 실음
+        response['X-Sendfile'] = path.encode('utf-8').decode('latin-1')
+    elif path:
+        size = os.path.getsize(path)
+        ranges = None
+        if request is not None and range_applies(request, etag, last_modified):
+            ranges = parse_range_header(request.META.get('HTTP_RANGE'), size)
+        if ranges == []:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+        elif ranges:
+            response = _range_response(path, size, ranges, content_type)
+        else:
+            # 실제 파일 객체(fileno 보유)를 넘겨야 WSGI 서버가 os.sendfile()을 사용할 수 있음
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+        response['Accept-Ranges'] = 'bytes'
+    else:
+        response = FileResponse(artifact.file.open('rb'), content_type=content_type)
+    return response
+
+
+def download_log_type(request, response):
+    """
+    응답에 해당하는 DownloadLog.download_type
+
+    전체 전송은 'single', 부분 전송(206 또는 웹 서버가 처리할 Range 요청)은 'partial',
+    304는 'cached'로 구분합니다. 오류 응답(412/416 등)은 기록하지 않습니다(None).
+    """
+    if response.status_code == 304:
+        return 'cached'
+    if response.status_code == 206:
+        return 'partial'
+    if response.status_code != 200:
+        return None
+    offloaded = response.has_header('X-Accel-Redirect') or response.has_header('X-Sendfile')
+    if offloaded and request.META.get('HTTP_RANGE'):
+        return 'partial'
+    return 'single'
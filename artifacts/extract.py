@@ -0,0 +1,237 @@
+"""
+산출물 파일 내용 분석 (표준 라이브러리만 사용)
+
+- OOXML(PPTX/DOCX/XLSX): zip 안의 XML을 읽어 슬라이드/페이지/시트 수, 내장 썸네일(docProps/thumbnail.*)
+- PDF: 페이지 객체(/Type /Page) 수. 압축된 객체 스트림(PDF 1.5+)은 FlateDecode 스트림을 풀어서 셈
+- 본문 텍스트(검색 색인용): OOXML은 슬라이드/본문/공유 문자열 XML의 텍스트,
+  PDF는 내용 스트림의 텍스트 표시 연산자(Tj, TJ)의 문자열
+
+입력은 max_bytes(기본 MAX_INPUT_BYTES)까지만 읽고 풉니다. PDF 파일 크기, zip 파트의 압축 해제 크기,
+본문 추출 파트들의 압축 해제 크기 합, FlateDecode 스트림을 푼 크기의 합이 이를 넘으면 ExtractLimitError (압축 폭탄 방지)
+
+렌더링 라이브러리를 쓰지 않으므로 PDF나 썸네일이 저장되지 않은 문서는 썸네일을 만들지 않습니다.
+PDF 텍스트는 글꼴 인코딩을 해석하지 않으므로 CID 글꼴(대부분의 한글 PDF)은 추출되지 않을 수 있습니다.
+"""
+from io import BytesIO
+from xml.etree import ElementTree
+import os
+import re
+import zipfile
+import zlib
+
+
+OOXML_EXTENSIONS = ('.pptx', '.docx', '.xlsx')
+
+THUMBNAIL_EXTENSIONS = ('.jpeg', '.jpg', '.png')
+THUMBNAIL_NAMES = tuple(f'docProps/thumbnail{ext}' for ext in THUMBNAIL_EXTENSIONS)
+
+PPTX_SLIDE = re.compile(r'^ppt/slides/slide\d+\.xml$')
+DOCX_PAGES = re.compile(rb'<(?:\w+:)?Pages>(\d+)</(?:\w+:)?Pages>')
+XLSX_SHEET = re.compile(rb'<(?:\w+:)?sheet\b')
+PDF_PAGE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+PDF_FLATE_STREAM = re.compile(rb'/FlateDecode[^>]*>>\s*stream\r?\n(.*?)\r?\nendstream', re.S)
+PDF_TEXT_OPERATOR = re.compile(rb'(\((?:\\.|[^\\)])*\))\s*Tj|\[((?:\\.|[^\]\\])*)\]\s*TJ', re.S)
+PDF_STRING = re.compile(rb'\(((?:\\.|[^\\)])*)\)', re.S)
+PDF_ESCAPE = re.compile(rb'\\([0-7]{1,3}|.)', re.S)
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f', b'\n': b'', b'\r': b''}
+
+MAX_INPUT_BYTES = 64 * 1024 * 1024
+
+WHITESPACE = re.compile(r'[ \t\r\f\v]+')
+BLANK_LINES = re.compile(r'\n\s*\n+')
+
+
+class ExtractError(ValueError):
+    """파일 내용을 분석할 수 없음: 손상된 zip, 없는 파트 등 (다시 시도해도 같은 결과)"""
+
+
+class ExtractLimitError(ExtractError):
+    """입력이나 압축을 푼 내용이 max_bytes를 넘음"""
+
+
+def extension(filename):
+    return os.path.splitext(filename or '')[1].lower()
+
+
+def _open_zip(file):
+    file.seek(0)
+    try:
+        return zipfile.ZipFile(file)
+    except zipfile.BadZipFile as e:
+        raise ExtractError(f'zip 파일이 아닙니다: {e}') from e
+
+
+def _read_file(file, max_bytes):
+    file.seek(0)
+    data = file.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise ExtractLimitError(f'파일이 {max_bytes}바이트를 넘습니다')
+    return data
+
+
+def _part_info(archive, name):
+    try:
+        return archive.getinfo(name)
+    except KeyError:
+        raise ExtractError(f'{name} 파트가 없습니다') from None
+
+
+def _read_part_limit(archive, names, max_bytes):
+    """여러 파트를 읽기 전에 압축을 푼 크기의 합 검사"""
+    total = sum(_part_info(archive, name).file_size for name in names)
+    if total > max_bytes:
+        raise ExtractLimitError(f'압축을 푼 크기의 합({total}바이트)이 {max_bytes}바이트를 넘습니다')
+
+
+def _read_part(archive, name, max_bytes):
+    """zip 파트 읽기 (중앙 디렉토리의 압축 해제 크기로 먼저 검사, zipfile은 그 크기까지만 풂)"""
+    info = _part_info(archive, name)
+    if info.file_size > max_bytes:
+        raise ExtractLimitError(f'{name}의 압축을 푼 크기({info.file_size}바이트)가 {max_bytes}바이트를 넘습니다')
+    try:
+        return archive.read(info)
+    except (zipfile.BadZipFile, zlib.error) as e:
+        raise ExtractError(f'{name} 파트가 손상되었습니다: {e}') from e
+
+
+def page_count(file, filename, max_bytes=MAX_INPUT_BYTES):
+    """
+    페이지(슬라이드/시트) 수
+
+    반환값: {'page_count': n, 'unit': 'page' | 'slide' | 'sheet'}, 알 수 없는 형식이면 None
+    """
+    ext = extension(filename)
+    if ext == '.pdf':
+        count = pdf_page_count(file, max_bytes)
+        return {'page_count': count, 'unit': 'page'} if count else None
+    if ext not in OOXML_EXTENSIONS:
+        return None
+
+    with _open_zip(file) as archive:
+        if ext == '.pptx':
+            count = sum(1 for name in archive.namelist() if PPTX_SLIDE.match(name))
+            return {'page_count': count, 'unit': 'slide'}
+        if ext == '.xlsx':
+            return {'page_count': len(XLSX_SHEET.findall(_read_part(archive, 'xl/workbook.xml', max_bytes))), 'unit': 'sheet'}
+        # DOCX 페이지 수는 Word가 저장할 때 기록한 값 (레이아웃을 계산하지 않음)
+        if 'docProps/app.xml' not in archive.namelist():
+            return None
+        match = DOCX_PAGES.search(_read_part(archive, 'docProps/app.xml', max_bytes))
+        return {'page_count': int(match.group(1)), 'unit': 'page'} if match else None
+
+
+def pdf_streams(data, max_bytes=MAX_INPUT_BYTES):
+    """PDF의 FlateDecode 스트림을 푼 내용 (손상된 스트림은 건너뜀, 푼 크기의 합이 max_bytes를 넘으면 ExtractLimitError)"""
+    remaining = max_bytes
+    for match in PDF_FLATE_STREAM.finditer(data):
+        decompressor = zlib.decompressobj()
+        try:
+            stream = decompressor.decompress(match.group(1), remaining + 1)
+        except zlib.error:
+            continue
+        if len(stream) > remaining:
+            raise ExtractLimitError(f'압축을 푼 PDF 스트림이 {max_bytes}바이트를 넘습니다')
+        if not decompressor.eof:
+            continue
+        remaining -= len(stream)
+        yield stream
+
+
+def pdf_page_count(file, max_bytes=MAX_INPUT_BYTES):
+    data = _read_file(file, max_bytes)
+    count = len(PDF_PAGE.findall(data))
+    if count:
+        return count
+    return sum(len(PDF_PAGE.findall(stream)) for stream in pdf_streams(data, max_bytes))
+
+
+def thumbnail(file, filename, max_bytes=MAX_INPUT_BYTES):
+    """
+    문서에 저장된 썸네일 이미지
+
+    반환값: (확장자, bytes), 없으면 None
+    """
+    if extension(filename) not in OOXML_EXTENSIONS:
+        return None
+    with _open_zip(file) as archive:
+        names = set(archive.namelist())
+        for name in THUMBNAIL_NAMES:
+            if name in names:
+                return extension(name), _read_part(archive, name, max_bytes)
+    return None
+
+
+def extract_text(file, filename, max_chars=None, max_bytes=MAX_INPUT_BYTES):
+    """
+    검색 색인용 본문 텍스트 (형식을 모르면 빈 문자열)
+
+    max_chars: 이 길이까지만 반환 (큰 문서가 색인을 지나치게 키우지 않도록)
+    """
+    ext = extension(filename)
+    if ext == '.pdf':
+        text = pdf_text(_read_file(file, max_bytes), max_bytes)
+    elif ext in OOXML_EXTENSIONS:
+        with _open_zip(file) as archive:
+            text = ooxml_text(archive, ext, max_bytes)
+    else:
+        return ''
+    text = BLANK_LINES.sub('\n', WHITESPACE.sub(' ', text)).strip()
+    return text[:max_chars] if max_chars else text
+
+
+def _slide_number(name):
+    return int(re.search(r'(\d+)\.xml$', name).group(1))
+
+
+def ooxml_text(archive, ext, max_bytes=MAX_INPUT_BYTES):
+    """본문 파트들의 텍스트 (압축을 푼 크기의 합이 max_bytes를 넘으면 ExtractLimitError)"""
+    names = archive.namelist()
+    if ext == '.pptx':
+        parts = sorted((name for name in names if PPTX_SLIDE.match(name)), key=_slide_number)
+    elif ext == '.docx':
+        parts = ['word/document.xml']
+    else:
+        parts = ['xl/sharedStrings.xml']
+    parts = [name for name in parts if name in names]
+    _read_part_limit(archive, parts, max_bytes)
+    return '\n'.join(xml_text(_read_part(archive, name, max_bytes)) for name in parts)
+
+
+def xml_text(data):
+    """OOXML 파트의 텍스트 요소(<*:t>)를 단락(<*:p>, 셀 문자열 <si>)마다 줄을 나눠 연결"""
+    parts = []
+    for _event, element in ElementTree.iterparse(BytesIO(data)):
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag == 't':
+            parts.append(element.text or '')
+        elif tag in ('p', 'si'):
+            parts.append('\n')
+            element.clear()
+    return ''.join(parts)
+
+
+def _pdf_unescape(match):
+    value = match.group(1)
+    if value[:1].isdigit():
+        return bytes([int(value, 8) & 0xFF])
+    return PDF_ESCAPES.get(value, value)
+
+
+def _pdf_string(raw):
+    data = PDF_ESCAPE.sub(_pdf_unescape, raw)
+    if data.startswith(b'\xfe\xff'):
+        return data[2:].decode('utf-16-be', 'replace')
+    return data.decode('latin-1')
+
+
+def pdf_text(data, max_bytes=MAX_INPUT_BYTES):
+    """내용 스트림의 Tj/TJ 문자열 (압축되지 않은 PDF는 파일 전체에서 찾음)"""
+    streams = list(pdf_streams(data, max_bytes)) or [data]
+    lines = []
+    for stream in streams:
+        for match in PDF_TEXT_OPERATOR.finditer(stream):
+            if match.group(1) is not None:
+                lines.append(_pdf_string(match.group(1)[1:-1]))
+            else:
+                lines.append(''.join(_pdf_string(raw) for raw in PDF_STRING.findall(match.group(2))))
+    return '\n'.join(lines)
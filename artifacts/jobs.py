@@ -0,0 +1,217 @@
+"""
+업로드 후 처리 작업 큐
+
+업로드 요청 안에서 파일을 다시 읽으면 응답이 늦어지므로, 산출물이 생성되면 작업(ProcessingJob)만
+등록하고 process_jobs 명령(워커)이 따로 처리합니다. 큐는 DB 테이블이라 별도 브로커가 필요 없고,
+워커가 여러 개여도 작업은 상태를 바꾸는 UPDATE로 한 워커만 가져갑니다.
+
+- 실패한 작업은 JOB_RETRY_BASE_DELAY * 2^(시도 횟수 - 1)초(최대 JOB_RETRY_MAX_DELAY) 뒤에 다시 시도하고,
+  JOB_MAX_ATTEMPTS번 실패하면 failed로 남김. 다시 시도해도 같은 결과인 오류(PERMANENT_ERRORS: 손상된 zip,
+  없는 파트, EXTRACT_MAX_BYTES 초과 등 extract.ExtractError)는 바로 failed
+- 워커가 비정상 종료해 JOB_LOCK_TIMEOUT초 넘게 running인 작업은 다시 대기 상태로 돌림
+- 산출물의 작업이 모두 끝나면 매트릭스 캐시를 무효화해 셀의 '처리 중' 표시를 지움
+
+작업 종류별 처리 함수는 JOB_HANDLERS에 등록하며, 반환값(dict)은 ProcessingJob.result에 저장됩니다.
+"""
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from datetime import timedelta
+from .models import Artifact, ArtifactText, ProcessingJob, compute_file_checksum
+from . import extract, matrix
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+THUMBNAIL_DIR = 'thumbnails'
+
+# 재시도하지 않는 오류 (파일 내용에 따라 정해짐)
+PERMANENT_ERRORS = (extract.ExtractError,)
+
+
+def max_attempts():
+    return getattr(settings, 'JOB_MAX_ATTEMPTS', 5)
+
+
+def extract_max_bytes():
+    return getattr(settings, 'EXTRACT_MAX_BYTES', extract.MAX_INPUT_BYTES)
+
+
+def retry_delay(attempts):
+    """attempts번째 실패 후 다음 시도까지 대기 시간 (지수 백오프)"""
+    base = getattr(settings, 'JOB_RETRY_BASE_DELAY', 30)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), getattr(settings, 'JOB_RETRY_MAX_DELAY', 3600)))
+
+
+# 작업 종류별 처리 함수
+
+def verify_checksum(artifact):
+    """저장된 파일의 SHA-256을 다시 계산해 업로드 시 해시와 비교"""
+    sha256 = compute_file_checksum(artifact.file)
+    if artifact.checksum and sha256 != artifact.checksum:
+        raise ValueError(f'파일 해시가 다릅니다 (저장: {artifact.checksum}, 계산: {sha256})')
+    return {'sha256': sha256, 'size': artifact.file.size}
+
+
+def count_pages(artifact):
+    with artifact.file.open('rb') as file:
+        return extract.page_count(file, artifact.filename, extract_max_bytes()) or {}
+
+
+def make_thumbnail(artifact):
+    """문서에 저장된 썸네일을 thumbnails/<산출물 id>.<확장자>로 저장"""
+    with artifact.file.open('rb') as file:
+        image = extract.thumbnail(file, artifact.filename, extract_max_bytes())
+    if image is None:
+        return {'thumbnail': None}
+    ext, data = image
+    name = f'{THUMBNAIL_DIR}/{artifact.id}{ext}'
+    default_storage.delete(name)
+    return {'thumbnail': default_storage.save(name, ContentFile(data))}
+
+
+def index_text(artifact):
+    """본문 텍스트를 추출해 내용 검색 색인에 저장 (ArtifactText, FTS5 인덱스는 트리거로 갱신)"""
+    with artifact.file.open('rb') as file:
+        body = extract.extract_text(file, artifact.filename, getattr(settings, 'SEARCH_TEXT_MAX_CHARS', 1000000),
+                                    extract_max_bytes())
+    ArtifactText.objects.update_or_create(artifact=artifact, defaults={'filename': artifact.filename, 'body': body})
+    return {'characters': len(body)}
+
+
+JOB_HANDLERS = {
+    'checksum': verify_checksum,
+    'page_count': count_pages,
+    'thumbnail': make_thumbnail,
+    'text': index_text,
+}
+
+
+# 큐
+
+def enqueue(artifact, kinds=None):
+    """산출물 처리 작업 등록 (이미 등록된 종류는 건너뜀)"""
+    ProcessingJob.objects.bulk_create(
+        [ProcessingJob(artifact=artifact, kind=kind) for kind in (kinds or JOB_HANDLERS)],
+        ignore_conflicts=True,
+    )
+
+
+@receiver(post_save, sender=Artifact)
+def artifact_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        enqueue(instance)
+
+
+@receiver(post_delete, sender=Artifact)
+def artifact_deleted(sender, instance, **kwargs):
+    # 작업 행은 CASCADE로 이미 삭제되었으므로 썸네일은 가능한 확장자의 이름으로 삭제
+    for ext in extract.THUMBNAIL_EXTENSIONS:
+        default_storage.delete(f'{THUMBNAIL_DIR}/{instance.id}{ext}')
+
+
+def reclaim_stale():
+    """JOB_LOCK_TIMEOUT초 넘게 running인 작업(워커 비정상 종료)을 대기 상태로 되돌림"""
+    cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'JOB_LOCK_TIMEOUT', 600))
+    return ProcessingJob.objects.filter(status='running', locked_at__lt=cutoff).update(
+        status='pending', locked_by='', locked_at=None, updated_at=timezone.now(),
+    )
+
+
+def claim(worker_id, limit=10):
+    """실행 가능한 작업을 최대 limit개 가져와 running으로 표시 (다른 워커와 겹치지 않음)"""
+    now = timezone.now()
+    with transaction.atomic():
+        queryset = ProcessingJob.objects.filter(status='pending', run_after__lte=now).order_by('run_after', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        ids = list(queryset.values_list('id', flat=True)[:limit])
+        # 조건부 UPDATE가 1행을 바꾼 작업만 가져감 (트랜잭션 격리 수준과 관계없이 다른 워커가 먼저
+        # 가져간 작업은 status가 바뀌어 0행)
+        ids = [
+            job_id for job_id in ids
+            if ProcessingJob.objects.filter(id=job_id, status='pending').update(
+                status='running', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1, updated_at=now,
+            )
+        ]
+        if not ids:
+            return []
+    return list(
+        ProcessingJob.objects.filter(id__in=ids, status='running', locked_by=worker_id)
+        .select_related('artifact').order_by('run_after', 'id')
+    )
+
+
+def run_job(job):
+    """
+    작업 하나 실행
+
+    실패하면 시도 횟수에 따라 재시도를 예약하거나 failed로 표시합니다 (PERMANENT_ERRORS는 바로 failed).
+    반환값: 완료 여부
+    """
+    running = ProcessingJob.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by)
+    try:
+        handler = JOB_HANDLERS.get(job.kind)
+        if handler is None:
+            raise ValueError(f'알 수 없는 작업 종류입니다: {job.kind}')
+        result = handler(job.artifact)
+    except Exception as e:
+        logger.warning('처리 작업 실패 (job=%s, kind=%s, attempts=%s): %s', job.pk, job.kind, job.attempts, e)
+        now = timezone.now()
+        if isinstance(e, PERMANENT_ERRORS) or job.attempts >= max_attempts():
+            running.update(status='failed', last_error=str(e)[:2000], locked_by='', locked_at=None, updated_at=now)
+        else:
+            running.update(status='pending', last_error=str(e)[:2000], locked_by='', locked_at=None,
+                           run_after=now + retry_delay(job.attempts), updated_at=now)
+        done = False
+    else:
+        running.update(status='done', result=result, last_error='', locked_by='', locked_at=None,
+                       updated_at=timezone.now())
+        done = True
+
+    if not ProcessingJob.objects.filter(artifact_id=job.artifact_id, status__in=ACTIVE_STATUSES).exists():
+        matrix.invalidate_matrix_cache()
+    return done
+
+
+def process_batch(worker_id, limit=10):
+    """실행 가능한 작업을 한 번 가져와 처리, 반환값: 처리한 작업 수"""
+    jobs = claim(worker_id, limit)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
+
+
+# 조회
+
+def processing_status(artifact_ids):
+    """
+    산출물별 처리 상태와 결과 (한 번의 쿼리)
+
+    반환값: {artifact_id: {'status': 'processing' | 'failed' | 'ready', 'page_count', 'unit', 'thumbnail_url'}}
+    작업이 없는 산출물(기능 도입 전 업로드)은 'ready'
+    """
+    statuses = {artifact_id: {'status': 'ready'} for artifact_id in artifact_ids}
+    rows = ProcessingJob.objects.filter(artifact_id__in=list(statuses)).values_list(
+        'artifact_id', 'status', 'result',
+    )
+    for artifact_id, status, result in rows:
+        entry = statuses[artifact_id]
+        if status in ACTIVE_STATUSES:
+            entry['status'] = 'processing'
+        elif status == 'failed' and entry['status'] == 'ready':
+            entry['status'] = 'failed'
+        elif status == 'done' and result:
+            if 'page_count' in result:
+                entry['page_count'], entry['unit'] = result['page_count'], result['unit']
+            if result.get('thumbnail'):
+                entry['thumbnail_url'] = default_storage.url(result['thumbnail'])
+    return statuses
@@ -1,9 +1,11 @@
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
 from .models import Category, Product, ProductCategoryDisabled
+from .matrix import invalidate_matrix_cache
+from . import search, reference
 import json
 
 
@@ -17,30 +19,37 @@ def is_superuser(user):
     return user.is_superuser
 
 
+def _country_or_404(ref, country_id):
+    """기준 정보 스냅샷에서 국가 조회"""
+    try:
+        country = ref.countries_by_id.get(int(country_id))
+    except ValueError:
+        country = None
+    if country is None:
+        raise Http404('국가를 찾을 수 없습니다.')
+    return country
+
+
 
 @login_required
 @user_passes_test(is_staff_user)
 def admin_management(request):
     """Admin management page for categories and products"""
-    from .models import Country
-    
-    categories = Category.objects.all()
-    products = Product.objects.all()
-    countries = Country.objects.all()
+    ref = reference.current()
+    categories = ref.categories
+    products = ref.products
+    countries = ref.countries
     
     # Get current selected country (default to first country, typically KR)
     selected_country_id = request.GET.get('country_id')
     if selected_country_id:
-        selected_country = get_object_or_404(Country, id=selected_country_id)
+        selected_country = _country_or_404(ref, selected_country_id)
     else:
-        selected_country = countries.first()
+        selected_country = ref.default_country()
     
     # Get disabled cells for the selected country
-    disabled_cells = ProductCategoryDisabled.objects.filter(
-        country=selected_country
-    ).select_related('product', 'category')
     # Convert to list of lists for JavaScript compatibility
-    disabled_set = [[dc.product.id, dc.category.id] for dc in disabled_cells]
+    disabled_set = [list(cell) for cell in sorted(ref.disabled_cells(selected_country))]
     
     context = {
         'categories': categories,
@@ -73,6 +82,7 @@ def category_create(request):
             name=name,
             display_order=int(display_order)
         )
+        invalidate_matrix_cache()
         
         return JsonResponse({
             'success': True,
@@ -107,6 +117,7 @@ def category_update(request, category_id):
         category.name = name
         category.display_order = int(display_order)
         category.save()
+        invalidate_matrix_cache()
         
         return JsonResponse({
             'success': True,
@@ -138,6 +149,7 @@ def category_delete(request, category_id):
         
         category_name = category.name
         category.delete()
+        invalidate_matrix_cache()
         
         return JsonResponse({
             'success': True,
@@ -172,6 +184,7 @@ def product_create(request):
             color_class=color_class,
             display_order=int(display_order)
         )
+        invalidate_matrix_cache()
         
         return JsonResponse({
             'success': True,
@@ -212,6 +225,7 @@ def product_update(request, product_id):
         product.color_class = color_class
         product.display_order = int(display_order)
         product.save()
+        invalidate_matrix_cache()
         
         return JsonResponse({
             'success': True,
@@ -244,6 +258,7 @@ def product_delete(request, product_id):
         
         product_name = product.name
         product.delete()
+        invalidate_matrix_cache()
         
         return JsonResponse({
             'success': True,
@@ -257,23 +272,19 @@ def product_delete(request, product_id):
 @user_passes_test(is_staff_user)
 def get_disabled_cells(request):
     """Get all disabled product-category combinations for a specific country"""
-    from .models import Country
-    
     country_id = request.GET.get('country_id')
     if not country_id:
         return JsonResponse({'success': False, 'error': 'country_id가 필요합니다.'}, status=400)
     
-    country = get_object_or_404(Country, id=country_id)
-    disabled_cells = ProductCategoryDisabled.objects.filter(
-        country=country
-    ).select_related('product', 'category')
+    ref = reference.current()
+    country = _country_or_404(ref, country_id)
     
     disabled_list = [{
-        'product_id': cell.product.id,
-        'category_id': cell.category.id,
-        'product_name': cell.product.name,
-        'category_name': cell.category.name,
-    } for cell in disabled_cells]
+        'product_id': product_id,
+        'category_id': category_id,
+        'product_name': ref.products_by_id[product_id].name,
+        'category_name': ref.categories_by_id[category_id].name,
+    } for product_id, category_id in sorted(ref.disabled_cells(country))]
     
     return JsonResponse({'disabled_cells': disabled_list})
 
@@ -307,6 +318,7 @@ def toggle_disabled_cell(request):
         if disabled:
             # Enable (remove from disabled list)
             disabled.delete()
+            invalidate_matrix_cache()
             return JsonResponse({
                 'success': True,
                 'disabled': False,
@@ -320,6 +332,7 @@ def toggle_disabled_cell(request):
                 category=category,
                 created_by=request.user
             )
+            invalidate_matrix_cache()
             return JsonResponse({
                 'success': True,
                 'disabled': True,
@@ -341,7 +354,7 @@ def login_logs_view(request):
 def get_login_logs_api(request):
     """로그인 로그 데이터 조회 API"""
     from .models import LoginAttempt
-    from django.core.paginator import Paginator
+    from .pagination import merge_page, cursor_pagination, InvalidCursor
     from django.utils import timezone
     from datetime import datetime, timedelta
     
@@ -351,7 +364,8 @@ def get_login_logs_api(request):
         username_search = request.GET.get('username', '').strip()
         date_from = request.GET.get('date_from', '')
         date_to = request.GET.get('date_to', '')
-        page_number = int(request.GET.get('page', 1))
+        cursor = request.GET.get('cursor') or None
+        direction = request.GET.get('direction', 'next')
         
         # 쿼리 시작
         query = LoginAttempt.objects.select_related('user').all()
@@ -362,9 +376,8 @@ def get_login_logs_api(request):
         elif success_filter == 'false':
             query = query.filter(success=False)
         
-        # 사용자명 검색
-        if username_search:
-            query = query.filter(username__icontains=username_search)
+        # 사용자명 검색 (기본 앞부분 일치, match=contains면 부분 일치)
+        query = search.filter_username(query, username_search, search.search_match(request), source='login')
         
         # 날짜 범위 필터
         if date_from:
@@ -386,13 +399,15 @@ def get_login_logs_api(request):
             except ValueError:
                 pass
         
-        # 페이지네이션
-        paginator = Paginator(query, 50)  # 페이지당 50개
-        page_obj = paginator.get_page(page_number)
+        # 커서 페이지네이션: (created_at, id) 기준으로 -created_at 인덱스를 따라 50건씩 조회
+        try:
+            page = merge_page({'login': query}, 50, cursor=cursor, direction=direction)
+        except InvalidCursor as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
         
         # 데이터 직렬화
         logs = []
-        for attempt in page_obj:
+        for _source, attempt in page.items:
             logs.append({
                 'id': attempt.id,
                 'username': attempt.username,
@@ -408,13 +423,8 @@ def get_login_logs_api(request):
         return JsonResponse({
             'success': True,
             'logs': logs,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-            }
+            # 전체 건수는 첫 페이지에서만 COUNT_LIMIT까지 계산
+            'pagination': cursor_pagination(page, query if cursor is None else None),
         })
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
@@ -432,7 +442,7 @@ def download_logs_view(request):
 def get_download_logs_api(request):
     """다운로드 로그 데이터 조회 API"""
     from .models import DownloadLog
-    from django.core.paginator import Paginator
+    from .pagination import merge_page, cursor_pagination, InvalidCursor
     from django.utils import timezone
     from datetime import datetime, timedelta
     from django.db import models
@@ -444,26 +454,26 @@ def get_download_logs_api(request):
         product_search = request.GET.get('product', '').strip()
         date_from = request.GET.get('date_from', '')
         date_to = request.GET.get('date_to', '')
-        page_number = int(request.GET.get('page', 1))
+        cursor = request.GET.get('cursor') or None
+        direction = request.GET.get('direction', 'next')
         
-        # 쿼리 시작
-        query = DownloadLog.objects.select_related(
-            'user', 'artifact', 'product', 'country', 'artifact__category', 'artifact__product'
-        ).all()
+        # 쿼리 시작 (표시 정보는 기록 시점의 snapshot을 사용하므로 조인 없음)
+        query = DownloadLog.objects.all()
         
         # 다운로드 유형 필터
         if download_type:
             query = query.filter(download_type=download_type)
         
-        # 사용자명 검색
-        if username_search:
-            query = query.filter(user__username__icontains=username_search)
+        # 사용자명 검색 (기본 앞부분 일치, match=contains면 부분 일치)
+        match = search.search_match(request)
+        query = search.filter_username(query, username_search, match, source='download')
         
-        # 제품명 검색
+        # 제품명 검색 (제품 테이블에서 id를 먼저 찾아 로그는 id로 조회)
         if product_search:
+            product_ids = search.matching_product_ids(product_search, match)
             query = query.filter(
-                models.Q(product__name__icontains=product_search) |
-                models.Q(artifact__product__name__icontains=product_search)
+                models.Q(product_id__in=product_ids) |
+                models.Q(artifact__product_id__in=product_ids)
             )
         
         # 날짜 범위 필터
@@ -484,17 +494,19 @@ def get_download_logs_api(request):
             except ValueError:
                 pass
         
-        # 페이지네이션
-        paginator = Paginator(query, 50)  # 페이지당 50개
-        page_obj = paginator.get_page(page_number)
+        # 커서 페이지네이션: (created_at, id) 기준으로 -created_at 인덱스를 따라 50건씩 조회
+        try:
+            page = merge_page({'download': query}, 50, cursor=cursor, direction=direction)
+        except InvalidCursor as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
         
         # 데이터 직렬화
         logs = []
-        for log in page_obj:
+        for _source, log in page.items:
             log_data = {
                 'id': log.id,
-                'username': log.user.username if log.user else 'Anonymous',
-                'user_id': log.user.id if log.user else None,
+                'username': log.username or 'Anonymous',
+                'user_id': log.user_id,
                 'download_type': log.download_type,
                 'download_type_display': log.get_download_type_display(),
                 'ip_address': log.ip_address,
@@ -502,18 +514,20 @@ def get_download_logs_api(request):
                 'created_at': timezone.localtime(log.created_at).strftime('%Y-%m-%d %H:%M:%S'),
             }
             
-            if log.download_type == 'single' and log.artifact:
+            snapshot = log.snapshot or {}
+            if log.download_type != 'bulk' and snapshot.get('filename'):
                 log_data['artifact'] = {
-                    'id': log.artifact.id,
-                    'filename': log.artifact.filename,
-                    'product_name': log.artifact.product.name,
-                    'category_name': log.artifact.category.name,
-                    'version': log.artifact.version_string,
+                    'id': log.artifact_id,
+                    'filename': snapshot['filename'],
+                    'product_name': snapshot.get('product'),
+                    'category_name': snapshot.get('category'),
+                    'version': snapshot.get('version'),
+                    'deleted': log.artifact_id is None,
                 }
-            elif log.download_type == 'bulk' and log.product:
+            elif log.download_type == 'bulk' and snapshot.get('product'):
                 log_data['bulk'] = {
-                    'product_name': log.product.name,
-                    'country_code': log.country.code if log.country else 'N/A',
+                    'product_name': snapshot['product'],
+                    'country_code': snapshot.get('country') or 'N/A',
                     'artifact_count': log.artifact_count,
                 }
             
@@ -522,13 +536,72 @@ def get_download_logs_api(request):
         return JsonResponse({
             'success': True,
             'logs': logs,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-            }
+            # 전체 건수는 첫 페이지에서만 COUNT_LIMIT까지 계산
+            'pagination': cursor_pagination(page, query if cursor is None else None),
+        })
+    except Exception as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+@login_required
+@user_passes_test(is_superuser)
+def get_download_analytics_api(request):
+    """
+    다운로드 통계 API (일별 집계 DownloadDailyCount 조회)
+
+    group_by(artifact/product/country/user/download_type) 기준 상위 limit개와
+    interval(day/week/month)별 추이를 반환합니다. 기간 미지정 시 최근 90일.
+    """
+    from .models import DownloadDailyCount
+    from .analytics import GROUP_FIELDS, SERIES_INTERVALS, top_downloads, download_series, describe_artifacts
+    from django.utils import timezone
+    from datetime import datetime, timedelta
+    
+    try:
+        group_by = request.GET.get('group_by', 'artifact')
+        interval = request.GET.get('interval', 'day')
+        if group_by not in GROUP_FIELDS or interval not in SERIES_INTERVALS:
+            return JsonResponse({'success': False, 'error': '잘못된 group_by 또는 interval 값입니다.'}, status=400)
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 100)
+        
+        # 기간 (현지 날짜 기준, 양 끝 포함)
+        today = timezone.localdate()
+        try:
+            date_to = datetime.strptime(request.GET['date_to'], '%Y-%m-%d').date() if request.GET.get('date_to') else today
+            date_from = (datetime.strptime(request.GET['date_from'], '%Y-%m-%d').date()
+                         if request.GET.get('date_from') else date_to - timedelta(days=89))
+        except ValueError:
+            return JsonResponse({'success': False, 'error': '날짜 형식은 YYYY-MM-DD입니다.'}, status=400)
+        
+        query = DownloadDailyCount.objects.filter(date__gte=date_from, date__lte=date_to)
+        if request.GET.get('country'):
+            query = query.filter(country__code=request.GET['country'])
+        if request.GET.get('product'):
+            query = query.filter(product_id=int(request.GET['product']))
+        if request.GET.get('type'):
+            query = query.filter(download_type=request.GET['type'])
+        
+        top = top_downloads(query, group_by, limit)
+        labels = {}
+        if group_by == 'artifact':
+            labels = describe_artifacts([key for key, _ in top])
+        elif group_by == 'product':
+            labels = {key: product.name for key, product in reference.current().products_by_id.items()}
+        elif group_by == 'country':
+            labels = {key: country.code for key, country in reference.current().countries_by_id.items()}
+        
+        return JsonResponse({
+            'success': True,
+            'date_from': date_from.isoformat(),
+            'date_to': date_to.isoformat(),
+            'top': [
+                {'key': key, 'label': labels.get(key, key), 'count': count}
+                for key, count in top
+            ],
+            'series': [
+                {'date': period.isoformat(), 'count': count}
+                for period, count in download_series(query, interval)
+            ],
         })
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
@@ -544,13 +617,11 @@ def unified_logs_view(request):
 @login_required
 @user_passes_test(is_superuser)
 def get_unified_logs_api(request):
-    """통합 활동 로그 데이터 조회 API"""
-    from .models import LoginAttempt, DownloadLog, ArtifactActivityLog
-    from django.core.paginator import Paginator
+    """통합 활동 로그 데이터 조회 API (ActivityEvent 단일 테이블 조회)"""
+    from .models import ActivityEvent
     from django.utils import timezone
     from datetime import datetime, timedelta
-    from itertools import chain
-    from operator import attrgetter
+    from .pagination import merge_page, cursor_pagination, InvalidCursor
     
     try:
         # Filter parameters
@@ -558,155 +629,98 @@ def get_unified_logs_api(request):
         username_search = request.GET.get('username', '').strip()
         date_from = request.GET.get('date_from', '')
         date_to = request.GET.get('date_to', '')
-        page_number = int(request.GET.get('page', 1))
-        
-        # Collect logs based on activity type filter
-        all_logs = []
-        
-        if not activity_type or activity_type == 'login':
-            login_logs = LoginAttempt.objects.all()
-            if username_search:
-                login_logs = login_logs.filter(username__icontains=username_search)
-            if date_from:
-                try:
-                    date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-                    date_from_aware = timezone.make_aware(date_from_obj)
-                    login_logs = login_logs.filter(created_at__gte=date_from_aware)
-                except ValueError:
-                    pass
-            if date_to:
-                try:
-                    date_to_obj = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
-                    date_to_aware = timezone.make_aware(date_to_obj)
-                    login_logs = login_logs.filter(created_at__lt=date_to_aware)
-                except ValueError:
-                    pass
-            all_logs.extend(login_logs)
-        
-        if not activity_type or activity_type == 'download':
-            download_logs = DownloadLog.objects.select_related('user', 'artifact', 'product', 'country').all()
-            if username_search:
-                download_logs = download_logs.filter(username__icontains=username_search)
-            if date_from:
-                try:
-                    date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-                    date_from_aware = timezone.make_aware(date_from_obj)
-                    download_logs = download_logs.filter(created_at__gte=date_from_aware)
-                except ValueError:
-                    pass
-            if date_to:
-                try:
-                    date_to_obj = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
-                    date_to_aware = timezone.make_aware(date_to_obj)
-                    download_logs = download_logs.filter(created_at__lt=date_to_aware)
-                except ValueError:
-                    pass
-            all_logs.extend(download_logs)
-        
-        if not activity_type or activity_type in ['upload', 'delete']:
-            artifact_logs = ArtifactActivityLog.objects.select_related('user', 'artifact').all()
-            if activity_type in ['upload', 'delete']:
-                artifact_logs = artifact_logs.filter(action=activity_type)
-            if username_search:
-                artifact_logs = artifact_logs.filter(username__icontains=username_search)
-            if date_from:
-                try:
-                    date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-                    date_from_aware = timezone.make_aware(date_from_obj)
-                    artifact_logs = artifact_logs.filter(created_at__gte=date_from_aware)
-                except ValueError:
-                    pass
-            if date_to:
-                try:
-                    date_to_obj = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
-                    date_to_aware = timezone.make_aware(date_to_obj)
-                    artifact_logs = artifact_logs.filter(created_at__lt=date_to_aware)
-                except ValueError:
-                    pass
-            all_logs.extend(artifact_logs)
-        
-        # Sort by created_at (descending)
-        all_logs_sorted = sorted(all_logs, key=attrgetter('created_at'), reverse=True)
-        
-        # Pagination
-        paginator = Paginator(all_logs_sorted, 50)
-        page_obj = paginator.get_page(page_number)
+        cursor = request.GET.get('cursor') or None
+        direction = request.GET.get('direction', 'next')
+        
+        query = ActivityEvent.objects.all()
+        
+        # 활동 유형 필터
+        if activity_type in ['login', 'download', 'upload', 'delete']:
+            query = query.filter(event_type=activity_type)
+        
+        # 사용자명 검색 (기본 앞부분 일치, match=contains면 부분 일치)
+        query = search.filter_username(query, username_search, search.search_match(request))
+        
+        # 날짜 범위 필터
+        if date_from:
+            try:
+                date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
+                date_from_aware = timezone.make_aware(date_from_obj)
+                query = query.filter(created_at__gte=date_from_aware)
+            except ValueError:
+                pass
+        if date_to:
+            try:
+                date_to_obj = datetime.strptime(date_to, '%Y-%m-%d') + timedelta(days=1)
+                date_to_aware = timezone.make_aware(date_to_obj)
+                query = query.filter(created_at__lt=date_to_aware)
+            except ValueError:
+                pass
+        
+        # 커서 페이지네이션: (created_at, id) 기준으로 -created_at 인덱스를 따라 50건씩 조회
+        try:
+            page = merge_page({'event': query}, 50, cursor=cursor, direction=direction)
+        except InvalidCursor as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
         
         # Serialize logs
         logs = []
-        for log in page_obj:
+        for _source, event in page.items:
+            details = event.details or {}
             log_data = {
-                'created_at': timezone.localtime(log.created_at).strftime('%Y-%m-%d %H:%M:%S'),
-                'ip_address': getattr(log, 'ip_address', None),
-                'user_agent': getattr(log, 'user_agent', ''),
+                'created_at': timezone.localtime(event.created_at).strftime('%Y-%m-%d %H:%M:%S'),
+                'ip_address': event.ip_address,
+                'user_agent': event.user_agent,
+                'username': event.username,
+            }
+            artifact_data = {
+                'filename': event.filename,
+                'product': event.product,
+                'category': event.category,
+                'version': event.version,
             }
             
-            if isinstance(log, LoginAttempt):
+            if event.source == 'login':
                 log_data.update({
-                    'id': f'login-{log.id}',
+                    'id': f'login-{event.source_id}',
                     'type': 'login',
-                    'username': log.username,
-                    'success': log.success,
-                    'failure_reason': log.failure_reason if not log.success else None,
+                    'success': details.get('success', False),
+                    'failure_reason': details.get('failure_reason') if not details.get('success') else None,
                 })
-            elif isinstance(log, DownloadLog):
+            elif event.source == 'download':
+                download_type = details.get('download_type')
                 log_data.update({
-                    'id': f'download-{log.id}',
+                    'id': f'download-{event.source_id}',
                     'type': 'download',
-                    'username': log.username,
-                    'download_type': log.download_type,
+                    'download_type': download_type,
                 })
-                if log.download_type == 'single' and log.artifact:
-                    log_data['artifact'] = {
-                        'filename': log.artifact.filename,
-                        'product': log.artifact.product.name,
-                        'category': log.artifact.category.name,
-                        'version': log.artifact.version_string,
-                    }
-                elif log.download_type == 'bulk' and log.product:
+                if download_type != 'bulk' and event.filename:
+                    log_data['artifact'] = artifact_data
+                elif download_type == 'bulk' and event.product:
                     log_data['bulk'] = {
-                        'product': log.product.name,
-                        'country': log.country.code if log.country else 'Global',
-                        'artifact_count': log.artifact_count,
+                        'product': event.product,
+                        'country': details.get('country') or 'Global',
+                        'artifact_count': details.get('artifact_count', 0),
                     }
-            elif isinstance(log, ArtifactActivityLog):
+            else:
                 log_data.update({
-                    'id': f'artifact-{log.id}',  
-                    'type': f'artifact_{log.action}',  # 'artifact_upload' or 'artifact_delete'
-                    'username': log.username,
-                    'action': log.action,
-                    'action_display': log.get_action_display(),
+                    'id': f'artifact-{event.source_id}',
+                    'type': f'artifact_{event.event_type}',  # 'artifact_upload' or 'artifact_delete'
+                    'action': event.event_type,
+                    'action_display': event.get_event_type_display(),
                 })
-                if log.artifact:
-                    log_data['artifact'] = {
-                        'filename': log.artifact.filename,
-                        'product': log.artifact.product.name,
-                        'category': log.artifact.category.name,
-                        'version': log.artifact.version_string,
-                    }
-                elif log.artifact_snapshot:
-                    log_data['artifact'] = {
-                        'filename': log.artifact_snapshot.get('filename', 'Unknown'),
-                        'product': log.artifact_snapshot.get('product', 'Unknown'),
-                        'category': log.artifact_snapshot.get('category', 'Unknown'),
-                        'version': log.artifact_snapshot.get('version', 'Unknown'),
-                        'deleted': True,
-                    }
+                if event.filename:
+                    if details.get('deleted'):
+                        artifact_data['deleted'] = True
+                    log_data['artifact'] = artifact_data
             
             logs.append(log_data)
         
         return JsonResponse({
             'success': True,
             'logs': logs,
-            'pagination': {
-                'current_page': page_obj.number,
-                'total_pages': paginator.num_pages,
-                'total_count': paginator.count,
-                'has_previous': page_obj.has_previous(),
-                'has_next': page_obj.has_next(),
-            }
+            # 전체 건수는 첫 페이지에서만 COUNT_LIMIT까지 계산
+            'pagination': cursor_pagination(page, query if cursor is None else None),
         })
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
-
-
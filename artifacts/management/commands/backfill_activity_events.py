@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from artifacts.models import LoginAttempt, DownloadLog, ArtifactActivityLog, ActivityEvent
+from artifacts.activity import event_from_log
+
+
+class Command(BaseCommand):
+    help = '기존 로그인/다운로드/파일 활동 로그로 통합 활동 로그(ActivityEvent)를 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='한 번에 추가할 로그 수 (기본: 1000)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        sources = [
+            ('로그인 시도', LoginAttempt.objects.all()),
+            ('다운로드 로그', DownloadLog.objects.select_related(
+                'artifact__product', 'artifact__category', 'product', 'country')),
+            ('파일 활동 로그', ArtifactActivityLog.objects.select_related(
+                'artifact__product', 'artifact__category')),
+        ]
+        before = ActivityEvent.objects.count()
+
+        for label, queryset in sources:
+            self.stdout.write(f'{label} 처리 중...')
+            total = 0
+            events = []
+            for log in queryset.order_by('id').iterator(chunk_size=batch_size):
+                events.append(event_from_log(log))
+                total += 1
+                if len(events) >= batch_size:
+                    ActivityEvent.objects.bulk_create(events, ignore_conflicts=True)
+                    events = []
+            if events:
+                ActivityEvent.objects.bulk_create(events, ignore_conflicts=True)
+            self.stdout.write(f'  {total}건 확인')
+
+        added = ActivityEvent.objects.count() - before
+        self.stdout.write(self.style.SUCCESS(f'통합 활동 로그 채우기 완료 ({added}건 추가)'))
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand
+from artifacts.bulk_kits import KitEntry, iter_zip_entries, bulk_zip_workers
+import os
+import tempfile
+import time
+
+
+class Command(BaseCommand):
+    help = '일괄 다운로드 ZIP 생성 속도를 순차 처리와 병렬 처리로 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--counts', type=int, nargs='+', default=[10, 50, 200],
+                            help='비교할 파일 개수 목록 (기본: 10 50 200)')
+        parser.add_argument('--file-size', type=int, default=1024 * 1024,
+                            help='파일 하나의 크기 bytes (기본: 1MB)')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='병렬 작업 스레드 수 (기본: BULK_ZIP_WORKERS 설정값)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='측정 반복 횟수, 최솟값을 사용 (기본: 3)')
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or max(bulk_zip_workers(), 2)
+        file_size = options['file_size']
+        repeat = options['repeat']
+
+        self.stdout.write(f'파일 크기 {file_size:,} bytes, 병렬 스레드 {workers}개, {repeat}회 반복 중 최솟값\n')
+        self.stdout.write(f'{"파일 수":>8} {"순차(s)":>10} {"병렬(s)":>10} {"배율":>8}')
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths = self._make_files(tmp_dir, max(options['counts']), file_size)
+            for count in options['counts']:
+                entries = [self._entry(path) for path in paths[:count]]
+                serial = self._measure(entries, 1, repeat)
+                parallel = self._measure(entries, workers, repeat)
+                self.stdout.write(f'{count:>8} {serial:>10.3f} {parallel:>10.3f} {serial / parallel:>7.2f}x')
+
+    def _make_files(self, tmp_dir, count, file_size):
+        """압축 가능한 텍스트와 난수 블록이 섞인 테스트 파일 생성"""
+        text = ('DocSPARROW 제품 문서 벤치마크 데이터 ' * 64).encode('utf-8')
+        paths = []
+        for i in range(count):
+            path = os.path.join(tmp_dir, f'bench_{i}.txt')
+            with open(path, 'wb') as f:
+                written = 0
+                while written < file_size:
+                    block = text if written % (128 * 1024) else os.urandom(4096)
+                    block = block[:file_size - written]
+                    f.write(block)
+                    written += len(block)
+            paths.append(path)
+        return paths
+
+    def _entry(self, path):
+        return KitEntry(
+            arcname=f'bench/{os.path.basename(path)}',
+            filename=os.path.basename(path),
+            open_file=lambda path=path: open(path, 'rb'),
+            size=os.path.getsize(path),
+            date_time=time.localtime()[:6],
+        )
+
+    def _measure(self, entries, workers, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _chunk in iter_zip_entries(entries, workers=workers):
+                pass
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from artifacts.db import apply_pragmas, sqlite_pragmas
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sqlite3
+import tempfile
+import time
+
+
+# Django 기본 SQLite 동작: 롤백 저널, synchronous=FULL, 요청마다 새 연결, 지연(DEFERRED) 트랜잭션
+BASELINE_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+CREATE_TABLE = '''
+CREATE TABLE bench_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(150) NOT NULL,
+    user_agent TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+'''
+
+
+def _write_worker(path, pragmas, persistent, immediate, writes, worker):
+    """감사 로그와 비슷한 INSERT를 건별 트랜잭션으로 writes번 실행: (성공, 잠금 오류)"""
+    ok = locked = 0
+    connection = None
+    for i in range(writes):
+        if connection is None:
+            # Python sqlite3 기본 대기 시간(5초), PRAGMA busy_timeout이 있으면 그 값이 우선
+            connection = sqlite3.connect(path, isolation_level=None)
+            apply_pragmas(connection.cursor(), pragmas)
+        try:
+            connection.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            connection.execute(
+                'INSERT INTO bench_log (username, user_agent, created_at) VALUES (?, ?, ?)',
+                (f'bench{worker}', f'bench-agent/{i}', time.time()),
+            )
+            connection.execute('COMMIT')
+            ok += 1
+        except sqlite3.OperationalError as e:
+            if 'locked' not in str(e) and 'busy' not in str(e):
+                raise
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            locked += 1
+        if not persistent:
+            connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+    return ok, locked
+
+
+class Command(BaseCommand):
+    help = ('동시 쓰기 처리량을 Django 기본 SQLite 설정과 SQLITE_PRAGMAS(WAL) 설정으로 비교합니다. '
+            '임시 SQLite 파일을 사용하므로 운영 DB에는 영향이 없습니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8,
+                            help='동시에 쓰는 프로세스 수, gunicorn 워커에 해당 (기본: 8)')
+        parser.add_argument('--writes', type=int, default=200,
+                            help='프로세스당 쓰기(트랜잭션) 횟수 (기본: 200)')
+        parser.add_argument('--dir', default=None,
+                            help='임시 DB 파일을 만들 디렉토리, fsync 비용은 디스크마다 다르므로 '
+                                 '운영 DB와 같은 디스크 권장 (기본: SQLite DB 파일 디렉토리)')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        writes = options['writes']
+        bench_dir = options['dir'] or self._default_dir()
+
+        tuned_pragmas = sqlite_pragmas()
+        immediate = settings.DATABASES['default'].get('OPTIONS', {}).get('transaction_mode') == 'IMMEDIATE'
+        profiles = [
+            ('기본 설정', BASELINE_PRAGMAS, False, False),
+            ('튜닝 설정', tuned_pragmas, True, immediate),
+        ]
+
+        self.stdout.write(f'프로세스 {workers}개 x {writes}회 쓰기, 디렉토리: {bench_dir}')
+        self.stdout.write(f'튜닝 설정: {tuned_pragmas}, 연결 재사용, '
+                          f'{"IMMEDIATE" if immediate else "DEFERRED"} 트랜잭션\n')
+        self.stdout.write(f'{"설정":<10} {"성공":>8} {"잠금 오류":>10} {"시간(s)":>10} {"쓰기/s":>10}')
+
+        results = []
+        for name, pragmas, persistent, use_immediate in profiles:
+            ok, locked, elapsed = self._run(bench_dir, pragmas, persistent, use_immediate, workers, writes)
+            throughput = ok / elapsed if elapsed else 0
+            results.append(throughput)
+            self.stdout.write(f'{name:<10} {ok:>8} {locked:>10} {elapsed:>10.3f} {throughput:>10.1f}')
+
+        if results[0]:
+            self.stdout.write(f'\n처리량 배율: {results[1] / results[0]:.2f}x')
+
+    def _default_dir(self):
+        database = settings.DATABASES['default']
+        if database['ENGINE'].endswith('sqlite3') and str(database['NAME']) != ':memory:':
+            return os.path.dirname(os.path.abspath(str(database['NAME'])))
+        return tempfile.gettempdir()
+
+    def _run(self, bench_dir, pragmas, persistent, immediate, workers, writes):
+        with tempfile.TemporaryDirectory(dir=bench_dir, prefix='bench_db_writes_') as tmp_dir:
+            path = os.path.join(tmp_dir, 'bench.sqlite3')
+            connection = sqlite3.connect(path, isolation_level=None)
+            apply_pragmas(connection.cursor(), pragmas)
+            connection.execute(CREATE_TABLE)
+            connection.execute('CREATE INDEX bench_log_created ON bench_log (created_at)')
+            connection.close()
+
+            started = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(_write_worker, path, pragmas, persistent, immediate, writes, worker)
+                    for worker in range(workers)
+                ]
+                counts = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+        return sum(ok for ok, _ in counts), sum(locked for _, locked in counts), elapsed
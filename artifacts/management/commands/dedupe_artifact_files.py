@@ -0,0 +1,120 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from artifacts.blobs import blob_name, blob_storage
+from artifacts.models import Artifact, Blob, compute_file_checksum
+import os
+
+
+class Command(BaseCommand):
+    help = ('기존 산출물 파일(media/artifacts/<타임스탬프>/...)을 내용 해시 기반 Blob으로 옮기고 '
+            '같은 내용의 사본을 삭제합니다. 파일은 복사하지 않고 같은 저장소 안에서 이동합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='변경하지 않고 절약되는 용량만 출력')
+        parser.add_argument('--verify', action='store_true',
+                            help='저장된 checksum을 믿지 않고 모든 파일의 해시를 다시 계산')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = blob_storage()
+        seen = set(Blob.objects.values_list('sha256', flat=True))
+        stats = {'artifacts': 0, 'blobs': 0, 'duplicates': 0, 'missing': 0, 'saved_bytes': 0}
+
+        artifacts = Artifact.objects.filter(blob__isnull=True).order_by('id')
+        for artifact in artifacts.iterator(chunk_size=200):
+            old_name = artifact.file.name
+            sha256 = artifact.checksum
+            if (old_name and sha256 and not storage.exists(old_name)
+                    and storage.exists(blob_name(sha256))):
+                # 이전 실행이 파일을 Blob 경로로 옮긴 뒤 DB를 갱신하기 전에 중단됨 - 옮겨진 파일을 연결
+                size = storage.size(blob_name(sha256))
+            elif not old_name or not storage.exists(old_name):
+                stats['missing'] += 1
+                self.stdout.write(self.style.WARNING(f'  파일 없음: 산출물 {artifact.id} ({old_name})'))
+                continue
+            else:
+                if options['verify'] or not sha256:
+                    sha256 = compute_file_checksum(artifact.file)
+                size = storage.size(old_name)
+            stats['artifacts'] += 1
+            if sha256 in seen:
+                stats['duplicates'] += 1
+                stats['saved_bytes'] += size
+            else:
+                stats['blobs'] += 1
+            seen.add(sha256)
+            if dry_run:
+                continue
+
+            self._adopt(artifact, old_name, sha256, storage)
+
+        self.stdout.write(
+            f"{'[dry-run] ' if dry_run else ''}산출물 {stats['artifacts']}건 처리: "
+            f"Blob {stats['blobs']}개, 중복 {stats['duplicates']}건 "
+            f"({stats['saved_bytes']:,} bytes 절약), 파일 없음 {stats['missing']}건"
+        )
+        if not dry_run:
+            removed = self._remove_empty_dirs(storage, 'artifacts')
+            self.stdout.write(self.style.SUCCESS(f'중복 제거 완료 (빈 디렉토리 {removed}개 삭제)'))
+
+    def _adopt(self, artifact, old_name, sha256, storage):
+        """
+        산출물 파일을 Blob으로 연결 (Blob이 없으면 파일을 Blob 경로로 이동)
+
+        해시를 먼저 기록해 두므로, 파일을 옮긴 뒤 중단되어도 다시 실행하면 옮겨진 파일을 찾아 연결합니다.
+        DB 갱신이 실패하면 옮긴 파일을 원래 경로로 되돌립니다.
+        """
+        name = blob_name(sha256)
+        if artifact.checksum != sha256:
+            Artifact.objects.filter(pk=artifact.pk).update(checksum=sha256)
+        moved = False
+        try:
+            with transaction.atomic():
+                blob = Blob.objects.filter(sha256=sha256).first()
+                if blob is not None:
+                    Blob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+                else:
+                    if not storage.exists(name):
+                        self._move(storage, old_name, name)
+                        moved = True
+                    blob = Blob.objects.create(sha256=sha256, file=name, size=storage.size(name), ref_count=1)
+                Artifact.objects.filter(pk=artifact.pk).update(
+                    blob=blob,
+                    file=name,
+                    checksum=sha256,
+                    original_filename=artifact.original_filename or os.path.basename(old_name),
+                )
+        except BaseException:
+            if moved and not storage.exists(old_name):
+                self._move(storage, name, old_name)
+            raise
+
+        # 다른 산출물이 같은 경로를 쓰지 않으면 남은 사본 삭제
+        if storage.exists(old_name) and not Artifact.objects.filter(file=old_name).exists():
+            storage.delete(old_name)
+
+    def _move(self, storage, old_name, name):
+        try:
+            old_path, new_path = storage.path(old_name), storage.path(name)
+        except NotImplementedError:
+            # 원격 저장소: 복사 후 원본은 _adopt에서 삭제
+            with storage.open(old_name, 'rb') as content:
+                storage.save(name, content)
+            return
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        os.replace(old_path, new_path)
+
+    def _remove_empty_dirs(self, storage, top):
+        """업로드 시각별로 만들어졌던 빈 디렉토리 정리"""
+        try:
+            root = storage.path(top)
+        except NotImplementedError:
+            return 0
+        removed = 0
+        for dirpath, _dirnames, _filenames in os.walk(root, topdown=False):
+            if dirpath != root and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+                removed += 1
+        return removed
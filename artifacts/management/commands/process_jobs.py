@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Count
+from artifacts import jobs
+from artifacts.models import Artifact
+import os
+import signal
+import socket
+import time
+
+
+class Command(BaseCommand):
+    help = ('업로드 후 처리 작업(체크섬 검증, 페이지 수, 썸네일, 본문 색인)을 처리하는 워커입니다. '
+            '기본은 계속 실행하며 새 작업을 기다립니다 (systemd 서비스로 실행).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='지금 실행 가능한 작업만 처리하고 종료')
+        parser.add_argument('--batch', type=int, default=10,
+                            help='한 번에 가져올 작업 수 (기본: 10)')
+        parser.add_argument('--poll-interval', type=float, default=None,
+                            help='작업이 없을 때 다시 확인할 간격(초) (기본: JOB_POLL_INTERVAL 설정값)')
+        parser.add_argument('--enqueue-missing', action='store_true',
+                            help='기존 산출물에 등록되지 않은 종류의 작업을 먼저 등록 (새 작업 종류 추가 후에도 사용)')
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval']
+        if poll_interval is None:
+            poll_interval = getattr(settings, 'JOB_POLL_INTERVAL', 2)
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+
+        if options['enqueue_missing']:
+            missing = Artifact.objects.annotate(job_count=Count('processing_jobs')).filter(
+                job_count__lt=len(jobs.JOB_HANDLERS),
+            )
+            count = 0
+            for artifact in missing.iterator(chunk_size=500):
+                jobs.enqueue(artifact)
+                count += 1
+            self.stdout.write(f'기존 산출물 {count}건의 작업 등록')
+
+        # SIGTERM(systemd stop)을 받으면 처리 중인 작업까지 마치고 종료
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+
+        processed = 0
+        try:
+            while not stopping:
+                close_old_connections()
+                jobs.reclaim_stale()
+                count = jobs.process_batch(worker_id, options['batch'])
+                processed += count
+                if count:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'처리 작업 {processed}건 실행 ({worker_id})'))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from artifacts.retention import run_retention
+
+
+class Command(BaseCommand):
+    help = '보관 기간이 지난 감사 로그를 일별 집계로 남기고, 압축 파일로 내보낸 뒤 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='보관 기간 (일, 기본: AUDIT_RETENTION_DAYS 설정값)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='한 트랜잭션에서 삭제할 행 수 (기본: AUDIT_RETENTION_BATCH_SIZE 설정값)')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='삭제 배치 사이 대기 시간 (초, 기본: 0)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='삭제하지 않고 정리 대상 건수만 출력')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            self.stdout.write('[dry-run] 정리 대상만 확인합니다.')
+        run_retention(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            dry_run=options['dry_run'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS('감사 로그 정리 완료'))
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from artifacts.uploads import prune_sessions
+
+
+class Command(BaseCommand):
+    help = '오래된 분할 업로드 세션과 스테이징 파일을 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=None,
+                            help='마지막 수신 후 이 시간이 지난 세션 삭제 '
+                                 '(기본: UPLOAD_SESSION_EXPIRE_HOURS 설정값)')
+
+    def handle(self, *args, **options):
+        hours = options['hours']
+        if hours is None:
+            hours = getattr(settings, 'UPLOAD_SESSION_EXPIRE_HOURS', 24)
+        removed = prune_sessions(hours)
+        self.stdout.write(self.style.SUCCESS(f'분할 업로드 세션 {removed}건 삭제 ({hours}시간 경과)'))
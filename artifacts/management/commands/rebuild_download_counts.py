@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from artifacts.analytics import rebuild_counts
+
+
+class Command(BaseCommand):
+    help = '남아 있는 다운로드 로그로 일별 다운로드 집계(DownloadDailyCount)를 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='한 번에 읽을 로그 수 (기본: 1000)')
+
+    def handle(self, *args, **options):
+        self.stdout.write('다운로드 집계를 다시 계산합니다...')
+        total = rebuild_counts(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'다운로드 집계 재계산 완료 (로그 {total}건 반영)'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from artifacts.models import Artifact, make_version_key
+from artifacts.matrix import invalidate_matrix_cache
+
+
+class Command(BaseCommand):
+    help = '산출물의 버전 정렬 키(version_key)를 version_string 기준으로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='한 번에 갱신할 산출물 수 (기본: 500)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write('버전 정렬 키를 다시 계산합니다...')
+
+        changed = []
+        total = updated = 0
+        for artifact in Artifact.objects.only('id', 'version_string', 'version_key').iterator(chunk_size=batch_size):
+            total += 1
+            version_key = make_version_key(artifact.version_string)
+            if artifact.version_key != version_key:
+                artifact.version_key = version_key
+                changed.append(artifact)
+                updated += 1
+            if len(changed) >= batch_size:
+                Artifact.objects.bulk_update(changed, ['version_key'])
+                changed = []
+        if changed:
+            Artifact.objects.bulk_update(changed, ['version_key'])
+
+        invalidate_matrix_cache()
+        self.stdout.write(self.style.SUCCESS(f'버전 정렬 키 재계산 완료 (전체 {total}개 중 {updated}개 갱신)'))
@@ -0,0 +1,163 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, F, OuterRef, Q, Window
+from django.db.models.functions import RowNumber
+from .models import Artifact, ProcessingJob
+from . import reference
+import hashlib
+import time
+
+
+# 매트릭스 캐시 세대 카운터 키 - 값이 바뀌면 이전 세대의 캐시 항목은 모두 무효
+MATRIX_GENERATION_KEY = 'matrix:generation'
+
+
+def latest_artifacts(country, products, categories, version_filters=None):
+    """
+    (제품, 카테고리) 셀별 최신 산출물을 한 번의 쿼리로 조회
+
+    ROW_NUMBER() 윈도우 함수로 셀마다 최신 버전 1건만 남기므로
+    제품/카테고리 수와 관계없이 쿼리 수가 일정합니다.
+    반환값: {(product_id, category_id): Artifact} (artifact.processing: 업로드 후 처리 작업이 남아 있는지)
+    """
+    version_filters = version_filters or {}
+    product_ids = [product.id for product in products]
+    category_ids = [category.id for category in categories]
+    if not product_ids or not category_ids:
+        return {}
+
+    query = Artifact.objects.filter(
+        country=country,
+        product_id__in=product_ids,
+        category_id__in=category_ids,
+    )
+
+    # 버전 필터가 지정된 제품은 해당 버전만, 나머지 제품은 전체 버전 대상
+    if version_filters:
+        version_q = Q(product_id__in=[pid for pid in product_ids if pid not in version_filters])
+        for product_id, version in version_filters.items():
+            version_q |= Q(product_id=product_id, version_string=version)
+        query = query.filter(version_q)
+
+    query = query.annotate(
+        processing=Exists(ProcessingJob.objects.filter(
+            artifact=OuterRef('pk'), status__in=('pending', 'running'),
+        )),
+        cell_rank=Window(
+            expression=RowNumber(),
+            partition_by=[F('product_id'), F('category_id')],
+            order_by=F('version_key').desc(),
+        )
+    ).filter(cell_rank=1)
+
+    return {(artifact.product_id, artifact.category_id): artifact for artifact in query}
+
+
+def product_versions(country, products):
+    """국가 기준 제품별 등록된 버전 목록 (최신순) - 단일 쿼리"""
+    versions = {product.id: [] for product in products}
+    rows = Artifact.objects.filter(
+        country=country,
+        product_id__in=list(versions),
+    ).values_list('product_id', 'version_string', 'version_key').distinct().order_by('product_id', '-version_key')
+    for product_id, version, _ in rows:
+        versions[product_id].append(version)
+    return versions
+
+
+def build_matrix(country, products, categories, version_filters=None, disabled_set=frozenset()):
+    """
+    대시보드 매트릭스 데이터 구성
+
+    최신 산출물은 latest_artifacts()로 한 번에 가져오고,
+    행/셀 구조는 메모리에서 조립합니다.
+    """
+    latest = latest_artifacts(country, products, categories, version_filters)
+
+    matrix_data = []
+    for category in categories:
+        matrix_data.append({
+            'category': category,
+            'cells': [{
+                'product': product,
+                'artifact': latest.get((product.id, category.id)),
+                'is_disabled': (product.id, category.id) in disabled_set,
+            } for product in products],
+        })
+    return matrix_data
+
+
+def matrix_generation():
+    """현재 매트릭스 캐시 세대 번호"""
+    generation = cache.get(MATRIX_GENERATION_KEY)
+    if generation is None:
+        # 카운터가 유실(캐시 재시작/축출)된 경우 이전 값과 겹치지 않도록 시각 기반으로 초기화
+        cache.add(MATRIX_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(MATRIX_GENERATION_KEY)
+    return generation
+
+
+def invalidate_matrix_cache():
+    """
+    매트릭스 캐시 무효화
+
+    업로드/삭제, 셀 비활성화 토글, 제품/카테고리 변경 시 호출합니다.
+    세대 번호만 올리므로 기존 항목은 다시 조회되지 않고 TIMEOUT에 따라 정리됩니다.
+    """
+    try:
+        cache.incr(MATRIX_GENERATION_KEY)
+    except ValueError:
+        cache.set(MATRIX_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def _matrix_cache_key(country, department, version_params):
+    raw = repr((country.id if country else None, department, sorted(version_params.items())))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    # 기준 정보(제품/카테고리/비활성화 셀)가 admin 등에서 바뀌어도 이전 매트릭스를 쓰지 않도록 세대에 포함
+    return f'matrix:{matrix_generation()}:{reference.current().generation}:{digest}'
+
+
+def dashboard_matrix(country, department, query_params):
+    """
+    대시보드에 필요한 매트릭스 데이터 (국가/부서/버전 필터 단위 캐시)
+
+    query_params의 version_<product_id> 값을 버전 필터로 사용합니다.
+    반환값: products, categories, version_filters, product_versions, matrix_data, disabled_set
+    """
+    version_params = {
+        key: value for key, value in query_params.items()
+        if key.startswith('version_') and value
+    }
+    cache_key = _matrix_cache_key(country, department, version_params)
+    data = cache.get(cache_key)
+    if data is None:
+        data = _compute_dashboard_matrix(country, department, version_params)
+        cache.set(cache_key, data, timeout=getattr(settings, 'MATRIX_CACHE_TIMEOUT', None))
+    return data
+
+
+def _compute_dashboard_matrix(country, department, version_params):
+    ref = reference.current()
+    products = list(ref.products)
+
+    # 카테고리 필터링 (부서별)
+    categories = ref.categories_for(department)
+
+    # Version filters from GET params (format: version_1=1.0.0&version_2=1.1.0)
+    version_filters = {}
+    for product in products:
+        version_param = version_params.get(f'version_{product.id}')
+        if version_param:
+            version_filters[product.id] = version_param
+
+    # Get disabled cells for the selected country
+    disabled_set = ref.disabled_cells(country)
+
+    return {
+        'products': products,
+        'categories': categories,
+        'version_filters': version_filters,
+        'product_versions': product_versions(country, products),
+        'matrix_data': build_matrix(country, products, categories, version_filters, disabled_set),
+        'disabled_set': disabled_set,
+    }
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:13
+
+from django.conf import settings
+from django.db import migrations, models
+import re
+
+
+def make_version_key(version_string):
+    # 마이그레이션 작성 당시의 키 형식 (모델 코드가 바뀌어도 이 마이그레이션은 그대로 동작하도록 복사)
+    tokens = re.findall(r'\d+|[^\W\d_]+', (version_string or '').strip().lstrip('vV'))
+    parts = [token.zfill(10) if token.isdigit() else token.lower() for token in tokens]
+    return '.'.join(parts)[:255]
+
+
+def backfill_version_keys(apps, schema_editor):
+    Artifact = apps.get_model('artifacts', 'Artifact')
+    rows = list(Artifact.objects.only('id', 'version_string'))
+    for artifact in rows:
+        artifact.version_key = make_version_key(artifact.version_string)
+    Artifact.objects.bulk_update(rows, ['version_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0010_alter_artifact_file'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artifact',
+            name='version_key',
+            field=models.CharField(blank=True, editable=False, help_text='version_string에서 자동 생성 (의미 순서 정렬용)', max_length=255, verbose_name='버전 정렬 키'),
+        ),
+        migrations.RunPython(backfill_version_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='artifact',
+            index=models.Index(fields=['country', 'product', 'category', '-version_key'], name='artifacts_a_country_641025_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:15
+
+from django.db import migrations, models
+import hashlib
+
+
+def compute_file_checksum(file):
+    # 모델 코드가 바뀌어도 이 마이그레이션은 그대로 동작하도록 복사
+    sha256 = hashlib.sha256()
+    with file.open('rb'):
+        for chunk in file.chunks():
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def backfill_checksums(apps, schema_editor):
+    Artifact = apps.get_model('artifacts', 'Artifact')
+    for artifact in Artifact.objects.filter(checksum='').exclude(file=''):
+        try:
+            checksum = compute_file_checksum(artifact.file)
+        except OSError:
+            # 저장소에서 파일을 찾을 수 없는 경우 건너뜀
+            continue
+        Artifact.objects.filter(pk=artifact.pk).update(checksum=checksum)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0011_artifact_version_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='artifact',
+            name='checksum',
+            field=models.CharField(blank=True, editable=False, help_text='업로드 시 자동 계산', max_length=64, verbose_name='파일 해시 (SHA-256)'),
+        ),
+        migrations.RunPython(backfill_checksums, migrations.RunPython.noop),
+    ]
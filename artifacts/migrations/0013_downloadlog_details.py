@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0012_artifact_checksum'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='downloadlog',
+            name='details',
+            field=models.JSONField(blank=True, help_text='일괄 다운로드 압축 통계 등 (JSON)', null=True, verbose_name='추가 정보'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0013_downloadlog_details'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='downloadlog',
+            name='download_type',
+            field=models.CharField(choices=[('single', '개별 다운로드'), ('bulk', '일괄 다운로드'), ('partial', '부분 다운로드'), ('cached', '캐시 확인')], max_length=10, verbose_name='다운로드 유형'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0014_downloadlog_partial_cached_types'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='artifactactivitylog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='활동 시간'),
+        ),
+        migrations.AlterField(
+            model_name='downloadlog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='다운로드 시간'),
+        ),
+        migrations.AlterField(
+            model_name='loginattempt',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='시도 시간'),
+        ),
+    ]
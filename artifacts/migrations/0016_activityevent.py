@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0015_log_created_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('login', '로그인 시도'), ('download', '다운로드 로그'), ('artifact', '파일 활동 로그')], max_length=10, verbose_name='원본 로그')),
+                ('source_id', models.BigIntegerField(verbose_name='원본 로그 ID')),
+                ('event_type', models.CharField(choices=[('login', '로그인'), ('download', '다운로드'), ('upload', '업로드'), ('delete', '삭제')], max_length=10, verbose_name='활동 유형')),
+                ('username', models.CharField(blank=True, max_length=150, verbose_name='사용자명')),
+                ('product', models.CharField(blank=True, max_length=100, verbose_name='제품명')),
+                ('category', models.CharField(blank=True, max_length=100, verbose_name='카테고리명')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='파일명')),
+                ('version', models.CharField(blank=True, max_length=50, verbose_name='버전')),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True, verbose_name='IP 주소')),
+                ('user_agent', models.TextField(blank=True, verbose_name='User Agent')),
+                ('details', models.JSONField(blank=True, help_text='유형별 정보 (로그인 성공 여부, 다운로드 유형 등)', null=True, verbose_name='추가 정보')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='활동 시간')),
+            ],
+            options={
+                'verbose_name': '통합 활동 로그',
+                'verbose_name_plural': '통합 활동 로그',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='artifacts_a_created_fec17c_idx'), models.Index(fields=['event_type', '-created_at'], name='artifacts_a_event_t_c54531_idx'), models.Index(fields=['username', '-created_at'], name='artifacts_a_usernam_c003f9_idx')],
+                'unique_together': {('source', 'source_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0016_activityevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('event_type', models.CharField(choices=[('login', '로그인'), ('download', '다운로드'), ('upload', '업로드'), ('delete', '삭제')], max_length=10, verbose_name='활동 유형')),
+                ('username', models.CharField(blank=True, max_length=150, verbose_name='사용자명')),
+                ('product', models.CharField(blank=True, max_length=100, verbose_name='제품명')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='건수')),
+            ],
+            options={
+                'verbose_name': '일별 활동 집계',
+                'verbose_name_plural': '일별 활동 집계',
+                'ordering': ['-date', 'event_type', 'username'],
+                'indexes': [models.Index(fields=['event_type', '-date'], name='artifacts_d_event_t_0c7bab_idx')],
+                'unique_together': {('date', 'event_type', 'username', 'product')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0017_dailyactivityrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DownloadDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('download_type', models.CharField(choices=[('single', '개별 다운로드'), ('bulk', '일괄 다운로드'), ('partial', '부분 다운로드'), ('cached', '캐시 확인')], max_length=10, verbose_name='다운로드 유형')),
+                ('username', models.CharField(blank=True, max_length=150, verbose_name='사용자명')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='건수')),
+                ('artifact', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_download_counts', to='artifacts.artifact', verbose_name='산출물')),
+                ('country', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_download_counts', to='artifacts.country', verbose_name='국가')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_download_counts', to='artifacts.product', verbose_name='제품')),
+            ],
+            options={
+                'verbose_name': '일별 다운로드 집계',
+                'verbose_name_plural': '일별 다운로드 집계',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='artifacts_d_date_1c5265_idx'), models.Index(fields=['product', 'date'], name='artifacts_d_product_908877_idx'), models.Index(fields=['country', 'date'], name='artifacts_d_country_2ec97b_idx'), models.Index(fields=['artifact', 'date'], name='artifacts_d_artifac_35caf5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+
+FTS_TABLE = 'artifacts_activityevent_fts'
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        username, product, filename,
+        content='artifacts_activityevent', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON artifacts_activityevent BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, username, product, filename)
+        VALUES (new.id, new.username, new.product, new.filename);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON artifacts_activityevent BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, username, product, filename)
+        VALUES ('delete', old.id, old.username, old.product, old.filename);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON artifacts_activityevent BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, username, product, filename)
+        VALUES ('delete', old.id, old.username, old.product, old.filename);
+        INSERT INTO {FTS_TABLE}(rowid, username, product, filename)
+        VALUES (new.id, new.username, new.product, new.filename);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def fts5_trigram_supported(connection):
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts5_trigram_check USING fts5(x, tokenize='trigram')")
+            cursor.execute('DROP TABLE temp.fts5_trigram_check')
+        except Exception:
+            return False
+    return True
+
+
+def create_fts_index(apps, schema_editor):
+    """SQLite FTS5 trigram 보조 인덱스 (지원하지 않는 DB/SQLite 버전이면 건너뜀 -> icontains 검색)"""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or not fts5_trigram_supported(connection):
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0018_downloaddailycount'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
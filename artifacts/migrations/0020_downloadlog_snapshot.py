@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:31
+
+import os
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+
+
+def backfill_snapshots(apps, schema_editor):
+    """기존 다운로드 로그에 산출물/제품 정보 스냅샷 채우기 (이미 삭제된 산출물은 채울 수 없음)"""
+    DownloadLog = apps.get_model('artifacts', 'DownloadLog')
+    logs = (DownloadLog.objects.filter(snapshot__isnull=True)
+            .select_related('artifact__product', 'artifact__category', 'artifact__country',
+                            'product', 'country')
+            .order_by('id'))
+    batch = []
+    for log in logs.iterator(chunk_size=BATCH_SIZE):
+        if log.download_type == 'bulk':
+            if log.product is None:
+                continue
+            log.snapshot = {
+                'product': log.product.name,
+                'country': log.country.code if log.country else None,
+            }
+        else:
+            artifact = log.artifact
+            if artifact is None:
+                continue
+            log.snapshot = {
+                'id': artifact.id,
+                'filename': os.path.basename(artifact.file.name),
+                'country': artifact.country.code if artifact.country else None,
+                'product': artifact.product.name,
+                'category': artifact.category.name,
+                'version': artifact.version_string,
+            }
+        batch.append(log)
+        if len(batch) >= BATCH_SIZE:
+            DownloadLog.objects.bulk_update(batch, ['snapshot'])
+            batch = []
+    if batch:
+        DownloadLog.objects.bulk_update(batch, ['snapshot'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0019_activityevent_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='downloadlog',
+            name='snapshot',
+            field=models.JSONField(blank=True, help_text='개별: 파일명/제품/카테고리/버전/국가, 일괄: 제품/국가 (JSON)', null=True, verbose_name='다운로드 대상 스냅샷'),
+        ),
+        migrations.RunPython(backfill_snapshots, migrations.RunPython.noop),
+    ]
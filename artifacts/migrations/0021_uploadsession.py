@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:38
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0020_downloadlog_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='세션 토큰')),
+                ('version_string', models.CharField(max_length=50, verbose_name='산출물 버전')),
+                ('filename', models.CharField(max_length=255, verbose_name='파일명')),
+                ('size', models.BigIntegerField(verbose_name='전체 크기 (bytes)')),
+                ('received', models.BigIntegerField(default=0, verbose_name='받은 크기 (bytes)')),
+                ('status', models.CharField(choices=[('uploading', '업로드 중'), ('completed', '완료')], default='uploading', max_length=20, verbose_name='상태')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='시작 일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='마지막 수신 일시')),
+                ('artifact', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload_sessions', to='artifacts.artifact', verbose_name='생성된 산출물')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='artifacts.category', verbose_name='카테고리')),
+                ('country', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='artifacts.country', verbose_name='국가')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='artifacts.product', verbose_name='제품')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='업로드한 사용자')),
+            ],
+            options={
+                'verbose_name': '분할 업로드 세션',
+                'verbose_name_plural': '분할 업로드 세션',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'updated_at'], name='artifacts_u_status_b500eb_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:41
+
+import os
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_original_filenames(apps, schema_editor):
+    """기존 산출물의 원본 파일명 = 현재 저장 경로의 파일명 (Blob으로 옮긴 뒤에도 표시용으로 유지)"""
+    Artifact = apps.get_model('artifacts', 'Artifact')
+    artifacts = list(Artifact.objects.filter(original_filename='').only('id', 'file'))
+    for artifact in artifacts:
+        artifact.original_filename = os.path.basename(artifact.file.name)[:255]
+    Artifact.objects.bulk_update(artifacts, ['original_filename'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0021_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Blob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True, verbose_name='파일 해시 (SHA-256)')),
+                ('file', models.FileField(upload_to='blobs', verbose_name='파일')),
+                ('size', models.BigIntegerField(verbose_name='크기 (bytes)')),
+                ('ref_count', models.PositiveIntegerField(default=0, help_text='이 파일을 사용하는 산출물 수, 0이 되면 삭제', verbose_name='참조 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록일')),
+            ],
+            options={
+                'verbose_name': '파일 저장소',
+                'verbose_name_plural': '파일 저장소',
+            },
+        ),
+        migrations.AddField(
+            model_name='artifact',
+            name='original_filename',
+            field=models.CharField(blank=True, editable=False, help_text='업로드한 파일명 (저장 경로는 해시 기반)', max_length=255, verbose_name='원본 파일명'),
+        ),
+        migrations.AddField(
+            model_name='artifact',
+            name='blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='artifacts', to='artifacts.blob', verbose_name='파일 저장소'),
+        ),
+        migrations.RunPython(fill_original_filenames, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0022_blob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('checksum', '체크섬 검증'), ('page_count', '페이지 수'), ('thumbnail', '썸네일')], max_length=20, verbose_name='작업 종류')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '처리 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, help_text='실패 후 재시도 대기 중이면 다음 시도 일시', verbose_name='실행 가능 일시')),
+                ('locked_by', models.CharField(blank=True, max_length=100, verbose_name='처리 중인 워커')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='처리 시작 일시')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='처리 결과')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록 일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정 일시')),
+                ('artifact', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='processing_jobs', to='artifacts.artifact', verbose_name='산출물')),
+            ],
+            options={
+                'verbose_name': '처리 작업',
+                'verbose_name_plural': '처리 작업',
+                'indexes': [models.Index(fields=['status', 'run_after'], name='artifacts_p_status_64aa38_idx')],
+                'unique_together': {('artifact', 'kind')},
+            },
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+FTS_TABLE = 'artifacts_artifacttext_fts'
+
+# unicode61: 공백/문장부호 기준 토큰 (검색어는 앞부분 일치로 조회하므로 '제품'으로 '제품을'도 찾음)
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        filename, body,
+        content='artifacts_artifacttext', content_rowid='artifact_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON artifacts_artifacttext BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, filename, body) VALUES (new.artifact_id, new.filename, new.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON artifacts_artifacttext BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, filename, body)
+        VALUES ('delete', old.artifact_id, old.filename, old.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON artifacts_artifacttext BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, filename, body)
+        VALUES ('delete', old.artifact_id, old.filename, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, filename, body) VALUES (new.artifact_id, new.filename, new.body);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+def fts5_supported(connection):
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute('CREATE VIRTUAL TABLE temp.fts5_check USING fts5(x)')
+            cursor.execute('DROP TABLE temp.fts5_check')
+        except Exception:
+            return False
+    return True
+
+
+def create_fts_index(apps, schema_editor):
+    """SQLite FTS5 본문 인덱스 (지원하지 않는 DB/SQLite 빌드면 건너뜀 -> icontains 검색)"""
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite' or not fts5_supported(connection):
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0023_processingjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtifactText',
+            fields=[
+                ('artifact', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='text', serialize=False, to='artifacts.artifact', verbose_name='산출물')),
+                ('filename', models.CharField(max_length=255, verbose_name='파일명')),
+                ('body', models.TextField(blank=True, verbose_name='본문')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='추출 일시')),
+            ],
+            options={
+                'verbose_name': '산출물 본문',
+                'verbose_name_plural': '산출물 본문',
+            },
+        ),
+        migrations.AlterField(
+            model_name='processingjob',
+            name='kind',
+            field=models.CharField(choices=[('checksum', '체크섬 검증'), ('page_count', '페이지 수'), ('thumbnail', '썸네일'), ('text', '본문 색인')], max_length=20, verbose_name='작업 종류'),
+        ),
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
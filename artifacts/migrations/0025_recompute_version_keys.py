@@ -0,0 +1,43 @@
+from django.db import migrations
+import re
+
+
+def _number_key(token):
+    digits = token.lstrip('0') or '0'
+    if len(digits) <= 10:
+        return digits.zfill(10)
+    return ':' + str(len(digits)).zfill(3) + digits
+
+
+def make_version_key(version_string):
+    # 마이그레이션 작성 당시의 키 형식 (모델 코드가 바뀌어도 이 마이그레이션은 그대로 동작하도록 복사)
+    tokens = re.findall(r'\d+|[^\W\d_]+', (version_string or '').strip().lstrip('vV'))
+    if not tokens:
+        return ''
+    key = ''
+    for index, token in enumerate(tokens):
+        if token.isdigit():
+            key += ('.' if index else '') + _number_key(token)
+        else:
+            key += ('-' if index else '') + token.lower()
+    return (key + '.')[:255]
+
+
+def recompute_version_keys(apps, schema_editor):
+    # 프리릴리스가 정식 릴리스보다 앞에 정렬되도록 바뀐 키 형식으로 다시 계산
+    Artifact = apps.get_model('artifacts', 'Artifact')
+    rows = list(Artifact.objects.only('id', 'version_string'))
+    for artifact in rows:
+        artifact.version_key = make_version_key(artifact.version_string)
+    Artifact.objects.bulk_update(rows, ['version_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0024_artifacttext'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_version_keys, migrations.RunPython.noop),
+    ]
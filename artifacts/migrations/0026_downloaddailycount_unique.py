@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:09
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+KEY_FIELDS = ('date', 'download_type', 'artifact', 'product', 'country', 'username')
+
+
+def merge_duplicate_counts(apps, schema_editor):
+    # 제약 추가 전, 같은 키로 나뉘어 있던 행을 첫 행으로 합침
+    DownloadDailyCount = apps.get_model('artifacts', 'DownloadDailyCount')
+    duplicates = (DownloadDailyCount.objects.values(*KEY_FIELDS)
+                  .annotate(rows=Count('id'), first_id=Min('id'), total=Sum('count'))
+                  .filter(rows__gt=1))
+    for row in duplicates:
+        lookup = {field: row[field] for field in KEY_FIELDS}
+        DownloadDailyCount.objects.filter(**lookup).exclude(id=row['first_id']).delete()
+        DownloadDailyCount.objects.filter(id=row['first_id']).update(count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0025_recompute_version_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_counts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='downloaddailycount',
+            constraint=models.UniqueConstraint(fields=('date', 'download_type', 'artifact', 'product', 'country', 'username'), name='unique_download_daily_count'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_usernames(apps, schema_editor):
+    """username 필드 도입 전 다운로드 로그의 사용자명을 사용자 계정에서 채우기 (삭제된 계정은 채울 수 없음)"""
+    DownloadLog = apps.get_model('artifacts', 'DownloadLog')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    DownloadLog.objects.filter(username='', user__isnull=False).update(
+        username=Subquery(User.objects.filter(pk=OuterRef('user_id')).values('username')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0026_downloaddailycount_unique'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_usernames, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:11
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_event_usernames(apps, schema_editor):
+    """사용자명 없이 투영된 다운로드 활동을 다운로드 로그의 사용자명(0027에서 채움)으로 채우기"""
+    ActivityEvent = apps.get_model('artifacts', 'ActivityEvent')
+    DownloadLog = apps.get_model('artifacts', 'DownloadLog')
+    named_logs = DownloadLog.objects.exclude(username='')
+    ActivityEvent.objects.filter(
+        source='download', username='', source_id__in=named_logs.values('id'),
+    ).update(username=Subquery(named_logs.filter(pk=OuterRef('source_id')).values('username')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0027_downloadlog_username'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_event_usernames, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='activityevent',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='activityevent_username_lower'),
+        ),
+        migrations.AddIndex(
+            model_name='downloadlog',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='downloadlog_username_lower'),
+        ),
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='loginattempt_username_lower'),
+        ),
+    ]
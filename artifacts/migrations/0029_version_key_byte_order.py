@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:26
+
+import artifacts.models
+from django.db import migrations
+
+
+def alter_collation(apps, schema_editor):
+    # SQLite는 기본 콜레이션(BINARY)이 이미 바이트 순서이므로 테이블을 다시 만들지 않음
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Artifact = apps.get_model('artifacts', 'Artifact')
+    old_field = Artifact._meta.get_field('version_key')
+    new_field = artifacts.models.ByteOrderCharField(blank=True, editable=False, max_length=255)
+    new_field.set_attributes_from_name('version_key')
+    new_field.model = Artifact
+    schema_editor.alter_field(Artifact, old_field, new_field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0028_username_search_lower'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(alter_collation, migrations.RunPython.noop),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='artifact',
+                    name='version_key',
+                    field=artifacts.models.ByteOrderCharField(blank=True, editable=False, help_text='version_string에서 자동 생성 (의미 순서 정렬용)', max_length=255, verbose_name='버전 정렬 키'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:27
+
+import artifacts.models
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+MODELS = (
+    ('activityevent', 'activityevent_username_lower'),
+    ('downloadlog', 'downloadlog_username_lower'),
+    ('loginattempt', 'loginattempt_username_lower'),
+)
+
+
+def username_index(name, byte_order=True):
+    expression = django.db.models.functions.text.Lower('username')
+    if byte_order:
+        expression = artifacts.models.ByteOrder(expression)
+    return models.Index(expression, name=name)
+
+
+def recreate_indexes(apps, schema_editor, byte_order=True):
+    # SQLite는 ByteOrder가 LOWER(username) 그대로이므로 인덱스가 같음
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for model_name, name in MODELS:
+        model = apps.get_model('artifacts', model_name)
+        schema_editor.remove_index(model, username_index(name, not byte_order))
+        schema_editor.add_index(model, username_index(name, byte_order))
+
+
+def restore_indexes(apps, schema_editor):
+    recreate_indexes(apps, schema_editor, byte_order=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artifacts', '0029_version_key_byte_order'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(recreate_indexes, restore_indexes),
+            ],
+            state_operations=[
+                operation
+                for model_name, name in MODELS
+                for operation in (
+                    migrations.RemoveIndex(model_name=model_name, name=name),
+                    migrations.AddIndex(model_name=model_name, index=username_index(name)),
+                )
+            ],
+        ),
+    ]
@@ -1,7 +1,13 @@
 from django.contrib import admin
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Collate, Lower
+from django.utils.deconstruct import deconstructible
+from django.utils import timezone
+import hashlib
 import os
+import re
+import uuid
 from datetime import datetime
 
 
@@ -21,6 +27,86 @@ def artifact_upload_path(instance, filename):
     return os.path.join('artifacts', timestamp_dir, filename)
 
 
+def compute_file_checksum(file):
+    """파일 내용의 SHA-256 해시 (청크 단위로 읽어 메모리 사용 최소화)"""
+    # 이미 열려 있는 파일(업로드 중인 파일 등)은 호출한 쪽에서 계속 사용하므로 닫지 않음
+    close_after = getattr(file, 'closed', False)
+    sha256 = hashlib.sha256()
+    try:
+        for chunk in file.chunks():
+            sha256.update(chunk)
+    finally:
+        if close_after:
+            file.close()
+    return sha256.hexdigest()
+
+
+VERSION_KEY_MAX_LENGTH = 255
+VERSION_KEY_NUMBER_WIDTH = 10
+
+
+def _version_number_key(token):
+    """숫자 구간 키: 폭을 넘는 숫자는 ':' + 자릿수(3자리) + 숫자로 넓혀 폭 안의 숫자보다 뒤에 정렬"""
+    digits = token.lstrip('0') or '0'
+    if len(digits) <= VERSION_KEY_NUMBER_WIDTH:
+        return digits.zfill(VERSION_KEY_NUMBER_WIDTH)
+    return ':' + str(len(digits)).zfill(3) + digits
+
+
+def make_version_key(version_string):
+    """
+    버전 문자열을 문자열 정렬만으로 의미 순서가 되는 키로 변환
+    숫자 구간은 0으로 자릿수를 맞추고 문자 구간은 소문자로 통일
+
+    숫자 앞에는 '.', 문자 앞에는 '-'를 붙이고 끝에 '.'를 붙여
+    프리릴리스('5.0.0-rc1')가 정식 릴리스('5.0.0')보다 앞에 정렬되도록 함
+
+    예: '5.9.0'     -> '0000000005.0000000009.0000000000.'
+        '5.18.0'    -> '0000000005.0000000018.0000000000.'
+        '5.18.0rc1' -> '0000000005.0000000018.0000000000-rc.0000000001.'
+    """
+    tokens = re.findall(r'\d+|[^\W\d_]+', (version_string or '').strip().lstrip('vV'))
+    if not tokens:
+        return ''
+    key = ''
+    for index, token in enumerate(tokens):
+        if token.isdigit():
+            key += ('.' if index else '') + _version_number_key(token)
+        else:
+            key += ('-' if index else '') + token.lower()
+    return (key + '.')[:VERSION_KEY_MAX_LENGTH]
+
+
+class ByteOrderCharField(models.CharField):
+    """
+    바이트(코드 포인트) 순서로 비교/정렬하는 CharField
+
+    version_key는 '-' < '.' < 숫자 < ':' 순서에 의존하므로 로캘 콜레이션을 쓰면 안 됨.
+    PostgreSQL은 "C" 콜레이션을 지정하고, SQLite는 기본 콜레이션(BINARY)이 바이트 순서라 그대로 둠
+    """
+
+    def db_parameters(self, connection):
+        params = super().db_parameters(connection)
+        if connection.vendor == 'postgresql':
+            params['collation'] = 'C'
+        return params
+
+
+@deconstructible(path='artifacts.models.ByteOrder')
+class ByteOrder(Collate):
+    """
+    바이트 순서로 비교하는 표현식 (사용자명 앞부분 일치 범위 조회와 그 표현식 인덱스용)
+
+    PostgreSQL은 COLLATE "C"를 붙이고, SQLite는 기본 콜레이션(BINARY)이 바이트 순서라 그대로 둠
+    """
+
+    def __init__(self, expression):
+        super().__init__(expression, 'C')
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return compiler.compile(self.get_source_expressions()[0])
+
+
 
 class Country(models.Model):
     """국가 모델 (4개 국가)"""
@@ -105,6 +191,23 @@ class Category(models.Model):
         return self.name
 
 
+class Blob(models.Model):
+    """내용 주소 기반 파일 (SHA-256 해시별로 한 번만 저장, artifacts.blobs 참고)"""
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name="파일 해시 (SHA-256)")
+    file = models.FileField(upload_to='blobs', verbose_name="파일")
+    size = models.BigIntegerField(verbose_name="크기 (bytes)")
+    ref_count = models.PositiveIntegerField(default=0, verbose_name="참조 수",
+                                            help_text="이 파일을 사용하는 산출물 수, 0이 되면 삭제")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="등록일")
+
+    class Meta:
+        verbose_name = "파일 저장소"
+        verbose_name_plural = "파일 저장소"
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} bytes, 참조 {self.ref_count})"
+
+
 class Artifact(models.Model):
     """산출물 모델"""
     country = models.ForeignKey(Country, on_delete=models.CASCADE,
@@ -117,6 +220,15 @@ class Artifact(models.Model):
     file = models.FileField(upload_to=artifact_upload_path, verbose_name="파일")
     version_string = models.CharField(max_length=50, verbose_name="산출물 버전", 
                                      help_text="예: 5.18.0")
+    version_key = ByteOrderCharField(max_length=VERSION_KEY_MAX_LENGTH, verbose_name="버전 정렬 키",
+                                   blank=True, editable=False,
+                                   help_text="version_string에서 자동 생성 (의미 순서 정렬용)")
+    checksum = models.CharField(max_length=64, verbose_name="파일 해시 (SHA-256)", blank=True,
+                                editable=False, help_text="업로드 시 자동 계산")
+    blob = models.ForeignKey(Blob, on_delete=models.PROTECT, null=True, blank=True, editable=False,
+                            related_name='artifacts', verbose_name="파일 저장소")
+    original_filename = models.CharField(max_length=255, verbose_name="원본 파일명", blank=True,
+                                         editable=False, help_text="업로드한 파일명 (저장 경로는 해시 기반)")
     uploader = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, 
                                 verbose_name="업로드한 사용자")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="등록일")
@@ -127,17 +239,140 @@ class Artifact(models.Model):
         verbose_name_plural = "산출물"
         indexes = [
             models.Index(fields=['country', 'product', 'category', '-created_at']),
+            models.Index(fields=['country', 'product', 'category', '-version_key']),
         ]
 
     def __str__(self):
         country_str = self.country.code if self.country else "Global"
         return f"[{country_str}] {self.product.name} - {self.category.name} (v{self.version_string})"
 
+    def save(self, *args, **kwargs):
+        # 버전 문자열이 바뀌어도 정렬 키가 항상 일치하도록 저장 시 재계산
+        self.version_key = make_version_key(self.version_string)
+        # Blob 참조 수 증가와 행 저장을 한 트랜잭션으로 (행 저장이 실패하면 참조 수도 되돌림)
+        with transaction.atomic(using=kwargs.get('using')):
+            if self.file and not self.file._committed:
+                # 새 파일은 내용 해시 기반 Blob으로 저장 (같은 내용이 있으면 참조 수만 증가)
+                from .blobs import store_blob
+                previous_blob_id = self.blob_id
+                self.original_filename = os.path.basename(self.file.name)
+                self.blob = store_blob(self.file.file)
+                self.file = self.blob.file.name
+                self.checksum = self.blob.sha256
+                if previous_blob_id is not None:
+                    from .blobs import release_blob
+                    release_blob(previous_blob_id)
+            elif self.file and not self.checksum:
+                self.checksum = compute_file_checksum(self.file)
+            super().save(*args, **kwargs)
+
     @property
     def filename(self):
-        """파일명 반환"""
-        import os
-        return os.path.basename(self.file.name)
+        """파일명 반환 (Blob 저장 경로가 아닌 업로드한 파일명)"""
+        return self.original_filename or os.path.basename(self.file.name)
+
+    def snapshot(self):
+        """로그에 남길 산출물 정보 (산출물이 삭제된 뒤에도 표시할 수 있도록 JSON으로 보관)"""
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'country': self.country.code if self.country else None,
+            'product': self.product.name,
+            'category': self.category.name,
+            'version': self.version_string,
+        }
+
+
+class UploadSession(models.Model):
+    """분할 업로드 세션 - 청크를 스테이징 파일에 이어 쓰고 완료 시 산출물 생성 (artifacts.uploads 참고)"""
+    STATUS_CHOICES = [
+        ('uploading', '업로드 중'),
+        ('completed', '완료'),
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, verbose_name="세션 토큰")
+    user = models.ForeignKey(User, on_delete=models.CASCADE,
+                            related_name='upload_sessions', verbose_name="업로드한 사용자")
+    country = models.ForeignKey(Country, on_delete=models.CASCADE, null=True, blank=True, verbose_name="국가")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, verbose_name="제품")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, verbose_name="카테고리")
+    version_string = models.CharField(max_length=50, verbose_name="산출물 버전")
+    filename = models.CharField(max_length=255, verbose_name="파일명")
+    size = models.BigIntegerField(verbose_name="전체 크기 (bytes)")
+    received = models.BigIntegerField(default=0, verbose_name="받은 크기 (bytes)")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading', verbose_name="상태")
+    artifact = models.ForeignKey(Artifact, on_delete=models.SET_NULL, null=True, blank=True,
+                                related_name='upload_sessions', verbose_name="생성된 산출물")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="시작 일시")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="마지막 수신 일시")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "분할 업로드 세션"
+        verbose_name_plural = "분할 업로드 세션"
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size} bytes, {self.get_status_display()})"
+
+
+class ProcessingJob(models.Model):
+    """업로드 후 처리 작업 (체크섬 검증, 페이지 수, 썸네일 등) - artifacts.jobs 참고"""
+    KIND_CHOICES = [
+        ('checksum', '체크섬 검증'),
+        ('page_count', '페이지 수'),
+        ('thumbnail', '썸네일'),
+        ('text', '본문 색인'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', '대기'),
+        ('running', '처리 중'),
+        ('done', '완료'),
+        ('failed', '실패'),
+    ]
+
+    artifact = models.ForeignKey(Artifact, on_delete=models.CASCADE,
+                                related_name='processing_jobs', verbose_name="산출물")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="작업 종류")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name="상태")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="시도 횟수")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="실행 가능 일시",
+                                     help_text="실패 후 재시도 대기 중이면 다음 시도 일시")
+    locked_by = models.CharField(max_length=100, blank=True, verbose_name="처리 중인 워커")
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name="처리 시작 일시")
+    result = models.JSONField(null=True, blank=True, verbose_name="처리 결과")
+    last_error = models.TextField(blank=True, verbose_name="마지막 오류")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="등록 일시")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정 일시")
+
+    class Meta:
+        verbose_name = "처리 작업"
+        verbose_name_plural = "처리 작업"
+        unique_together = [['artifact', 'kind']]
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.artifact_id} {self.get_kind_display()} ({self.get_status_display()})"
+
+
+class ArtifactText(models.Model):
+    """산출물 파일에서 추출한 본문 텍스트 (내용 검색용, FTS5 보조 인덱스의 원본 - artifacts.search 참고)"""
+    artifact = models.OneToOneField(Artifact, on_delete=models.CASCADE, primary_key=True,
+                                    related_name='text', verbose_name="산출물")
+    filename = models.CharField(max_length=255, verbose_name="파일명")
+    body = models.TextField(blank=True, verbose_name="본문")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="추출 일시")
+
+    class Meta:
+        verbose_name = "산출물 본문"
+        verbose_name_plural = "산출물 본문"
+
+    def __str__(self):
+        return f"{self.filename} ({len(self.body)}자)"
 
 
 class ProductCategoryDisabled(models.Model):
@@ -177,7 +412,8 @@ class LoginAttempt(models.Model):
     success = models.BooleanField(default=False, verbose_name="성공 여부")
     failure_reason = models.CharField(max_length=255, verbose_name="실패 이유",
                                      blank=True, help_text="로그인 실패 시 이유")
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="시도 시간")
+    # 로그는 audit 버퍼에서 모아 bulk_create하므로 auto_now_add 대신 생성 시각을 기본값으로 기록
+    created_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="시도 시간")
 
     class Meta:
         verbose_name = "로그인 시도"
@@ -187,6 +423,8 @@ class LoginAttempt(models.Model):
             models.Index(fields=['-created_at']),
             models.Index(fields=['username', '-created_at']),
             models.Index(fields=['success', '-created_at']),
+            # 사용자명 앞부분 일치 검색 (대소문자 무시, artifacts.search.prefix_q)
+            models.Index(ByteOrder(Lower('username')), name='loginattempt_username_lower'),
         ]
 
     def __str__(self):
@@ -199,6 +437,8 @@ class DownloadLog(models.Model):
     DOWNLOAD_TYPE_CHOICES = [
         ('single', '개별 다운로드'),
         ('bulk', '일괄 다운로드'),
+        ('partial', '부분 다운로드'),
+        ('cached', '캐시 확인'),
     ]
     
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
@@ -220,10 +460,16 @@ class DownloadLog(models.Model):
     artifact_count = models.IntegerField(default=0, verbose_name="다운로드된 파일 수",
                                         help_text="일괄 다운로드 시 포함된 파일 개수")
     
+    # Snapshot of downloaded target (로그 조회 시 조인 없이 표시, 산출물 삭제 후에도 유지)
+    snapshot = models.JSONField(verbose_name="다운로드 대상 스냅샷", null=True, blank=True,
+                                help_text="개별: 파일명/제품/카테고리/버전/국가, 일괄: 제품/국가 (JSON)")
+    
     ip_address = models.GenericIPAddressField(verbose_name="IP 주소", null=True, blank=True)
     user_agent = models.TextField(verbose_name="User Agent", blank=True,
                                   help_text="브라우저 및 OS 정보")
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="다운로드 시간")
+    details = models.JSONField(verbose_name="추가 정보", null=True, blank=True,
+                              help_text="일괄 다운로드 압축 통계 등 (JSON)")
+    created_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="다운로드 시간")
     
     class Meta:
         verbose_name = "다운로드 로그"
@@ -233,10 +479,12 @@ class DownloadLog(models.Model):
             models.Index(fields=['-created_at']),
             models.Index(fields=['username', '-created_at']),
             models.Index(fields=['download_type', '-created_at']),
+            # 사용자명 앞부분 일치 검색 (대소문자 무시, artifacts.search.prefix_q)
+            models.Index(ByteOrder(Lower('username')), name='downloadlog_username_lower'),
         ]
     
     def __str__(self):
-        if self.download_type == 'single':
+        if self.download_type != 'bulk':
             return f"{self.username} - {self.artifact.filename if self.artifact else 'Unknown'} ({self.created_at.strftime('%Y-%m-%d %H:%M:%S')})"
         else:
             return f"{self.username} - {self.product.name if self.product else 'Unknown'} 일괄 ({self.created_at.strftime('%Y-%m-%d %H:%M:%S')})"
@@ -270,7 +518,7 @@ class ArtifactActivityLog(models.Model):
     details = models.JSONField(verbose_name="추가 정보", null=True, blank=True,
                               help_text="추가 메타데이터 (JSON)")
     
-    created_at = models.DateTimeField(auto_now_add=True, verbose_name="활동 시간")
+    created_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="활동 시간")
     
     class Meta:
         verbose_name = "파일 활동 로그"
@@ -291,3 +539,122 @@ class ArtifactActivityLog(models.Model):
         else:
             filename = 'Unknown'
         return f"{self.username} - {action_display}: {filename} ({self.created_at.strftime('%Y-%m-%d %H:%M:%S')})"
+
+
+class ActivityEvent(models.Model):
+    """
+    통합 활동 로그 (로그인/다운로드/파일 활동 로그의 비정규화 사본)
+
+    원본 로그가 기록될 때 함께 추가되며(artifacts.activity), 통합 로그 화면은 이 테이블만 조회합니다.
+    기존 로그는 backfill_activity_events 명령으로 채웁니다.
+    """
+    SOURCE_CHOICES = [
+        ('login', '로그인 시도'),
+        ('download', '다운로드 로그'),
+        ('artifact', '파일 활동 로그'),
+    ]
+    EVENT_TYPE_CHOICES = [
+        ('login', '로그인'),
+        ('download', '다운로드'),
+        ('upload', '업로드'),
+        ('delete', '삭제'),
+    ]
+
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, verbose_name="원본 로그")
+    source_id = models.BigIntegerField(verbose_name="원본 로그 ID")
+    event_type = models.CharField(max_length=10, choices=EVENT_TYPE_CHOICES, verbose_name="활동 유형")
+
+    username = models.CharField(max_length=150, verbose_name="사용자명", blank=True)
+    product = models.CharField(max_length=100, verbose_name="제품명", blank=True)
+    category = models.CharField(max_length=100, verbose_name="카테고리명", blank=True)
+    filename = models.CharField(max_length=255, verbose_name="파일명", blank=True)
+    version = models.CharField(max_length=50, verbose_name="버전", blank=True)
+
+    ip_address = models.GenericIPAddressField(verbose_name="IP 주소", null=True, blank=True)
+    user_agent = models.TextField(verbose_name="User Agent", blank=True)
+    details = models.JSONField(verbose_name="추가 정보", null=True, blank=True,
+                              help_text="유형별 정보 (로그인 성공 여부, 다운로드 유형 등)")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="활동 시간")
+
+    class Meta:
+        verbose_name = "통합 활동 로그"
+        verbose_name_plural = "통합 활동 로그"
+        ordering = ['-created_at']
+        unique_together = [['source', 'source_id']]
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['event_type', '-created_at']),
+            models.Index(fields=['username', '-created_at']),
+            # 사용자명 앞부분 일치 검색 (대소문자 무시, artifacts.search.prefix_q)
+            models.Index(ByteOrder(Lower('username')), name='activityevent_username_lower'),
+        ]
+
+    def __str__(self):
+        return f"{self.username} - {self.get_event_type_display()} ({self.created_at.strftime('%Y-%m-%d %H:%M:%S')})"
+
+
+class DailyActivityRollup(models.Model):
+    """
+    보관 기간이 지난 활동 로그의 일별 집계 (사용자/제품/활동 유형별 건수)
+
+    원본 로그는 prune_audit_logs 명령으로 압축 파일로 내보낸 뒤 삭제되고, 통계는 이 테이블에 남습니다.
+    """
+    date = models.DateField(verbose_name="날짜")
+    event_type = models.CharField(max_length=10, choices=ActivityEvent.EVENT_TYPE_CHOICES,
+                                  verbose_name="활동 유형")
+    username = models.CharField(max_length=150, verbose_name="사용자명", blank=True)
+    product = models.CharField(max_length=100, verbose_name="제품명", blank=True)
+    count = models.PositiveIntegerField(default=0, verbose_name="건수")
+
+    class Meta:
+        verbose_name = "일별 활동 집계"
+        verbose_name_plural = "일별 활동 집계"
+        ordering = ['-date', 'event_type', 'username']
+        unique_together = [['date', 'event_type', 'username', 'product']]
+        indexes = [
+            models.Index(fields=['event_type', '-date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.username} - {self.get_event_type_display()} {self.count}건"
+
+
+class DownloadDailyCount(models.Model):
+    """
+    일별 다운로드 집계 (산출물/제품/국가/사용자/다운로드 유형별 건수)
+
+    DownloadLog가 기록될 때 artifacts.analytics에서 count를 증가시킵니다.
+    UNIQUE 제약은 NULL을 서로 다른 값으로 보므로 키에 NULL이 있는 조합(일괄 다운로드, 삭제된 산출물)은
+    행이 여러 개일 수 있어 조회 시에는 항상 Sum('count')로 합산합니다.
+    """
+    date = models.DateField(verbose_name="날짜")
+    download_type = models.CharField(max_length=10, choices=DownloadLog.DOWNLOAD_TYPE_CHOICES,
+                                     verbose_name="다운로드 유형")
+    artifact = models.ForeignKey(Artifact, on_delete=models.SET_NULL, null=True, blank=True,
+                                 related_name='daily_download_counts', verbose_name="산출물")
+    product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True, blank=True,
+                                related_name='daily_download_counts', verbose_name="제품")
+    country = models.ForeignKey(Country, on_delete=models.SET_NULL, null=True, blank=True,
+                                related_name='daily_download_counts', verbose_name="국가")
+    username = models.CharField(max_length=150, verbose_name="사용자명", blank=True)
+    count = models.PositiveIntegerField(default=0, verbose_name="건수")
+
+    class Meta:
+        verbose_name = "일별 다운로드 집계"
+        verbose_name_plural = "일별 다운로드 집계"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'download_type', 'artifact', 'product', 'country', 'username'],
+                name='unique_download_daily_count',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date']),
+            models.Index(fields=['product', 'date']),
+            models.Index(fields=['country', 'date']),
+            models.Index(fields=['artifact', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.username} - {self.get_download_type_display()} {self.count}건"
@@ -0,0 +1,143 @@
+"""
+로그 목록 페이지네이션
+
+여러 로그 테이블(로그인/다운로드/파일 활동)을 created_at 최신순으로 합쳐 보여줄 때
+전체를 불러와 정렬하지 않고, 테이블마다 필요한 만큼만 (-created_at, -id) 순으로 읽어
+heapq.merge로 병합합니다. 각 테이블의 -created_at 인덱스를 그대로 사용합니다.
+
+- 페이지 번호 방식: 테이블마다 상위 offset + per_page + 1건만 조회
+- 커서 방식: 마지막(또는 첫) 행의 (created_at, 출처, id) 이후만 조회하므로
+             얼마나 깊이 넘겨도 페이지 크기만큼만 읽음
+정렬 기준이 같은 created_at이면 출처 이름, id 순으로 결정되므로 페이지 사이에 중복/누락이 없습니다.
+"""
+from django.db.models import Q
+from datetime import datetime
+import base64
+import heapq
+import itertools
+import json
+
+
+# 첫 페이지에서 전체 건수를 셀 때 이 이상은 세지 않음 ("10000+건"으로 표시)
+COUNT_LIMIT = 10000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class MergedPage:
+    """병합된 한 페이지 - items는 (출처 이름, 모델 인스턴스) 목록"""
+
+    def __init__(self, items, has_next, has_previous):
+        self.items = items
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(*self.items[-1]) if self.items and self.has_next else None
+
+    @property
+    def previous_cursor(self):
+        return encode_cursor(*self.items[0]) if self.items and self.has_previous else None
+
+
+def encode_cursor(source, obj):
+    raw = json.dumps([obj.created_at.isoformat(), source, obj.pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 문자열 -> (created_at, 출처 이름, id)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, source, pk = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(source), int(pk)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor('잘못된 페이지 커서입니다.') from e
+
+
+def _position_q(position, source, before):
+    """
+    (created_at, source, id) 내림차순에서 position 다음(before=False) 또는 이전(before=True) 행 조건
+    """
+    created_at, last_source, last_id = position
+    if before:
+        if source > last_source:
+            return Q(created_at__gte=created_at)
+        if source < last_source:
+            return Q(created_at__gt=created_at)
+        return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=last_id)
+    if source < last_source:
+        return Q(created_at__lte=created_at)
+    if source > last_source:
+        return Q(created_at__lt=created_at)
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+
+
+def _iter_source(source, queryset, limit, ascending=False):
+    order = ('created_at', 'id') if ascending else ('-created_at', '-id')
+    for obj in queryset.order_by(*order)[:limit].iterator(chunk_size=min(limit, 2000)):
+        yield source, obj
+
+
+def _sort_key(item):
+    source, obj = item
+    return obj.created_at, source, obj.pk
+
+
+def merge_page(sources, per_page, offset=0, cursor=None, direction='next'):
+    """
+    여러 로그 queryset을 created_at 최신순으로 병합한 한 페이지
+
+    sources: {출처 이름: queryset}
+    cursor를 주면 커서 방식(direction='next'는 더 오래된 쪽, 'prev'는 더 최근 쪽),
+    없으면 offset부터 per_page건을 반환합니다.
+    """
+    if cursor is None:
+        limit = offset + per_page + 1
+        merged = heapq.merge(
+            *(_iter_source(source, queryset, limit) for source, queryset in sources.items()),
+            key=_sort_key, reverse=True,
+        )
+        items = list(itertools.islice(merged, offset, limit))
+        return MergedPage(items[:per_page], has_next=len(items) > per_page, has_previous=offset > 0)
+
+    position = decode_cursor(cursor)
+    before = direction == 'prev'
+    limit = per_page + 1
+    merged = heapq.merge(
+        *(_iter_source(source, queryset.filter(_position_q(position, source, before)), limit, ascending=before)
+          for source, queryset in sources.items()),
+        key=_sort_key, reverse=not before,
+    )
+    items = list(itertools.islice(merged, limit))
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if before:
+        return MergedPage(items[::-1], has_next=True, has_previous=has_more)
+    return MergedPage(items, has_next=has_more, has_previous=True)
+
+
+def capped_count(queryset, limit=COUNT_LIMIT):
+    """
+    최대 limit건까지만 센 건수
+
+    반환값: (건수, 정확한 값인지 여부) - limit을 넘으면 (limit, False)
+    """
+    count = queryset.order_by()[:limit + 1].count()
+    return min(count, limit), count <= limit
+
+
+def cursor_pagination(page, queryset=None):
+    """API 응답용 pagination 정보 (queryset을 주면 첫 페이지 건수 포함)"""
+    data = {
+        'has_previous': page.has_previous,
+        'has_next': page.has_next,
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    }
+    if queryset is not None:
+        data['total_count'], data['total_count_exact'] = capped_count(queryset)
+    return data
@@ -0,0 +1,153 @@
+"""
+기준 정보 스냅샷
+
+국가/제품/카테고리/비활성화 셀은 관리 화면(manage_views)과 Django admin에서만 바뀌지만
+거의 모든 요청이 조회합니다. 프로세스마다 한 번 읽어 둔 읽기 전용 스냅샷(ReferenceData)을
+사용하고, 모델이 저장/삭제되면 공유 캐시의 세대 번호를 올려 모든 워커가 다음 요청에서 다시 읽습니다.
+요청 처리 중에는 캐시의 세대 번호만 확인하며 DB를 조회하지 않습니다.
+
+스냅샷의 모델 인스턴스는 여러 요청이 함께 쓰므로 수정하지 않습니다.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import Http404
+from types import MappingProxyType
+from .models import Country, Product, Category, ProductCategoryDisabled
+import threading
+import time
+
+
+REFERENCE_GENERATION_KEY = 'reference:generation'
+
+DEFAULT_COUNTRY_CODE = 'KR'
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+class ReferenceData:
+    """기준 정보 스냅샷 (읽기 전용)"""
+
+    def __init__(self, generation, countries, products, categories, disabled_cells):
+        self.generation = generation
+        self.countries = tuple(countries)
+        self.products = tuple(products)
+        self.categories = tuple(categories)
+        self.countries_by_id = MappingProxyType({country.id: country for country in self.countries})
+        self.countries_by_code = MappingProxyType({country.code: country for country in self.countries})
+        self.products_by_id = MappingProxyType({product.id: product for product in self.products})
+        self.categories_by_id = MappingProxyType({category.id: category for category in self.categories})
+
+        # 비활성화 셀: 국가별 비트셋, (제품 위치 * 카테고리 수 + 카테고리 위치) 비트
+        self._product_index = {product.id: i for i, product in enumerate(self.products)}
+        self._category_index = {category.id: i for i, category in enumerate(self.categories)}
+        bitsets = {}
+        for country_id, product_id, category_id in disabled_cells:
+            bit = self._cell_bit(product_id, category_id)
+            if bit is not None:
+                bitsets[country_id] = bitsets.get(country_id, 0) | (1 << bit)
+        self._disabled_bitsets = MappingProxyType(bitsets)
+
+    def _cell_bit(self, product_id, category_id):
+        product_index = self._product_index.get(product_id)
+        category_index = self._category_index.get(category_id)
+        if product_index is None or category_index is None:
+            return None
+        return product_index * len(self.categories) + category_index
+
+    def country(self, code=None):
+        """국가 코드로 조회 (코드가 없으면 한국 기본값, 없는 코드면 None)"""
+        return self.countries_by_code.get(code or DEFAULT_COUNTRY_CODE)
+
+    def default_country(self):
+        """관리 화면 기본 국가 (정렬 순서상 첫 번째)"""
+        return self.countries[0] if self.countries else None
+
+    def categories_for(self, department=''):
+        """부서별 카테고리 (부서가 없으면 전체)"""
+        if not department:
+            return list(self.categories)
+        return [category for category in self.categories if category.department == department]
+
+    def is_disabled(self, country, product_id, category_id):
+        """국가별 해당 없음(비활성화) 셀 여부"""
+        if country is None:
+            return False
+        bit = self._cell_bit(product_id, category_id)
+        return bit is not None and bool(self._disabled_bitsets.get(country.id, 0) >> bit & 1)
+
+    def disabled_cells(self, country):
+        """국가의 비활성화 셀 {(product_id, category_id)}"""
+        bitset = self._disabled_bitsets.get(country.id, 0) if country else 0
+        return frozenset(
+            (product.id, category.id)
+            for p, product in enumerate(self.products)
+            for c, category in enumerate(self.categories)
+            if bitset >> (p * len(self.categories) + c) & 1
+        )
+
+
+def _generation():
+    generation = cache.get(REFERENCE_GENERATION_KEY)
+    if generation is None:
+        # 카운터가 유실(캐시 재시작/축출)된 경우 이전 값과 겹치지 않도록 시각 기반으로 초기화
+        cache.add(REFERENCE_GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(REFERENCE_GENERATION_KEY)
+    return generation
+
+
+def _load(generation):
+    return ReferenceData(
+        generation,
+        Country.objects.all(),
+        Product.objects.all(),
+        Category.objects.all(),
+        ProductCategoryDisabled.objects.values_list('country_id', 'product_id', 'category_id'),
+    )
+
+
+def current():
+    """현재 기준 정보 스냅샷 (세대 번호가 바뀌었을 때만 DB에서 다시 읽음)"""
+    global _snapshot
+    generation = _generation()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.generation == generation:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.generation != generation:
+            _snapshot = _load(generation)
+        return _snapshot
+
+
+def invalidate():
+    """모든 워커의 스냅샷 무효화 (다음 current() 호출 시 다시 읽음)"""
+    try:
+        cache.incr(REFERENCE_GENERATION_KEY)
+    except ValueError:
+        cache.set(REFERENCE_GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def get_product_or_404(product_id):
+    product = current().products_by_id.get(int(product_id))
+    if product is None:
+        raise Http404('제품을 찾을 수 없습니다.')
+    return product
+
+
+def get_category_or_404(category_id):
+    category = current().categories_by_id.get(int(category_id))
+    if category is None:
+        raise Http404('카테고리를 찾을 수 없습니다.')
+    return category
+
+
+def _reference_changed(sender, **kwargs):
+    # 바로 올리고 커밋 후 한 번 더 올림 - 커밋 전에 다른 워커가 이전 데이터로 다시 읽은 스냅샷도 버려짐
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+for _model in (Country, Product, Category, ProductCategoryDisabled):
+    post_save.connect(_reference_changed, sender=_model, dispatch_uid=f'reference_{_model.__name__}_saved')
+    post_delete.connect(_reference_changed, sender=_model, dispatch_uid=f'reference_{_model.__name__}_deleted')
@@ -0,0 +1,159 @@
+"""
+감사 로그 보관 기간 관리
+
+보관 기간(AUDIT_RETENTION_DAYS)이 지난 로그를 다음 순서로 정리합니다.
+1. 통합 활동 로그(ActivityEvent)를 날짜별로 DailyActivityRollup에 집계한 뒤 삭제
+2. 원본 로그(로그인 시도/다운로드/파일 활동)를 AUDIT_ARCHIVE_DIR 아래
+   <테이블명>/<실행시각>_<첫 id>-<마지막 id>.jsonl.gz 파일로 내보낸 뒤 삭제
+
+삭제는 batch_size건씩 별도 트랜잭션으로 나눠 실행하므로 SQLite 쓰기 잠금을 오래 잡지 않습니다.
+중간에 중단되어도 다시 실행하면 이어서 처리합니다.
+- 집계: batch_size건씩 집계 행에 더하고 같은 트랜잭션에서 삭제하므로, 중단 후 다시 실행하거나
+        이미 집계된 날짜의 로그가 늦게 들어와도(백필, 비동기 기록) 한 번씩만 셈
+- 내보내기: 파일을 완성한 뒤에만 그 파일에 기록된 행을 삭제
+
+prune_audit_logs 명령이나 스케줄러(cron/systemd timer)에서 run_retention()을 호출합니다.
+"""
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from datetime import datetime, timedelta
+from .models import LoginAttempt, DownloadLog, ArtifactActivityLog, ActivityEvent, DailyActivityRollup
+import gzip
+import json
+import os
+import time
+
+
+ARCHIVED_MODELS = (LoginAttempt, DownloadLog, ArtifactActivityLog)
+
+
+def retention_cutoff(days=None):
+    """보관 기한 - 이 시각(현지 자정) 이전의 로그가 정리 대상"""
+    if days is None:
+        days = getattr(settings, 'AUDIT_RETENTION_DAYS', 365)
+    cutoff_date = timezone.localdate() - timedelta(days=days)
+    return timezone.make_aware(datetime.combine(cutoff_date, datetime.min.time()))
+
+
+def archive_dir():
+    return str(getattr(settings, 'AUDIT_ARCHIVE_DIR', os.path.join(settings.BASE_DIR, 'archive')))
+
+
+def delete_in_batches(queryset, batch_size, pause=0):
+    """queryset의 행을 id 순으로 batch_size건씩 나눠 삭제 (삭제한 건수 반환)"""
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            count, _ = queryset.model.objects.filter(id__in=ids).delete()
+        deleted += count
+        if pause:
+            time.sleep(pause)
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+    return start, start + timedelta(days=1)
+
+
+def merge_rollups(day, events):
+    """events의 건수를 day의 집계 행에 더함 (없는 행은 count=0으로 만든 뒤 F()로 증가)"""
+    rows = list(events.order_by().values('event_type', 'username', 'product').annotate(total=Count('id')))
+    DailyActivityRollup.objects.bulk_create([
+        DailyActivityRollup(date=day, event_type=row['event_type'], username=row['username'],
+                            product=row['product'], count=0)
+        for row in rows
+    ], ignore_conflicts=True)
+    for row in rows:
+        DailyActivityRollup.objects.filter(
+            date=day, event_type=row['event_type'], username=row['username'], product=row['product'],
+        ).update(count=F('count') + row['total'])
+
+
+def rollup_events(cutoff, batch_size=500, pause=0, dry_run=False):
+    """
+    cutoff 이전 ActivityEvent를 날짜별로 집계하고 삭제
+
+    반환값: (집계한 날짜 수, 삭제한 건수)
+    """
+    old_events = ActivityEvent.objects.filter(created_at__lt=cutoff)
+    days = deleted = 0
+    while True:
+        oldest = old_events.order_by('created_at').values_list('created_at', flat=True).first()
+        if oldest is None:
+            return days, deleted
+        day = timezone.localtime(oldest).date()
+        start, end = _day_bounds(day)
+        day_events = ActivityEvent.objects.filter(created_at__gte=start, created_at__lt=min(end, cutoff))
+        days += 1
+        if dry_run:
+            deleted += day_events.count()
+            old_events = old_events.filter(created_at__gte=end)
+            continue
+
+        # 집계와 삭제를 batch_size건씩 같은 트랜잭션으로 (집계한 로그만 삭제)
+        while True:
+            ids = list(day_events.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                batch = ActivityEvent.objects.filter(id__in=ids)
+                merge_rollups(day, batch)
+                count, _ = batch.delete()
+            deleted += count
+            if pause:
+                time.sleep(pause)
+
+
+def archive_model(model, cutoff, batch_size=500, pause=0, dry_run=False):
+    """
+    cutoff 이전 원본 로그를 gzip JSONL로 내보내고 삭제
+
+    반환값: (내보낸 파일 경로 또는 None, 처리한 건수)
+    """
+    old_rows = model.objects.filter(created_at__lt=cutoff)
+    if dry_run:
+        return None, old_rows.count()
+
+    max_id = old_rows.order_by('-id').values_list('id', flat=True).first()
+    if max_id is None:
+        return None, 0
+    # 내보내는 도중 들어온 행은 다음 실행에서 처리 (파일에 기록된 행만 삭제)
+    old_rows = old_rows.filter(id__lte=max_id)
+    min_id = old_rows.order_by('id').values_list('id', flat=True).first()
+
+    directory = os.path.join(archive_dir(), model._meta.db_table)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{timezone.now():%Y%m%d%H%M%S}_{min_id}-{max_id}.jsonl.gz')
+    part_path = path + '.part'
+    exported = 0
+    with gzip.open(part_path, 'wt', encoding='utf-8') as f:
+        for row in old_rows.order_by('id').values().iterator(chunk_size=batch_size):
+            f.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+            f.write('\n')
+            exported += 1
+    os.replace(part_path, path)
+
+    delete_in_batches(old_rows, batch_size, pause)
+    return path, exported
+
+
+def run_retention(days=None, batch_size=None, pause=0, dry_run=False, log=None):
+    """보관 기간 정리 전체 실행 (스케줄러 진입점)"""
+    log = log or (lambda message: None)
+    if batch_size is None:
+        batch_size = getattr(settings, 'AUDIT_RETENTION_BATCH_SIZE', 500)
+    cutoff = retention_cutoff(days)
+    log(f'보관 기한: {timezone.localtime(cutoff):%Y-%m-%d %H:%M} 이전 로그 정리')
+
+    days_rolled, events_deleted = rollup_events(cutoff, batch_size, pause, dry_run)
+    log(f'통합 활동 로그: {days_rolled}일 집계, {events_deleted}건 삭제')
+
+    for model in ARCHIVED_MODELS:
+        path, count = archive_model(model, cutoff, batch_size, pause, dry_run)
+        log(f'{model._meta.verbose_name}: {count}건' + (f' -> {path}' if path else ''))
@@ -0,0 +1,174 @@
+"""
+로그 검색
+
+icontains(LIKE '%...%')는 인덱스를 쓰지 못해 로그 테이블 전체를 읽으므로,
+기본은 LOWER(username) 표현식 인덱스를 범위 조회하는 앞부분 일치(prefix) 검색을 사용합니다.
+검색어도 소문자로 바꿔 비교하므로 대소문자를 구분하지 않습니다. 범위는 바이트 순서로 계산하므로
+PostgreSQL에서는 인덱스와 조건 모두 COLLATE "C"로 비교합니다 (models.ByteOrder).
+
+부분 일치(contains) 검색은 SQLite FTS5 trigram 보조 인덱스(artifacts_activityevent_fts)가
+있을 때 그 인덱스로 찾습니다. ActivityEvent의 username/product/filename을 트리거로 색인하며,
+원본 로그(로그인 시도/다운로드 로그)는 ActivityEvent.source_id로 연결합니다.
+보조 인덱스가 없거나(PostgreSQL 등) 검색어가 3자 미만이면 icontains로 처리합니다.
+
+보조 인덱스와 트리거는 마이그레이션 0019에서 만듭니다. SQLite는 컬럼 변경 시 테이블을 새로 만들면서
+트리거를 지우므로, ActivityEvent 필드를 바꾸는 마이그레이션에서는 트리거도 다시 만들어야 합니다.
+
+산출물 내용 검색(search_artifacts)은 처리 작업('text')이 추출한 ArtifactText를 FTS5 인덱스
+(artifacts_artifacttext_fts, 마이그레이션 0024)로 찾습니다. ArtifactText가 저장/삭제되면 트리거가
+인덱스를 갱신하고, 산출물이 삭제되면 ArtifactText도 CASCADE로 삭제됩니다. 결과는 bm25 관련도순
+(파일명 일치에 가중치)이며, 인덱스가 없으면 icontains로 찾고 최신 산출물 순으로 반환합니다.
+"""
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Lower
+from django.db.models.lookups import GreaterThanOrEqual, LessThan
+from django.utils.html import escape
+from .models import ArtifactText, ByteOrder, Product
+import re
+
+
+FTS_TABLE = 'artifacts_activityevent_fts'
+CONTENT_FTS_TABLE = 'artifacts_artifacttext_fts'
+
+# trigram 토크나이저는 3글자 이상부터 색인 검색 가능
+FTS_MIN_LENGTH = 3
+
+SEARCH_MATCHES = ('prefix', 'contains')
+
+_fts_tables = {}
+
+
+def search_match(request):
+    """요청의 match 파라미터 (없으면 LOG_SEARCH_MATCH 설정값)"""
+    match = request.GET.get('match') or getattr(settings, 'LOG_SEARCH_MATCH', 'prefix')
+    return match if match in SEARCH_MATCHES else 'prefix'
+
+
+def fts_available(table=FTS_TABLE):
+    """현재 DB에 FTS5 보조 인덱스가 있는지 (DB/테이블별로 한 번만 확인)"""
+    if connection.vendor != 'sqlite':
+        return False
+    key = (connection.settings_dict['NAME'], table)
+    if key not in _fts_tables:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [table])
+            _fts_tables[key] = cursor.fetchone() is not None
+    return _fts_tables[key]
+
+
+def prefix_q(field, term):
+    """field가 term으로 시작하는 조건 (Lower(field) 표현식 인덱스 범위 조회, 대소문자 무시)"""
+    value = ByteOrder(Lower(field))
+    term = term.lower()
+    if ord(term[-1]) >= 0x10FFFF:
+        return GreaterThanOrEqual(value, term)
+    upper = term[:-1] + chr(ord(term[-1]) + 1)
+    return GreaterThanOrEqual(value, term) & LessThan(value, upper)
+
+
+def _fts_query(column, term):
+    return f'{column} : "{term.replace(chr(34), chr(34) * 2)}"'
+
+
+def _fts_event_ids(column, term, source=None):
+    """FTS 인덱스에서 term을 포함하는 ActivityEvent id (source를 주면 원본 로그 id) 서브쿼리"""
+    if source is None:
+        return RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+                      [_fts_query(column, term)])
+    return RawSQL(
+        f'SELECT e.source_id FROM artifacts_activityevent e '
+        f'JOIN {FTS_TABLE} f ON f.rowid = e.id '
+        f'WHERE {FTS_TABLE} MATCH %s AND e.source = %s',
+        [_fts_query(column, term), source],
+    )
+
+
+def filter_username(queryset, term, match='prefix', source=None):
+    """
+    사용자명 검색 조건 적용
+
+    source: 원본 로그 queryset이면 ActivityEvent.source 값('login', 'download'),
+            ActivityEvent queryset이면 None
+    """
+    if not term:
+        return queryset
+    if match == 'prefix':
+        return queryset.filter(prefix_q('username', term))
+    if len(term) >= FTS_MIN_LENGTH and fts_available():
+        return queryset.filter(id__in=_fts_event_ids('username', term, source))
+    return queryset.filter(username__icontains=term)
+
+
+def matching_product_ids(term, match='prefix'):
+    """제품명 검색 - 제품 테이블은 작으므로 먼저 id로 바꿔 로그 테이블에서는 id로 조회"""
+    products = Product.objects.all()
+    if match == 'prefix':
+        products = products.filter(name__istartswith=term)
+    else:
+        products = products.filter(name__icontains=term)
+    return list(products.values_list('id', flat=True))
+
+
+# 산출물 내용 검색
+
+# snippet 강조 구간 표시 (HTML 이스케이프 후 <mark>로 바꿈)
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_TOKENS = 12
+SNIPPET_CHARS = 60
+
+CONTENT_MAX_TERMS = 10
+
+
+def content_terms(query):
+    """검색어를 단어 목록으로 (FTS5 연산자/따옴표 등 기호는 무시)"""
+    return re.findall(r'\w+', query or '')[:CONTENT_MAX_TERMS]
+
+
+def highlight(snippet):
+    return str(escape(snippet)).replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
+
+
+def _text_snippet(body, terms):
+    """FTS 인덱스가 없을 때 첫 일치 위치 주변 텍스트"""
+    lowered = body.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    start = min((position for position in positions if position >= 0), default=0)
+    snippet = body[max(start - SNIPPET_CHARS, 0):start + SNIPPET_CHARS * 2]
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.I)
+    return pattern.sub(lambda match: f'{SNIPPET_START}{match.group(0)}{SNIPPET_END}', snippet)
+
+
+def search_artifacts(query, country=None, product_id=None, category_id=None, limit=20):
+    """
+    산출물 내용/파일명 검색 (단어마다 앞부분 일치, 모든 단어 포함)
+
+    반환값: [(artifact_id, snippet_html)] 관련도순
+    """
+    terms = content_terms(query)
+    if not terms:
+        return []
+    filters = {'country_id': country.id if country else None, 'product_id': product_id, 'category_id': category_id}
+    filters = {column: value for column, value in filters.items() if value is not None}
+
+    if fts_available(CONTENT_FTS_TABLE):
+        table = CONTENT_FTS_TABLE
+        where = ''.join(f' AND a.{column} = %s' for column in filters)
+        match = ' '.join('"{}"*'.format(term) for term in terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {table}.rowid, snippet({table}, -1, %s, %s, '…', %s) FROM {table} "
+                f"JOIN artifacts_artifact a ON a.id = {table}.rowid "
+                f"WHERE {table} MATCH %s{where} ORDER BY bm25({table}, 5.0, 1.0) LIMIT %s",
+                [SNIPPET_START, SNIPPET_END, SNIPPET_TOKENS, match, *filters.values(), limit],
+            )
+            return [(artifact_id, highlight(snippet)) for artifact_id, snippet in cursor.fetchall()]
+
+    texts = ArtifactText.objects.filter(**{f'artifact__{column}': value for column, value in filters.items()})
+    for term in terms:
+        texts = texts.filter(Q(body__icontains=term) | Q(filename__icontains=term))
+    rows = texts.order_by('-artifact_id').values_list('artifact_id', 'body')[:limit]
+    return [(artifact_id, highlight(_text_snippet(body, terms))) for artifact_id, body in rows]
@@ -0,0 +1,29 @@
+"""
+테스트 실행기
+
+기본 CACHES(SQLiteCache)는 BASE_DIR/cache.sqlite3 파일을 사용하므로, 테스트가 운영/개발 캐시 파일을
+만들거나 지우지 않도록 테스트 동안에는 프로세스 메모리 캐시로 바꿉니다.
+SQLiteCache 자체는 SharedCacheTests에서 임시 파일로 검사합니다.
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'docsparrow-test',
+    }
+}
+
+
+class TestRunner(DiscoverRunner):
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_settings = override_settings(CACHES=TEST_CACHES)
+        self._cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,3 +1,1753 @@
-from django.test import TestCase
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.http import FileResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.utils import timezone
+from django.utils.http import http_date
+from io import BytesIO, StringIO
+from unittest import mock
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import re
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
 
-# Create your tests here.
+from .models import Country, Product, Category, Artifact, ProductCategoryDisabled, UploadSession, ArtifactActivityLog, ArtifactText, Blob, ProcessingJob, LoginAttempt, DownloadLog, ActivityEvent, DailyActivityRollup, DownloadDailyCount
+from . import zipstream, bulk_kits, downloads, analytics, matrix, audit, pagination, retention, search, db, reference, uploads, blobs, jobs, extract
+from .cache_backends import SQLiteCache
+import multiprocessing
+
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync')
+class MatrixQueryCountTests(TestCase):
+    """대시보드 매트릭스 쿼리 수가 그리드 크기와 무관하게 일정한지 확인"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='pw')
+        cls.kr = Country.objects.create(code='KR', name='한국')
+
+    def setUp(self):
+        cache.clear()
+
+    def make_grid(self, n_products, n_categories, versions=('5.9.0', '5.18.0')):
+        products = [Product.objects.create(name=f'P{i}', color_class='bg-red-500', display_order=i)
+                    for i in range(n_products)]
+        categories = [Category.objects.create(name=f'C{i}', display_order=i)
+                      for i in range(n_categories)]
+        for product in products:
+            for category in categories:
+                for version in versions:
+                    Artifact.objects.create(
+                        country=self.kr, product=product, category=category,
+                        version_string=version, uploader=self.user,
+                        file=ContentFile(b'x', name=f'{product.name}_{category.name}_v{version}.txt'),
+                    )
+        matrix.invalidate_matrix_cache()
+        return products, categories
+
+    def count_dashboard_queries(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('artifacts:dashboard'), {'country': 'KR'})
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_dashboard_query_count_constant(self):
+        self.make_grid(2, 2)
+        small = self.count_dashboard_queries()
+        self.make_grid(8, 15)
+        large = self.count_dashboard_queries()
+        self.assertEqual(small, large)
+
+    def test_build_matrix_query_count(self):
+        products, categories = self.make_grid(10, 17)
+        with self.assertNumQueries(1):
+            matrix.build_matrix(self.kr, products, categories)
+        with self.assertNumQueries(1):
+            matrix.product_versions(self.kr, products)
+
+    def test_build_matrix_cells(self):
+        products, categories = self.make_grid(2, 2, versions=('1.0', '2.0'))
+        disabled = {(products[1].id, categories[0].id)}
+        data = matrix.build_matrix(
+            self.kr, products, categories,
+            version_filters={products[0].id: '1.0'}, disabled_set=disabled,
+        )
+        self.assertEqual([row['category'] for row in data], categories)
+        first_row = data[0]['cells']
+        self.assertEqual(first_row[0]['artifact'].version_string, '1.0')
+        self.assertEqual(first_row[1]['artifact'].version_string, '2.0')
+        self.assertTrue(first_row[1]['is_disabled'])
+        self.assertFalse(first_row[0]['is_disabled'])
+
+    def test_dashboard_served_from_cache_until_invalidated(self):
+        self.make_grid(3, 3)
+        cold = self.count_dashboard_queries()
+        warm = self.count_dashboard_queries()
+        self.assertLess(warm, cold)
+
+        product = Product.objects.first()
+        category = Category.objects.first()
+        self.client.post(reverse('artifacts:upload', args=[product.id, category.id]), {
+            'country': 'KR',
+            'version_string': '6.0.0',
+            'file': ContentFile(b'y', name=f'{product.name}_{category.name}_v6.0.0.txt'),
+        })
+        response = self.client.get(reverse('artifacts:dashboard'), {'country': 'KR'})
+        cell = response.context['matrix_data'][0]['cells'][0]
+        self.assertEqual(cell['artifact'].version_string, '6.0.0')
+
+    def test_latest_artifact_uses_semantic_version_order(self):
+        products, categories = self.make_grid(1, 1, versions=('5.9.0', '5.18.0', '2601.0', '10.0'))
+        latest = matrix.latest_artifacts(self.kr, products, categories)
+        self.assertEqual(latest[(products[0].id, categories[0].id)].version_string, '2601.0')
+        versions = matrix.product_versions(self.kr, products)[products[0].id]
+        self.assertEqual(versions, ['2601.0', '10.0', '5.18.0', '5.9.0'])
+
+    def test_version_key_orders_prereleases_and_long_numbers(self):
+        from .models import make_version_key
+        versions = ['5.0.0.1', '5.0.0', '5.0.0-rc10', '5.0.0-rc2', '5.0.0-beta', '4.99', '12345678901', '99999999999']
+        self.assertEqual(sorted(versions, key=make_version_key),
+                         ['4.99', '5.0.0-beta', '5.0.0-rc2', '5.0.0-rc10', '5.0.0', '5.0.0.1', '12345678901', '99999999999'])
+        self.assertEqual(make_version_key('v5.0.0'), make_version_key('5.0.0'))
+
+    def test_version_key_db_order_is_byte_order(self):
+        versions = ('5.0.0', '5.0.0-rc2', '12345678901', '5.0.0.1', '5.0.0-beta', '4.99')
+        self.make_grid(1, 1, versions=versions)
+        self.assertEqual(list(Artifact.objects.order_by('version_key').values_list('version_string', flat=True)),
+                         ['4.99', '5.0.0-beta', '5.0.0-rc2', '5.0.0', '5.0.0.1', '12345678901'])
+        # PostgreSQL은 로캘 콜레이션 대신 "C" 콜레이션으로 컬럼을 만듦
+        field = Artifact._meta.get_field('version_key')
+        self.assertIsNone(field.db_parameters(connection)['collation'])
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            self.assertEqual(field.db_parameters(connection)['collation'], 'C')
+
+
+class ZipStreamTests(SimpleTestCase):
+    """스트리밍 ZIP 출력이 zipfile로 읽히고 ZIP64 필드가 올바른지 확인"""
+
+    DATE_TIME = (2026, 1, 30, 15, 27, 44)
+
+    def build(self, write):
+        stream = zipstream.ZipStream(chunk_size=1024)
+        data = b''.join(write(stream)) + b''.join(stream.close())
+        return stream, data
+
+    def test_stored_and_deflated_entries_with_data_descriptor(self):
+        payload = os.urandom(3000) + b'a' * 5000
+
+        def write(stream):
+            yield from stream.write_file('stored.bin', BytesIO(payload), size=len(payload),
+                                         date_time=self.DATE_TIME, compress_type=zipfile.ZIP_STORED)
+            yield from stream.write_file('한글/deflated.bin', BytesIO(payload), size=len(payload),
+                                         date_time=self.DATE_TIME)
+            # 크기를 모르면 ZIP64 data descriptor 사용
+            yield from stream.write_file('unknown.bin', BytesIO(payload), date_time=self.DATE_TIME)
+
+        stream, data = self.build(write)
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            infos = archive.infolist()
+            self.assertEqual([info.filename for info in infos], ['stored.bin', '한글/deflated.bin', 'unknown.bin'])
+            self.assertEqual([info.compress_type for info in infos],
+                             [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_DEFLATED])
+            for info in infos:
+                self.assertTrue(info.flag_bits & zipstream.FLAG_DATA_DESCRIPTOR)
+                self.assertEqual(info.date_time, self.DATE_TIME)
+                self.assertEqual(archive.read(info), payload)
+            self.assertLess(infos[1].compress_size, len(payload))
+        self.assertFalse(stream.entries[0].zip64)
+        self.assertTrue(stream.entries[2].zip64)
+
+    def test_precompressed_entries_have_sizes_in_local_header(self):
+        payload = b'hello world ' * 1000
+
+        def write(stream):
+            for name, compress_type in (('a.txt', zipfile.ZIP_DEFLATED), ('b.txt', zipfile.ZIP_STORED)):
+                compressed = zipstream.compress_file(BytesIO(payload), compress_type, chunk_size=1000)
+                try:
+                    yield from stream.write_compressed(name, compressed, date_time=self.DATE_TIME)
+                finally:
+                    compressed.close()
+
+        _stream, data = self.build(write)
+        header = zipstream.LOCAL_HEADER.unpack_from(data)
+        self.assertFalse(header[3] & zipstream.FLAG_DATA_DESCRIPTOR)
+        self.assertEqual(header[7], zlib.crc32(payload))
+        self.assertEqual(header[9], len(payload))
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(archive.read('a.txt'), payload)
+            self.assertEqual(archive.read('b.txt'), payload)
+
+    def test_zip64_fields_for_large_entry_and_offset(self):
+        size = 5 * 1024 ** 3
+        stream = zipstream.ZipStream()
+        # 5GiB 항목은 실제로 만들지 않고 크기만 지정
+        compressed = zipstream.CompressedData(BytesIO(b''), zipfile.ZIP_STORED, 0, size, size, 0.0)
+        header = b''.join(stream.write_compressed('big.bin', compressed, date_time=self.DATE_TIME))
+        fields = zipstream.LOCAL_HEADER.unpack_from(header)
+        self.assertEqual(fields[1], 45)
+        self.assertEqual((fields[8], fields[9]), (zipstream.ZIP32_LIMIT, zipstream.ZIP32_LIMIT))
+        extra = header[zipstream.LOCAL_HEADER.size + fields[10]:]
+        self.assertEqual(struct.unpack('<2H2Q', extra), (0x0001, 16, size, size))
+
+        # 이후 항목의 오프셋과 중앙 디렉터리가 4GiB를 넘는 경우
+        stream.offset += size
+        small = b''.join(stream.write_file('small.txt', BytesIO(b'x'), size=1, date_time=self.DATE_TIME))
+        self.assertTrue(small.startswith(b'PK\x03\x04'))
+        tail = b''.join(stream.close())
+
+        record = zipstream.CENTRAL_DIR.unpack_from(tail)
+        self.assertEqual((record[10], record[11]), (zipstream.ZIP32_LIMIT, zipstream.ZIP32_LIMIT))
+        name_length, extra_length = record[12], record[13]
+        extra = tail[zipstream.CENTRAL_DIR.size + name_length:][:extra_length]
+        self.assertEqual(struct.unpack('<2H2Q', extra), (0x0001, 16, size, size))
+
+        second = tail[zipstream.CENTRAL_DIR.size + name_length + extra_length:]
+        record = zipstream.CENTRAL_DIR.unpack_from(second)
+        self.assertEqual(record[18], zipstream.ZIP32_LIMIT)
+        name_length, extra_length = record[12], record[13]
+        extra = second[zipstream.CENTRAL_DIR.size + name_length:][:extra_length]
+        self.assertEqual(struct.unpack('<2HQ', extra), (0x0001, 8, size + len(header)))
+
+        eocd64 = tail.index(b'PK\x06\x06')
+        values = zipstream.END_OF_CENTRAL_DIR64.unpack_from(tail, eocd64)
+        self.assertEqual(values[6:8], (2, 2))
+        self.assertEqual(values[9], size + len(header) + len(small))
+        eocd = zipstream.END_OF_CENTRAL_DIR.unpack_from(tail, len(tail) - zipstream.END_OF_CENTRAL_DIR.size)
+        self.assertEqual(eocd[6], zipstream.ZIP32_LIMIT)
+
+    def test_data_descriptor_rejects_oversized_zip32_entry(self):
+        stream = zipstream.ZipStream()
+        entry = zipstream.ZipEntry('a.bin', self.DATE_TIME, zipfile.ZIP_STORED, 0, zip64=False)
+        entry.file_size = entry.compress_size = zipstream.ZIP32_LIMIT + 1
+        with self.assertRaises(ValueError):
+            stream._data_descriptor(entry)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync', BULK_KIT_CACHE_MAX_BYTES=10 * 1024 * 1024,
+                   BULK_ZIP_WORKERS=1)
+class KitCacheTests(TestCase):
+    """제품별 일괄 다운로드 킷 캐시의 재사용, 무효화, 용량 정리 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('kit', password='pw')
+        cls.kr = Country.objects.create(code='KR', name='한국')
+        cls.product = Product.objects.create(name='Kit', color_class='bg-red-500')
+        cls.category = Category.objects.create(name='Brochure')
+
+    def setUp(self):
+        cache.clear()
+        shutil.rmtree(bulk_kits.kit_cache_root(), ignore_errors=True)
+        self.client.login(username='kit', password='pw')
+        self.artifact = self.make_artifact('1.0')
+
+    def make_artifact(self, version):
+        return Artifact.objects.create(
+            country=self.kr, product=self.product, category=self.category, version_string=version,
+            uploader=self.user, file=ContentFile(f'kit {version} '.encode() * 100, name=f'kit_v{version}.txt'),
+        )
+
+    def download(self):
+        response = self.client.get(reverse('artifacts:product_bulk_download', args=[self.product.id]),
+                                   {'country': 'KR'})
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content)
+
+    def kit_dir(self):
+        return bulk_kits.kit_cache_root() / 'KR' / str(self.product.id)
+
+    def test_second_download_serves_cached_kit(self):
+        _response, first = self.download()
+        kits = list(self.kit_dir().glob('*.zip'))
+        self.assertEqual(len(kits), 1)
+        self.assertEqual(kits[0].read_bytes(), first)
+
+        response, second = self.download()
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(second, first)
+        with zipfile.ZipFile(BytesIO(second)) as archive:
+            self.assertIsNone(archive.testzip())
+        details = [log.details for log in DownloadLog.objects.filter(download_type='bulk').order_by('id')]
+        self.assertEqual([d['kit_cache'] for d in details], ['miss', 'hit'])
+        self.assertEqual(details[1]['files'], 1)
+
+    def test_upload_and_delete_invalidate_kits(self):
+        self.download()
+        self.assertTrue(self.kit_dir().exists())
+        response = self.client.post(reverse('artifacts:upload', args=[self.product.id, self.category.id]), {
+            'country': 'KR',
+            'version_string': '2.0',
+            'file': ContentFile(b'new', name='Kit_Brochure_v2.0.txt'),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.kit_dir().exists())
+
+        self.download()
+        self.assertTrue(self.kit_dir().exists())
+        response = self.client.post(reverse('artifacts:delete', args=[self.artifact.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.kit_dir().exists())
+
+    def test_invalidation_during_stream_still_completes_download(self):
+        path = bulk_kits.kit_path(self.product, self.kr, [self.artifact])
+        chunks = bulk_kits.iter_kit_zip_and_store([self.artifact], path)
+        data = next(chunks)
+        bulk_kits.invalidate_kits(self.product, self.kr)
+        data += b''.join(chunks)
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+        self.assertFalse(path.exists())
+
+    def test_kit_with_missing_file_is_not_cached(self):
+        os.remove(self.artifact.file.path)
+        self.make_artifact('2.0')
+        _response, data = self.download()
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            self.assertEqual(archive.namelist(), ['brochure/kit_v2.0.txt'])
+        self.assertEqual(list(self.kit_dir().glob('*')), [])
+        self.assertEqual(DownloadLog.objects.get(download_type='bulk').details['skipped'], 1)
+
+    def test_evict_removes_least_recently_used_files(self):
+        kit_dir = self.kit_dir()
+        kit_dir.mkdir(parents=True)
+        now = timezone.now().timestamp()
+        for age, name in enumerate(['new.zip', 'old.part', 'oldest.zip']):
+            path = kit_dir / name
+            path.write_bytes(b'x' * 1000)
+            os.utime(path, (now - age * 60, now - age * 60))
+        (kit_dir / 'oldest.json').write_text('{}')
+        (kit_dir / 'orphan.json').write_text('{}')
+
+        bulk_kits.evict_kits(max_bytes=1500)
+        self.assertEqual(sorted(path.name for path in kit_dir.iterdir()), ['new.zip'])
+
+
+class ParallelZipTests(SimpleTestCase):
+    """병렬 ZIP 생성 결과가 순차 생성과 같은 항목을 담는지 확인"""
+
+    DATE_TIME = (2026, 1, 30, 15, 27, 44)
+
+    def entries(self, broken=False):
+        contents = {
+            'docs/a.txt': b'compressible text ' * 5000,
+            'docs/b.pdf': os.urandom(50000),
+            'docs/c.bin': os.urandom(30000),
+            'docs/d.txt': b'',
+        }
+        entries = [bulk_kits.KitEntry(name, name.split('/')[-1], lambda data=data: BytesIO(data),
+                                      len(data), self.DATE_TIME)
+                   for name, data in contents.items()]
+        if broken:
+            def fail():
+                raise OSError('missing')
+            entries.insert(1, bulk_kits.KitEntry('docs/missing.txt', 'missing.txt', fail, 10, self.DATE_TIME))
+        return contents, entries
+
+    def build(self, entries, workers):
+        stats = bulk_kits.new_kit_stats()
+        data = b''.join(bulk_kits.iter_zip_entries(entries, stats, workers=workers))
+        archive = zipfile.ZipFile(BytesIO(data))
+        self.addCleanup(archive.close)
+        self.assertIsNone(archive.testzip())
+        return archive, stats
+
+    def summary(self, archive):
+        return [(info.filename, info.compress_type, archive.read(info)) for info in archive.infolist()]
+
+    def test_parallel_output_matches_sequential(self):
+        contents, entries = self.entries()
+        sequential, sequential_stats = self.build(entries, workers=1)
+        parallel, parallel_stats = self.build(entries, workers=3)
+
+        self.assertEqual(self.summary(parallel), self.summary(sequential))
+        self.assertEqual([name for name, _type, _data in self.summary(parallel)], list(contents))
+        for key in ('files', 'skipped', 'stored', 'deflated', 'bytes_in', 'bytes_out'):
+            self.assertEqual(parallel_stats[key], sequential_stats[key])
+        # 무압축 항목은 스풀 없이 바로 기록 (data descriptor 사용)
+        flags = {info.filename: info.flag_bits & zipstream.FLAG_DATA_DESCRIPTOR for info in parallel.infolist()}
+        self.assertTrue(flags['docs/b.pdf'])
+        self.assertFalse(flags['docs/a.txt'])
+
+    def test_unreadable_entry_is_counted_as_skipped(self):
+        contents, entries = self.entries(broken=True)
+        for workers in (1, 3):
+            with self.assertLogs('artifacts.bulk_kits', 'WARNING'):
+                archive, stats = self.build(entries, workers=workers)
+            self.assertEqual(archive.namelist(), list(contents))
+            self.assertEqual(stats['skipped'], 1)
+            self.assertEqual(stats['files'], len(contents))
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync', BULK_KIT_CACHE_MAX_BYTES=0, BULK_ZIP_WORKERS=1)
+class BulkDownloadLogTests(TestCase):
+    """일괄 다운로드 로그가 전송 완료/중단/HEAD 요청마다 한 번 기록되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('bulk', password='pw')
+        kr = Country.objects.create(code='KR', name='한국')
+        cls.product = Product.objects.create(name='Bulk', color_class='bg-red-500')
+        category = Category.objects.create(name='Brochure')
+        for version in ('1.0', '2.0'):
+            Artifact.objects.create(
+                country=kr, product=cls.product, category=category, version_string=version, uploader=user,
+                file=ContentFile(os.urandom(200 * 1024), name=f'bulk_v{version}.bin'),
+            )
+
+    def request(self, method='get'):
+        return getattr(self.client, method)(
+            reverse('artifacts:product_bulk_download', args=[self.product.id]), {'country': 'KR'})
+
+    def bulk_logs(self):
+        return list(DownloadLog.objects.filter(download_type='bulk'))
+
+    def test_completed_download_logs_stats(self):
+        response = self.request()
+        self.assertEqual(self.bulk_logs(), [])
+        b''.join(response.streaming_content)
+        [log] = self.bulk_logs()
+        self.assertEqual(log.details['kit_cache'], 'off')
+        self.assertTrue(log.details['completed'])
+        self.assertEqual(log.details['files'], 2)
+
+    def test_dropped_download_logs_incomplete(self):
+        response = self.request()
+        next(iter(response.streaming_content))
+        response.close()
+        response.close()
+        [log] = self.bulk_logs()
+        self.assertFalse(log.details['completed'])
+
+    def test_head_request_logs_without_streaming(self):
+        response = self.request('head')
+        self.assertEqual(b''.join(response.streaming_content), b'')
+        response.close()
+        [log] = self.bulk_logs()
+        self.assertFalse(log.details['completed'])
+        self.assertEqual(log.details['files'], 0)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync', DOWNLOAD_ACCEL_REDIRECT_PREFIX='/protected-media/')
+class DownloadBackendTests(TestCase):
+    """DOWNLOAD_BACKEND별 개별 다운로드 응답 헤더 확인"""
+
+    CONTENT = b'%PDF-1.4 download backend ' * 100
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('dl', password='pw')
+        kr = Country.objects.create(code='KR', name='한국')
+        product = Product.objects.create(name='DL', color_class='bg-red-500')
+        category = Category.objects.create(name='Manual')
+        cls.artifact = Artifact.objects.create(
+            country=kr, product=product, category=category, version_string='1.0', uploader=user,
+            file=ContentFile(cls.CONTENT, name='DL 매뉴얼_v1.0.pdf'),
+        )
+
+    def download(self, **headers):
+        return self.client.get(reverse('artifacts:download', args=[self.artifact.id]), headers=headers)
+
+    def assert_download_headers(self, response):
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['ETag'], f'"{self.artifact.checksum}"')
+        self.assertEqual(response['Content-Disposition'],
+                         "attachment; filename*=UTF-8''DL%20%EB%A7%A4%EB%89%B4%EC%96%BC_v1.0.pdf")
+
+    @override_settings(DOWNLOAD_BACKEND='x-accel')
+    def test_x_accel_redirect(self):
+        response = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.artifact.file.name)
+        self.assertEqual(response.content, b'')
+        self.assert_download_headers(response)
+        self.assertEqual(DownloadLog.objects.get().download_type, 'single')
+
+    @override_settings(DOWNLOAD_BACKEND='x-accel')
+    def test_x_accel_redirect_quotes_path(self):
+        self.artifact.file.name = 'artifacts/2026/01/30/152745_1/한글 파일#1.pdf'
+        response = downloads.artifact_file_response(self.artifact, RequestFactory().get('/'))
+        self.assertEqual(response['X-Accel-Redirect'],
+                         '/protected-media/artifacts/2026/01/30/152745_1/%ED%95%9C%EA%B8%80%20%ED%8C%8C%EC%9D%BC%231.pdf')
+
+    @override_settings(DOWNLOAD_BACKEND='x-sendfile')
+    def test_x_sendfile_sends_utf8_path(self):
+        self.artifact.file.name = 'artifacts/2026/01/30/152745_1/한글 파일.pdf'
+        response = downloads.artifact_file_response(self.artifact, RequestFactory().get('/'))
+        self.assertEqual(response['X-Sendfile'].encode('latin-1').decode('utf-8'),
+                         os.path.join(MEDIA_ROOT, 'artifacts/2026/01/30/152745_1/한글 파일.pdf'))
+        self.assertEqual(response.content, b'')
+
+    @override_settings(DOWNLOAD_BACKEND='x-accel')
+    def test_offloaded_range_request_is_logged_as_partial(self):
+        response = self.download(range='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(DownloadLog.objects.get().download_type, 'partial')
+
+    @override_settings(DOWNLOAD_BACKEND='django')
+    def test_django_backend_streams_file(self):
+        response = self.download()
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response['Content-Length'], str(len(self.CONTENT)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+        self.assert_download_headers(response)
+
+    @override_settings(DOWNLOAD_BACKEND='x-sendfile')
+    def test_remote_storage_falls_back_to_file_response(self):
+        with mock.patch.object(downloads, '_local_path', return_value=None):
+            response = self.download()
+        self.assertIsInstance(response, FileResponse)
+        self.assertFalse(response.has_header('X-Sendfile'))
+        self.assertEqual(response['Content-Length'], str(len(self.CONTENT)))
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT)
+        self.assert_download_headers(response)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync', DOWNLOAD_BACKEND='django')
+class ConditionalDownloadTests(TestCase):
+    """개별 다운로드의 조건부 요청(304)과 Range 요청(206/416) 확인"""
+
+    CONTENT = bytes(range(256)) * 4
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user('range', password='pw')
+        kr = Country.objects.create(code='KR', name='한국')
+        product = Product.objects.create(name='RG', color_class='bg-red-500')
+        category = Category.objects.create(name='Manual')
+        cls.artifact = Artifact.objects.create(
+            country=kr, product=product, category=category, version_string='1.0', uploader=user,
+            file=ContentFile(cls.CONTENT, name='RG_Manual_v1.0.bin'),
+        )
+        cls.etag = f'"{cls.artifact.checksum}"'
+        cls.last_modified = http_date(downloads.artifact_last_modified(cls.artifact))
+
+    def download(self, **headers):
+        return self.client.get(reverse('artifacts:download', args=[self.artifact.id]), headers=headers)
+
+    def test_not_modified_carries_validators(self):
+        for headers in ({'if-none-match': self.etag}, {'if-modified-since': self.last_modified}):
+            response = self.download(**headers)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], self.etag)
+            self.assertEqual(response['Last-Modified'], self.last_modified)
+        self.assertEqual(list(DownloadLog.objects.values_list('download_type', flat=True)), ['cached', 'cached'])
+
+    def test_single_range(self):
+        response = self.download(range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.CONTENT)}')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[10:20])
+
+        response = self.download(range='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), self.CONTENT[-5:])
+        self.assertEqual(DownloadLog.objects.filter(download_type='partial').count(), 2)
+
+    def test_multiple_ranges(self):
+        response = self.download(range='bytes=0-3, 100-109')
+        self.assertEqual(response.status_code, 206)
+        content_type = response['Content-Type']
+        self.assertTrue(content_type.startswith('multipart/byteranges; boundary='))
+        boundary = content_type.split('boundary=')[1]
+        body = b''.join(response.streaming_content)
+        self.assertEqual(response['Content-Length'], str(len(body)))
+
+        parts = body.split(f'--{boundary}'.encode())
+        self.assertEqual(parts[0], b'')
+        self.assertEqual(parts[-1], b'--\r\n')
+        ranges = []
+        for part in parts[1:-1]:
+            headers, _, data = part.partition(b'\r\n\r\n')
+            self.assertIn(b'Content-Type: application/octet-stream', headers)
+            ranges.append((headers.split(b'Content-Range: ')[1].decode(), data[:-2]))
+        self.assertEqual(ranges, [
+            (f'bytes 0-3/{len(self.CONTENT)}', self.CONTENT[0:4]),
+            (f'bytes 100-109/{len(self.CONTENT)}', self.CONTENT[100:110]),
+        ])
+
+    def test_unsatisfiable_range(self):
+        response = self.download(range=f'bytes={len(self.CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.CONTENT)}')
+        self.assertFalse(DownloadLog.objects.exists())
+
+    def test_empty_file_ranges_unsatisfiable(self):
+        for header in ('bytes=-5', 'bytes=0-', 'bytes=0-0, -1'):
+            self.assertEqual(downloads.parse_range_header(header, 0), [])
+        name = self.artifact.file.storage.save('empty.bin', ContentFile(b''))
+        Artifact.objects.filter(pk=self.artifact.pk).update(file=name)
+        response = self.download(range='bytes=-5')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */0')
+
+    def test_if_range(self):
+        later = http_date(downloads.artifact_last_modified(self.artifact) + 60)
+        cases = [
+            (self.etag, 206),
+            ('"stale"', 200),
+            (self.last_modified, 206),
+            # 날짜는 정확히 같을 때만 일치
+            (later, 200),
+        ]
+        for if_range, status in cases:
+            with self.subTest(if_range=if_range):
+                response = self.download(range='bytes=0-9', if_range=if_range)
+                self.assertEqual(response.status_code, status)
+                expected = self.CONTENT[:10] if status == 206 else self.CONTENT
+                self.assertEqual(b''.join(response.streaming_content), expected)
+
+
+@override_settings(AUDIT_LOG_MODE='async', AUDIT_LOG_FLUSH_INTERVAL=60, AUDIT_LOG_BATCH_SIZE=100)
+class AuditLogBufferTests(TestCase):
+    """감사 로그가 요청 안에서 기록되지 않고 버퍼에서 일괄 기록되는지 확인"""
+
+    def tearDown(self):
+        audit.flush()
+
+    def login_attempt(self, username):
+        return self.client.post(reverse('artifacts:login'), {'username': username, 'password': 'wrong'})
+
+    def test_login_attempts_buffered_until_flush(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.login_attempt('ghost1')
+            self.login_attempt('ghost2')
+        self.assertFalse([q for q in ctx.captured_queries if 'INSERT' in q['sql']])
+        self.assertEqual(LoginAttempt.objects.count(), 0)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(audit.flush(), 2)
+        # 로그 테이블과 통합 활동 로그에 각각 한 번씩
+        self.assertEqual(len([q for q in ctx.captured_queries if 'INSERT' in q['sql']]), 2)
+        self.assertEqual(sorted(LoginAttempt.objects.values_list('username', flat=True)), ['ghost1', 'ghost2'])
+
+    def test_created_at_is_event_time(self):
+        self.login_attempt('ghost')
+        attempt = audit._buffer._pending[0]
+        audit.flush()
+        self.assertEqual(LoginAttempt.objects.get().created_at, attempt.created_at)
+
+    @override_settings(AUDIT_LOG_MODE='sync')
+    def test_sync_mode_writes_immediately(self):
+        self.login_attempt('ghost')
+        self.assertEqual(LoginAttempt.objects.count(), 1)
+
+
+class MergePaginationTests(TestCase):
+    """여러 로그 테이블 병합 페이지가 전체 정렬 결과와 같은지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # 같은 시각의 로그를 섞어 출처/id 순 동점 처리까지 확인
+        for i in range(23):
+            created_at = now - timedelta(seconds=i // 3)
+            LoginAttempt.objects.create(username=f'l{i}', created_at=created_at)
+            if i % 2:
+                DownloadLog.objects.create(username=f'd{i}', download_type='single', created_at=created_at)
+
+    def sources(self):
+        return {'login': LoginAttempt.objects.all(), 'download': DownloadLog.objects.all()}
+
+    def expected(self):
+        rows = [('login', obj) for obj in LoginAttempt.objects.all()]
+        rows += [('download', obj) for obj in DownloadLog.objects.all()]
+        rows.sort(key=lambda row: (row[1].created_at, row[0], row[1].pk), reverse=True)
+        return [(source, obj.pk) for source, obj in rows]
+
+    def keys(self, page):
+        return [(source, obj.pk) for source, obj in page.items]
+
+    def test_offset_pages_match_full_sort(self):
+        expected = self.expected()
+        for offset in range(0, len(expected), 5):
+            page = pagination.merge_page(self.sources(), 5, offset=offset)
+            self.assertEqual(self.keys(page), expected[offset:offset + 5])
+            self.assertEqual(page.has_next, offset + 5 < len(expected))
+
+    def test_cursor_walks_forward_and_back(self):
+        expected = self.expected()
+        pages = [pagination.merge_page(self.sources(), 7)]
+        while pages[-1].has_next:
+            pages.append(pagination.merge_page(self.sources(), 7, cursor=pages[-1].next_cursor))
+        self.assertEqual([key for page in pages for key in self.keys(page)], expected)
+
+        previous = pagination.merge_page(self.sources(), 7, cursor=pages[2].previous_cursor, direction='prev')
+        self.assertEqual(self.keys(previous), self.keys(pages[1]))
+
+    def test_cursor_query_count_independent_of_depth(self):
+        page = pagination.merge_page(self.sources(), 5, offset=20)
+        with self.assertNumQueries(2):
+            pagination.merge_page(self.sources(), 5, cursor=page.next_cursor)
+
+    def test_capped_count(self):
+        self.assertEqual(pagination.capped_count(LoginAttempt.objects.all(), limit=100), (23, True))
+        self.assertEqual(pagination.capped_count(LoginAttempt.objects.all(), limit=10), (10, False))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(pagination.InvalidCursor):
+            pagination.merge_page(self.sources(), 5, cursor='not-a-cursor')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='async', AUDIT_LOG_FLUSH_INTERVAL=60)
+class ActivityEventTests(TestCase):
+    """원본 로그 기록 시 통합 활동 로그가 함께 추가되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='pw')
+        kr = Country.objects.create(code='KR', name='한국')
+        cls.product = Product.objects.create(name='Sparrow', color_class='bg-red-500')
+        category = Category.objects.create(name='Brochure')
+        cls.artifact = Artifact.objects.create(
+            country=kr, product=cls.product, category=category, version_string='1.0',
+            uploader=cls.user, file=ContentFile(b'x', name='brochure.pdf'),
+        )
+
+    def tearDown(self):
+        audit.flush()
+
+    def test_buffered_logs_projected_on_flush(self):
+        audit.record(DownloadLog(user=self.user, username='tester', download_type='single', artifact=self.artifact))
+        audit.record(LoginAttempt(username='ghost', success=False, failure_reason='bad'))
+        self.assertFalse(ActivityEvent.objects.exists())
+        audit.flush()
+
+        download = ActivityEvent.objects.get(event_type='download')
+        self.assertEqual((download.username, download.product, download.category, download.version),
+                         ('tester', 'Sparrow', 'Brochure', '1.0'))
+        self.assertEqual(download.filename, self.artifact.filename)
+        login = ActivityEvent.objects.get(event_type='login')
+        self.assertEqual(login.details, {'success': False, 'failure_reason': 'bad'})
+
+    def test_backfill_is_idempotent(self):
+        log = DownloadLog.objects.create(username='tester', download_type='bulk', product=self.product, artifact_count=3)
+        ActivityEvent.objects.all().delete()
+        call_command('backfill_activity_events', stdout=StringIO())
+        call_command('backfill_activity_events', stdout=StringIO())
+        event = ActivityEvent.objects.get()
+        self.assertEqual((event.source, event.source_id, event.product), ('download', log.id, 'Sparrow'))
+        self.assertEqual(event.details['artifact_count'], 3)
+
+    def test_unified_api_reads_projection(self):
+        admin = User.objects.create_superuser('admin', password='pw')
+        LoginAttempt.objects.create(username='tester', success=True)
+        DownloadLog.objects.create(username='tester', download_type='single', artifact=self.artifact)
+        self.client.force_login(admin)
+        with self.assertNumQueries(4):  # 세션, 사용자, 목록, 건수
+            response = self.client.get(reverse('artifacts:get_unified_logs_api'), {'type': 'download'})
+        logs = response.json()['logs']
+        self.assertEqual([log['type'] for log in logs], ['download'])
+        self.assertEqual(logs[0]['artifact']['product'], 'Sparrow')
+
+    def test_unified_api_pages_by_cursor_with_capped_count(self):
+        admin = User.objects.create_superuser('admin', password='pw')
+        for i in range(55):
+            LoginAttempt.objects.create(username=f'user{i}', success=True)
+        self.client.force_login(admin)
+        url = reverse('artifacts:get_unified_logs_api')
+        with CaptureQueriesContext(connection) as ctx:
+            first = self.client.get(url).json()['pagination']
+        self.assertEqual((first['total_count'], first['total_count_exact'], first['has_next']), (55, True, True))
+        # 건수는 COUNT_LIMIT + 1건까지만 세는 서브쿼리
+        self.assertIn(f'LIMIT {pagination.COUNT_LIMIT + 1}', ctx.captured_queries[-1]['sql'])
+
+        with self.assertNumQueries(3):  # 세션, 사용자, 목록 (건수는 세지 않음)
+            response = self.client.get(url, {'cursor': first['next_cursor']})
+        second = response.json()
+        self.assertEqual(len(second['logs']), 5)
+        self.assertNotIn('total_count', second['pagination'])
+        self.assertEqual(second['logs'][-1]['username'], 'user0')
+        back = self.client.get(url, {'cursor': second['pagination']['previous_cursor'], 'direction': 'prev'}).json()
+        self.assertEqual(back['logs'][0]['username'], 'user54')
+
+    def test_download_logs_api_serializes_snapshot(self):
+        admin = User.objects.create_superuser('admin', password='pw')
+        DownloadLog.objects.create(username='tester', download_type='single', artifact=self.artifact,
+                                   snapshot=self.artifact.snapshot())
+        # 산출물이 삭제된 로그도 기록 당시 정보로 표시
+        DownloadLog.objects.create(username='tester', download_type='single',
+                                   snapshot={**self.artifact.snapshot(), 'filename': 'old.pdf'})
+        self.client.force_login(admin)
+        with self.assertNumQueries(4):  # 세션, 사용자, 목록, 건수
+            response = self.client.get(reverse('artifacts:get_download_logs_api'))
+        logs = response.json()['logs']
+        self.assertEqual([(log['artifact']['filename'], log['artifact']['deleted']) for log in logs],
+                         [('old.pdf', True), (self.artifact.filename, False)])
+        self.assertEqual(logs[1]['artifact']['category_name'], 'Brochure')
+
+    def test_username_backfilled_for_legacy_download_logs(self):
+        # username 필드 도입 전 기록된 로그 (사용자 계정만 연결됨)
+        legacy = DownloadLog.objects.create(user=self.user, username='', download_type='single', artifact=self.artifact)
+        anonymous = DownloadLog.objects.create(username='', download_type='single', artifact=self.artifact)
+        migration = importlib.import_module('artifacts.migrations.0027_downloadlog_username')
+        migration.backfill_usernames(django_apps, None)
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.username, 'tester')
+
+        self.client.force_login(User.objects.create_superuser('admin', password='pw'))
+        logs = self.client.get(reverse('artifacts:get_download_logs_api')).json()['logs']
+        self.assertEqual({log['id']: log['username'] for log in logs},
+                         {legacy.id: 'tester', anonymous.id: 'Anonymous'})
+
+
+class RetentionTests(TestCase):
+    """보관 기간이 지난 로그가 집계/내보내기 후 삭제되는지 확인"""
+
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir, ignore_errors=True)
+        old = timezone.now() - timedelta(days=400)
+        for i in range(5):
+            LoginAttempt.objects.create(username='old', success=True, created_at=old + timedelta(minutes=i))
+            DownloadLog.objects.create(username='old', download_type='single', created_at=old - timedelta(days=i % 2))
+        LoginAttempt.objects.create(username='recent', success=True)
+
+    def test_run_retention(self):
+        with self.settings(AUDIT_ARCHIVE_DIR=self.archive_dir):
+            retention.run_retention(days=365, batch_size=2)
+
+        self.assertEqual(list(LoginAttempt.objects.values_list('username', flat=True)), ['recent'])
+        self.assertFalse(DownloadLog.objects.exists())
+        self.assertEqual(list(ActivityEvent.objects.values_list('username', flat=True)), ['recent'])
+
+        rollups = DailyActivityRollup.objects.filter(username='old')
+        self.assertEqual(sum(rollups.filter(event_type='login').values_list('count', flat=True)), 5)
+        self.assertEqual(sorted(rollups.filter(event_type='download').values_list('count', flat=True)), [2, 3])
+
+        archived = os.listdir(os.path.join(self.archive_dir, LoginAttempt._meta.db_table))
+        self.assertEqual(len(archived), 1)
+        path = os.path.join(self.archive_dir, LoginAttempt._meta.db_table, archived[0])
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([row['username'] for row in rows], ['old'] * 5)
+
+    def test_late_events_merged_into_existing_rollup(self):
+        cutoff = retention.retention_cutoff(365)
+        retention.rollup_events(cutoff, batch_size=2)
+        old = timezone.now() - timedelta(days=400)
+        # 이미 집계된 날짜에 늦게 들어온 로그 (백필/비동기 기록)
+        ActivityEvent.objects.create(source='login', source_id=-1, event_type='login', username='old', created_at=old)
+        ActivityEvent.objects.create(source='login', source_id=-2, event_type='login', username='late', created_at=old)
+        # 집계 후 삭제 전에 중단되면 그 배치는 집계도 되돌아감
+        with mock.patch('django.db.models.QuerySet.delete', side_effect=RuntimeError('stop')), \
+                self.assertRaises(RuntimeError):
+            retention.rollup_events(cutoff, batch_size=1)
+        self.assertEqual(retention.rollup_events(cutoff, batch_size=1)[1], 2)
+
+        counts = Counter()
+        for username, count in DailyActivityRollup.objects.filter(event_type='login').values_list('username', 'count'):
+            counts[username] += count
+        self.assertEqual(counts, {'old': 6, 'late': 1})
+
+    def test_dry_run_keeps_rows(self):
+        with self.settings(AUDIT_ARCHIVE_DIR=self.archive_dir):
+            retention.run_retention(days=365, dry_run=True)
+        self.assertEqual(LoginAttempt.objects.count(), 6)
+        self.assertFalse(DailyActivityRollup.objects.exists())
+        self.assertEqual(os.listdir(self.archive_dir), [])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='async', AUDIT_LOG_FLUSH_INTERVAL=60)
+class DownloadAnalyticsTests(TestCase):
+    """다운로드 로그 기록 시 일별 집계가 증가하고 통계 API가 집계만 조회하는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', password='pw')
+        cls.kr = Country.objects.create(code='KR', name='한국')
+        cls.product = Product.objects.create(name='Sparrow', color_class='bg-red-500')
+        category = Category.objects.create(name='Brochure')
+        cls.artifacts = [
+            Artifact.objects.create(
+                country=cls.kr, product=cls.product, category=category, version_string=version,
+                uploader=cls.admin, file=ContentFile(b'x', name=f'brochure_{version}.pdf'),
+            )
+            for version in ('1.0', '2.0')
+        ]
+
+    def tearDown(self):
+        audit.flush()
+
+    def download(self, artifact, n, username='tester'):
+        for _ in range(n):
+            audit.record(DownloadLog(username=username, download_type='single', artifact=artifact))
+
+    def test_counts_incremented_per_key(self):
+        self.download(self.artifacts[0], 3)
+        self.download(self.artifacts[1], 1)
+        audit.flush()
+        self.download(self.artifacts[0], 2)
+        audit.flush()
+
+        self.assertEqual(DownloadDailyCount.objects.count(), 2)
+        row = DownloadDailyCount.objects.get(artifact=self.artifacts[0])
+        self.assertEqual((row.count, row.product_id, row.country_id, row.username),
+                         (5, self.product.id, self.kr.id, 'tester'))
+
+    def test_analytics_api(self):
+        self.download(self.artifacts[1], 4)
+        self.download(self.artifacts[0], 2, username='other')
+        audit.flush()
+        self.client.force_login(self.admin)
+
+        url = reverse('artifacts:get_download_analytics_api')
+        with self.assertNumQueries(5):  # 세션, 사용자, 상위 목록, 산출물 정보, 추이
+            data = self.client.get(url, {'group_by': 'artifact', 'country': 'KR'}).json()
+        self.assertEqual([(item['key'], item['count']) for item in data['top']],
+                         [(self.artifacts[1].id, 4), (self.artifacts[0].id, 2)])
+        self.assertEqual(data['top'][0]['label']['version'], '2.0')
+        self.assertEqual([item['count'] for item in data['series']], [6])
+
+        data = self.client.get(url, {'group_by': 'user', 'interval': 'month'}).json()
+        self.assertEqual([(item['key'], item['count']) for item in data['top']], [('tester', 4), ('other', 2)])
+        self.assertEqual(self.client.get(url, {'group_by': 'nope'}).status_code, 400)
+
+    def test_counts_upsert_is_unique_per_key(self):
+        day = timezone.localdate()
+        key = (day, 'single', self.artifacts[0].id, self.product.id, self.kr.id, 'tester')
+        bulk_key = (day, 'bulk', None, self.product.id, self.kr.id, 'tester')
+        analytics.add_counts(Counter({key: 2, bulk_key: 1}))
+        analytics.add_counts(Counter({key: 3, bulk_key: 4}))
+        self.assertEqual(DownloadDailyCount.objects.get(download_type='single').count, 5)
+        self.assertEqual(DownloadDailyCount.objects.get(download_type='bulk').count, 5)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DownloadDailyCount.objects.create(date=day, download_type='single', artifact=self.artifacts[0],
+                                              product=self.product, country=self.kr, username='tester')
+
+        # 산출물이 삭제되면 NULL 키가 되어 제약과 충돌하지 않음
+        self.artifacts[0].delete()
+        self.assertEqual(DownloadDailyCount.objects.filter(artifact=None).count(), 2)
+
+    def test_rebuild_counts(self):
+        self.download(self.artifacts[0], 3)
+        audit.flush()
+        DownloadDailyCount.objects.update(count=99)
+        call_command('rebuild_download_counts', stdout=StringIO())
+        self.assertEqual(DownloadDailyCount.objects.get().count, 3)
+
+
+class LogSearchTests(TestCase):
+    """로그 사용자명 검색이 앞부분 일치는 인덱스 범위로, 부분 일치는 FTS 보조 인덱스로 처리되는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for username in ('kimjiyong', 'kimsparrow', 'parkkim', 'lee'):
+            LoginAttempt.objects.create(username=username, success=True)
+            DownloadLog.objects.create(username=username, download_type='single')
+
+    def usernames(self, queryset):
+        return sorted(queryset.values_list('username', flat=True))
+
+    def test_prefix_match(self):
+        queryset = search.filter_username(LoginAttempt.objects.all(), 'kim', 'prefix')
+        self.assertEqual(self.usernames(queryset), ['kimjiyong', 'kimsparrow'])
+        self.assertNotIn('LIKE', str(queryset.query))
+
+    def test_prefix_match_ignores_case_and_uses_index(self):
+        LoginAttempt.objects.create(username='KimCap', success=True)
+        for term in ('kim', 'KIM', 'Kims'):
+            queryset = search.filter_username(LoginAttempt.objects.all(), term, 'prefix')
+            expected = ['kimsparrow'] if term == 'Kims' else ['KimCap', 'kimjiyong', 'kimsparrow']
+            self.assertEqual(self.usernames(queryset), expected)
+        plan = queryset.values('id').explain()
+        self.assertIn('loginattempt_username_lower', plan)
+
+    def test_prefix_range_uses_byte_order_collation(self):
+        for username in ('kim-a', 'kim.b', 'kim_c', 'kim~d', 'kin'):
+            LoginAttempt.objects.create(username=username, success=True)
+        queryset = search.filter_username(LoginAttempt.objects.all(), 'kim', 'prefix')
+        self.assertEqual(self.usernames(queryset), ['kim-a', 'kim.b', 'kim_c', 'kimjiyong', 'kimsparrow', 'kim~d'])
+        self.assertNotIn('COLLATE', str(queryset.query))
+        # PostgreSQL에서는 조건과 표현식 인덱스 모두 COLLATE "C" (로캘 콜레이션이면 범위가 어긋남)
+        index = next(index for index in LoginAttempt._meta.indexes if index.name == 'loginattempt_username_lower')
+        indexed = LoginAttempt.objects.values(key=index.expressions[0])
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            self.assertEqual(str(queryset.query).count('LOWER("artifacts_loginattempt"."username") COLLATE "C"'), 2)
+            self.assertIn('LOWER("artifacts_loginattempt"."username") COLLATE "C"', str(indexed.query))
+
+    def test_legacy_download_events_get_usernames(self):
+        log = DownloadLog.objects.create(username='', download_type='single')
+        DownloadLog.objects.filter(pk=log.pk).update(username='Choi')
+        migration = importlib.import_module('artifacts.migrations.0028_username_search_lower')
+        migration.backfill_event_usernames(django_apps, None)
+        for model, source in ((DownloadLog, 'download'), (ActivityEvent, None)):
+            queryset = search.filter_username(model.objects.all(), 'cho', 'prefix', source=source)
+            self.assertEqual(self.usernames(queryset), ['Choi'])
+
+    def test_contains_match_uses_fts(self):
+        self.assertTrue(search.fts_available())
+        for model, source in ((LoginAttempt, 'login'), (DownloadLog, 'download')):
+            queryset = search.filter_username(model.objects.all(), 'kim', 'contains', source=source)
+            self.assertEqual(self.usernames(queryset), ['kimjiyong', 'kimsparrow', 'parkkim'])
+            self.assertIn('MATCH', str(queryset.query))
+        events = search.filter_username(ActivityEvent.objects.all(), 'arrow', 'contains')
+        self.assertEqual(self.usernames(events), ['kimsparrow', 'kimsparrow'])
+
+    def test_fts_index_follows_deletes(self):
+        ActivityEvent.objects.filter(username='parkkim').delete()
+        queryset = search.filter_username(LoginAttempt.objects.all(), 'kim', 'contains', source='login')
+        self.assertEqual(self.usernames(queryset), ['kimjiyong', 'kimsparrow'])
+
+    def test_short_contains_term_falls_back_to_icontains(self):
+        queryset = search.filter_username(LoginAttempt.objects.all(), 'ee', 'contains', source='login')
+        self.assertEqual(self.usernames(queryset), ['lee'])
+
+
+class DatabaseSettingsTests(TestCase):
+    """SQLite 연결에 SQLITE_PRAGMAS가 적용되는지 확인"""
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('busy_timeout'), db.sqlite_pragmas()['busy_timeout'])
+
+    def test_invalid_pragma_rejected(self):
+        with self.assertRaises(ValueError):
+            db.pragma_statements({'journal_mode': 'wal; DROP TABLE x'})
+
+    def test_bench_db_writes(self):
+        # 프로세스 풀 대신 스레드로 실행 (테스트에서 프로세스를 띄우지 않음)
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as bench_dir, \
+                mock.patch('artifacts.management.commands.bench_db_writes.ProcessPoolExecutor', ThreadPoolExecutor):
+            call_command('bench_db_writes', workers=2, writes=5, dir=bench_dir, stdout=out)
+            self.assertEqual(os.listdir(bench_dir), [])
+        self.assertIn('처리량 배율', out.getvalue())
+        # 두 설정 모두 2 x 5건 쓰기 성공
+        self.assertEqual(re.findall(r'설정\s+(\d+)\s', out.getvalue()), ['10', '10'])
+
+
+def _cache_worker(location, action, count):
+    """다른 프로세스에서 같은 캐시 파일 사용 (SharedCacheTests)"""
+    shared = SQLiteCache(location, {})
+    for _ in range(count):
+        if action == 'incr':
+            shared.incr('generation')
+        else:
+            shared.set('value', action)
+
+
+class SharedCacheTests(SimpleTestCase):
+    """SQLiteCache를 여러 프로세스가 공유할 때 무효화와 증가가 서로 보이는지 확인"""
+
+    def setUp(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        self.location = os.path.join(tmp_dir, 'cache.sqlite3')
+        self.cache = SQLiteCache(self.location, {'OPTIONS': {'MAX_SIZE': 10000}})
+
+    def run_processes(self, action, processes=1, count=1):
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_cache_worker, args=(self.location, action, count))
+                   for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+            self.assertEqual(worker.exitcode, 0)
+
+    def test_tests_do_not_use_cache_file(self):
+        # artifacts.test_runner가 테스트 동안 메모리 캐시로 바꿈
+        self.assertNotIsInstance(caches['default'], SQLiteCache)
+
+    def test_other_process_sees_invalidation(self):
+        self.cache.set('generation', 1, timeout=None)
+        self.run_processes('incr')
+        self.assertEqual(self.cache.get('generation'), 2)
+        self.run_processes('changed')
+        self.assertEqual(self.cache.get('value'), 'changed')
+
+    def test_concurrent_incr_is_atomic(self):
+        self.cache.set('generation', 0, timeout=None)
+        self.run_processes('incr', processes=4, count=50)
+        self.assertEqual(self.cache.get('generation'), 200)
+
+    def test_size_eviction_keeps_counters(self):
+        self.cache.set('generation', 7, timeout=None)
+        for i in range(10):
+            self.cache.set(f'blob:{i}', b'x' * 2000)
+        self.assertEqual(self.cache.get('generation'), 7)
+        self.assertIsNone(self.cache.get('blob:0'))
+        self.assertIsNotNone(self.cache.get('blob:9'))
+        self.assertTrue(self.cache.add('blob:0', 'again'))
+        self.assertFalse(self.cache.add('blob:0', 'ignored'))
+
+
+class ReferenceDataTests(TestCase):
+    """기준 정보 스냅샷이 DB 조회 없이 제공되고 모델 변경 시 다시 읽히는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.kr = Country.objects.create(code='KR', name='한국')
+        cls.us = Country.objects.create(code='US', name='미국', display_order=1)
+        cls.product = Product.objects.create(name='Sparrow', color_class='bg-red-500')
+        cls.brochure = Category.objects.create(name='Brochure', department='marketing')
+        cls.manual = Category.objects.create(name='Manual', department='consulting')
+        ProductCategoryDisabled.objects.create(country=cls.us, product=cls.product, category=cls.manual)
+
+    def setUp(self):
+        # 테스트 종료 시 롤백은 시그널을 보내지 않으므로 이전 테스트에서 만든 스냅샷을 버림
+        reference.invalidate()
+
+    def test_snapshot_served_without_queries(self):
+        reference.current()
+        with self.assertNumQueries(0):
+            ref = reference.current()
+            self.assertEqual(ref.country(), self.kr)
+            self.assertEqual(ref.country('US'), self.us)
+            self.assertIsNone(ref.country('JP'))
+            self.assertEqual(ref.categories_for('marketing'), [self.brochure])
+            self.assertTrue(ref.is_disabled(self.us, self.product.id, self.manual.id))
+            self.assertFalse(ref.is_disabled(self.kr, self.product.id, self.manual.id))
+            self.assertEqual(ref.disabled_cells(self.us), {(self.product.id, self.manual.id)})
+
+    def test_rebuilt_after_change(self):
+        ref = reference.current()
+        product = Product.objects.create(name='Falcon', color_class='bg-blue-500')
+        ProductCategoryDisabled.objects.filter(country=self.us).delete()
+        updated = reference.current()
+        self.assertIsNot(updated, ref)
+        self.assertIn(product.id, updated.products_by_id)
+        self.assertEqual(updated.disabled_cells(self.us), frozenset())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, UPLOAD_CHUNK_SIZE=4)
+class ChunkedUploadTests(TestCase):
+    """분할 업로드: 전송 전 검사, 위치 기반 재개, 완료 시 산출물과 로그 생성"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='pw')
+        Country.objects.create(code='KR', name='한국')
+        cls.product = Product.objects.create(name='Sparrow', color_class='bg-red-500')
+        cls.category = Category.objects.create(name='Brochure')
+
+    def setUp(self):
+        reference.invalidate()
+        self.client.force_login(self.user)
+        self.init_url = reverse('artifacts:upload_session_create', args=[self.product.id, self.category.id])
+
+    def start(self, filename='Sparrow_Brochure_v1.0.pdf', size=10):
+        return self.client.post(self.init_url, {'version_string': '1.0', 'filename': filename, 'size': size})
+
+    def put(self, token, data, start, total=10):
+        return self.client.put(
+            reverse('artifacts:upload_session_detail', args=[token]), data=data,
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(data) - 1}/{total}',
+        )
+
+    def test_rejected_before_upload(self):
+        response = self.start(filename='wrong.pdf')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('파일명 양식', response.json()['error'])
+        self.assertFalse(UploadSession.objects.exists())
+
+    def test_resume_and_finalize(self):
+        token = self.start().json()['token']
+        self.assertEqual(self.put(token, b'0123', 0).json()['offset'], 4)
+        # 이미 받은 위치와 다르면 거부하고 이어 보낼 위치를 알려줌
+        conflict = self.put(token, b'0123', 0)
+        self.assertEqual((conflict.status_code, conflict.json()['offset']), (409, 4))
+        # 같은 업로드를 다시 시작하면 기존 세션을 이어서 사용
+        resumed = self.start().json()
+        self.assertEqual((resumed['token'], resumed['offset']), (token, 4))
+        self.put(token, b'4567', 4)
+        self.put(token, b'89', 8)
+
+        response = self.client.post(reverse('artifacts:upload_session_finalize', args=[token]))
+        self.assertEqual(response.status_code, 200)
+        artifact = Artifact.objects.get()
+        self.assertEqual(artifact.filename, 'Sparrow_Brochure_v1.0.pdf')
+        with artifact.file.open('rb') as f:
+            self.assertEqual(f.read(), b'0123456789')
+        self.assertTrue(ArtifactActivityLog.objects.filter(artifact=artifact, action='upload').exists())
+        session = UploadSession.objects.get()
+        self.assertEqual((session.status, session.artifact), ('completed', artifact))
+        self.assertFalse(uploads.staging_path(session).exists())
+        # 같은 버전은 다시 시작할 수 없음
+        self.assertEqual(self.start().status_code, 400)
+
+    def test_finalize_can_retry_after_rollback(self):
+        token = self.start().json()['token']
+        for start in (0, 4, 8):
+            self.put(token, b'0123456789'[start:start + 4], start)
+        url = reverse('artifacts:upload_session_finalize', args=[token])
+        with mock.patch.object(ArtifactActivityLog.objects, 'create', side_effect=RuntimeError('db down')), \
+                self.assertRaises(RuntimeError):
+            self.client.post(url)
+        session = UploadSession.objects.get()
+        self.assertEqual(session.status, 'uploading')
+        self.assertEqual(uploads.staging_path(session).read_bytes(), b'0123456789')
+        self.assertFalse(uploads.finalize_backup_path(session).exists())
+
+        self.assertEqual(self.client.post(url).status_code, 200)
+        with Artifact.objects.get().file.open('rb') as f:
+            self.assertEqual(f.read(), b'0123456789')
+        self.assertFalse(uploads.staging_path(session).exists())
+
+    def test_finalize_requires_all_bytes(self):
+        token = self.start().json()['token']
+        self.put(token, b'0123', 0)
+        response = self.client.post(reverse('artifacts:upload_session_finalize', args=[token]))
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Artifact.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync')
+class UploadPreflightTests(TestCase):
+    """multipart 업로드는 파일 내용을 받기 전에 폼 필드와 파일명으로 거부"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='pw')
+        cls.kr = Country.objects.create(code='KR', name='한국')
+        cls.product = Product.objects.create(name='Sparrow', color_class='bg-red-500')
+        cls.category = Category.objects.create(name='Brochure')
+        Artifact.objects.create(
+            country=cls.kr, product=cls.product, category=cls.category, version_string='1.0',
+            uploader=cls.user, file=ContentFile(b'v1', name='Sparrow_Brochure_v1.0.pdf'),
+        )
+
+    def setUp(self):
+        reference.invalidate()
+
+    CSRF_TOKEN = 'a' * 32
+
+    def parse(self, data, csrf=True):
+        headers = {'X-CSRFToken': self.CSRF_TOKEN} if csrf else {}
+        request = RequestFactory().post('/', data, headers=headers)
+        request.COOKIES[settings.CSRF_COOKIE_NAME] = self.CSRF_TOKEN
+        handler = uploads.UploadPreflightHandler(request, reference.current(), self.product, self.category)
+        request.upload_handlers.insert(0, handler)
+        return request, handler
+
+    def test_rejected_without_reading_file(self):
+        content = b'x' * (1024 * 1024)
+        request, handler = self.parse({
+            'version_string': '1.0',
+            'file': ContentFile(content, name='Sparrow_Brochure_v1.0.pdf'),
+        })
+        self.assertEqual(request.POST['version_string'], '1.0')
+        self.assertEqual(len(request.FILES), 0)
+        self.assertIn('이미 존재', handler.error.message)
+        # 본문 앞부분만 읽고 파일 내용은 읽지 않음
+        self.assertGreater(len(request.META['wsgi.input']), len(content) - uploads.preflight_bytes())
+
+    def test_accepted_upload_is_parsed(self):
+        request, handler = self.parse({
+            'country': 'KR',
+            'version_string': '2.0',
+            'file': ContentFile(b'v2', name='Sparrow_Brochure_v2.0.pdf'),
+        })
+        self.assertIsNone(handler.error)
+        self.assertEqual(request.POST['version_string'], '2.0')
+        self.assertEqual(request.FILES['file'].read(), b'v2')
+        self.assertEqual(request.FILES['file'].sha256, hashlib.sha256(b'v2').hexdigest())
+
+    def test_fields_after_file_checked_by_view(self):
+        request, handler = self.parse({
+            'file': ContentFile(b'v1', name='Sparrow_Brochure_v1.0.pdf'),
+            'version_string': '1.0',
+        })
+        self.assertIsNone(handler.error)
+        self.assertEqual(request.FILES['file'].read(), b'v1')
+
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('artifacts:upload', args=[self.product.id, self.category.id]),
+            {'file': ContentFile(b'v1', name='Sparrow_Brochure_v1.0.pdf'), 'version_string': '1.0'},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('이미 존재', response.json()['error'])
+
+    def test_view_returns_preflight_error(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('artifacts:upload', args=[self.product.id, self.category.id]),
+            {'version_string': '3.0', 'file': ContentFile(b'v3', name='wrong.pdf')},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('파일명 양식', response.json()['error'])
+        self.assertEqual(Artifact.objects.count(), 1)
+
+    def test_preflight_skipped_without_csrf_token(self):
+        data = {'version_string': '1.0', 'file': ContentFile(b'v1', name='Sparrow_Brochure_v1.0.pdf')}
+        request, handler = self.parse(data, csrf=False)
+        # 토큰이 없으면 DB 조회 없이 그대로 파싱 (뷰의 csrf_protect가 거부)
+        with self.assertNumQueries(0):
+            self.assertEqual(request.FILES['file'].read(), b'v1')
+        self.assertIsNone(handler.error)
+
+        # 토큰이 폼 필드로 파일 앞에 오면 사전 검사
+        request, handler = self.parse({'csrfmiddlewaretoken': self.CSRF_TOKEN, **data}, csrf=False)
+        self.assertEqual(len(request.FILES), 0)
+        self.assertIn('이미 존재', handler.error.message)
+
+    def test_upload_with_csrf_header_checked_before_file(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        client.cookies[settings.CSRF_COOKIE_NAME] = self.CSRF_TOKEN
+        response = client.post(
+            reverse('artifacts:upload', args=[self.product.id, self.category.id]),
+            {'version_string': '1.0', 'file': ContentFile(b'v1', name='Sparrow_Brochure_v1.0.pdf')},
+            headers={'X-CSRFToken': self.CSRF_TOKEN},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('이미 존재', response.json()['error'])
+
+    def test_upload_requires_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        url = reverse('artifacts:upload', args=[self.product.id, self.category.id])
+        # 사전 검사 통과/거부와 관계없이 토큰이 없으면 403 (중복 여부도 드러내지 않음)
+        for version in ('2.0', '1.0'):
+            response = client.post(url, {
+                'version_string': version,
+                'file': ContentFile(b'data', name=f'Sparrow_Brochure_v{version}.pdf'),
+            })
+            self.assertEqual(response.status_code, 403)
+        self.assertEqual(Artifact.objects.count(), 1)
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync')
+class BlobTests(TestCase):
+    """같은 내용의 산출물은 하나의 Blob을 참조하고, 마지막 참조가 삭제되면 파일도 삭제"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='pw', is_staff=True)
+        cls.kr = Country.objects.create(code='KR', name='한국')
+        cls.us = Country.objects.create(code='US', name='미국')
+        cls.product = Product.objects.create(name='Sparrow', color_class='bg-red-500')
+        cls.category = Category.objects.create(name='Brochure')
+
+    def setUp(self):
+        reference.invalidate()
+
+    def create(self, country, version, content=b'same content'):
+        return Artifact.objects.create(
+            country=country, product=self.product, category=self.category,
+            version_string=version, uploader=self.user,
+            file=ContentFile(content, name=f'Sparrow_Brochure_v{version}.pdf'),
+        )
+
+    def test_identical_content_shares_blob(self):
+        first = self.create(self.kr, '1.0')
+        second = self.create(self.us, '1.0')
+        blob = Blob.objects.get()
+        self.assertEqual((first.blob, second.blob, blob.ref_count), (blob, blob, 2))
+        self.assertEqual(blob.sha256, hashlib.sha256(b'same content').hexdigest())
+        self.assertEqual(first.filename, 'Sparrow_Brochure_v1.0.pdf')
+        self.assertEqual(first.checksum, blob.sha256)
+        path = blob.file.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(Blob.objects.get().ref_count, 1)
+        self.assertTrue(os.path.exists(path))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_failed_insert_releases_blob_reference(self):
+        self.create(self.kr, '1.0')
+        for content in (b'same content', b'new content'):
+            with self.subTest(content=content), self.assertRaises(IntegrityError):
+                # product 없음 (NOT NULL 위반) - store_blob 이후 행 저장 실패
+                Artifact(country=self.us, category=self.category, version_string='1.0', uploader=self.user,
+                         file=ContentFile(content, name='Sparrow_Brochure_v1.0.pdf')).save()
+        self.assertEqual(list(Blob.objects.values_list('ref_count', flat=True)), [1])
+
+    def test_blob_reused_before_file_delete_is_kept(self):
+        artifact = self.create(self.kr, '1.0')
+        blob = artifact.blob
+        path = blob.file.path
+        with self.captureOnCommitCallbacks() as callbacks:
+            artifact.delete()
+        # 커밋 후 파일 삭제 전에 같은 내용이 다시 저장됨
+        self.assertEqual(blobs.store_blob(ContentFile(b'same content')), blob)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(Blob.objects.get().ref_count, 1)
+        self.assertTrue(os.path.exists(path))
+
+        # 파일 삭제 후 행 삭제 전에 중단되어 파일 없이 남은 Blob은 다시 참조할 때 파일을 저장
+        Blob.objects.update(ref_count=0)
+        os.remove(path)
+        self.assertEqual(blobs.store_blob(ContentFile(b'same content')), blob)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'same content')
+
+    def test_blob_file_restored_when_delete_fails(self):
+        artifact = self.create(self.kr, '1.0')
+        path = artifact.blob.file.path
+        with self.captureOnCommitCallbacks() as callbacks:
+            artifact.delete()
+        with mock.patch.object(Blob, 'delete', side_effect=RuntimeError('db down')), self.assertRaises(RuntimeError):
+            callbacks[0]()
+        self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(f'{path}.deleting'))
+        callbacks[0]()
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_upload_handler_hashes_stream(self):
+        self.client.force_login(self.user)
+        content = b'uploaded bytes' * 100
+        upload = ContentFile(content, name='Sparrow_Brochure_v2.0.pdf')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('artifacts:upload', args=[self.product.id, self.category.id]),
+                {'version_string': '2.0', 'file': upload},
+            )
+        self.assertEqual(response.status_code, 200)
+        artifact = Artifact.objects.get()
+        self.assertEqual(artifact.blob.sha256, hashlib.sha256(content).hexdigest())
+        self.assertEqual(artifact.filename, 'Sparrow_Brochure_v2.0.pdf')
+
+    def make_legacy(self, countries):
+        """업로드 시각별 디렉토리에 파일이 따로 있던 이전 상태의 산출물 (반환값: 파일 경로 목록)"""
+        storage = blobs.blob_storage()
+        legacy = []
+        for country in countries:
+            artifact = self.create(country, '3.0', content=b'legacy')
+            name = storage.save(f'artifacts/20240101{country.code}/Sparrow_Brochure_v3.0.pdf', ContentFile(b'legacy'))
+            Artifact.objects.filter(pk=artifact.pk).update(file=name, blob=None, original_filename='')
+            legacy.append(name)
+        Blob.objects.all().delete()
+        storage.delete(blobs.blob_name(hashlib.sha256(b'legacy').hexdigest()))
+        return legacy
+
+    def test_dedupe_legacy_files(self):
+        storage = blobs.blob_storage()
+        legacy = self.make_legacy((self.kr, self.us))
+
+        out = StringIO()
+        call_command('dedupe_artifact_files', stdout=out)
+        self.assertIn('중복 1건', out.getvalue())
+        blob = Blob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        for artifact in Artifact.objects.all():
+            self.assertEqual((artifact.blob, artifact.filename), (blob, 'Sparrow_Brochure_v3.0.pdf'))
+        with blob.file.open('rb') as f:
+            self.assertEqual(f.read(), b'legacy')
+        self.assertFalse(any(storage.exists(name) for name in legacy))
+
+    def test_dedupe_restores_file_when_db_update_fails(self):
+        storage = blobs.blob_storage()
+        [legacy] = self.make_legacy((self.kr,))
+        with mock.patch.object(Blob.objects, 'create', side_effect=RuntimeError('db down')), \
+                self.assertRaises(RuntimeError):
+            call_command('dedupe_artifact_files', stdout=StringIO())
+        self.assertTrue(storage.exists(legacy))
+        self.assertFalse(storage.exists(blobs.blob_name(hashlib.sha256(b'legacy').hexdigest())))
+
+        call_command('dedupe_artifact_files', stdout=StringIO())
+        self.assertEqual(Artifact.objects.get().blob, Blob.objects.get())
+
+    def test_dedupe_rerun_adopts_moved_file(self):
+        storage = blobs.blob_storage()
+        [legacy] = self.make_legacy((self.kr,))
+        sha256 = hashlib.sha256(b'legacy').hexdigest()
+        # 파일을 Blob 경로로 옮긴 직후 중단된 상태
+        Artifact.objects.update(checksum=sha256)
+        os.makedirs(os.path.dirname(storage.path(blobs.blob_name(sha256))), exist_ok=True)
+        os.replace(storage.path(legacy), storage.path(blobs.blob_name(sha256)))
+
+        out = StringIO()
+        call_command('dedupe_artifact_files', stdout=out)
+        self.assertIn('파일 없음 0건', out.getvalue())
+        artifact = Artifact.objects.get()
+        self.assertEqual((artifact.blob, artifact.filename), (Blob.objects.get(), 'Sparrow_Brochure_v3.0.pdf'))
+        with artifact.file.open('rb') as f:
+            self.assertEqual(f.read(), b'legacy')
+
+
+def make_pptx(slides=2, thumbnail=b'\xff\xd8thumb'):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        for i in range(1, slides + 1):
+            archive.writestr(f'ppt/slides/slide{i}.xml', f'<p:sld xmlns:p="p" xmlns:a="a"><a:p><a:t>슬라이드 {i}</a:t></a:p></p:sld>')
+        if thumbnail:
+            archive.writestr('docProps/thumbnail.jpeg', thumbnail)
+    return buffer.getvalue()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync', JOB_RETRY_BASE_DELAY=30)
+class ProcessingJobTests(TestCase):
+    """업로드 후 처리 작업: 등록, 워커 처리, 재시도/백오프, 히스토리와 셀의 처리 상태"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='pw')
+        cls.kr = Country.objects.create(code='KR', name='한국')
+        cls.product = Product.objects.create(name='Sparrow', color_class='bg-red-500')
+        cls.category = Category.objects.create(name='Brochure')
+
+    def setUp(self):
+        reference.invalidate()
+        self.artifact = Artifact.objects.create(
+            country=self.kr, product=self.product, category=self.category, version_string='1.0',
+            uploader=self.user, file=ContentFile(make_pptx(), name='Sparrow_Brochure_v1.0.pptx'),
+        )
+
+    def history(self):
+        response = self.client.get(reverse('artifacts:history', args=[self.product.id, self.category.id]))
+        return response.json()['history'][0]['processing']
+
+    def cell_processing(self):
+        latest = matrix.latest_artifacts(self.kr, [self.product], [self.category])
+        return latest[(self.product.id, self.category.id)].processing
+
+    def test_upload_enqueues_and_worker_processes(self):
+        self.assertEqual(set(self.artifact.processing_jobs.values_list('kind', flat=True)), set(jobs.JOB_HANDLERS))
+        self.assertEqual(self.history(), {'status': 'processing'})
+        self.assertTrue(self.cell_processing())
+
+        out = StringIO()
+        call_command('process_jobs', once=True, stdout=out)
+        self.assertIn(f'처리 작업 {len(jobs.JOB_HANDLERS)}건', out.getvalue())
+        processing = self.history()
+        self.assertEqual((processing['status'], processing['page_count'], processing['unit']), ('ready', 2, 'slide'))
+        self.assertTrue(processing['thumbnail_url'].endswith(f'thumbnails/{self.artifact.id}.jpeg'))
+        self.assertFalse(self.cell_processing())
+
+        path = os.path.join(MEDIA_ROOT, 'thumbnails', f'{self.artifact.id}.jpeg')
+        self.assertTrue(os.path.exists(path))
+        self.artifact.delete()
+        self.assertFalse(os.path.exists(path))
+
+    def test_failed_job_retries_with_backoff(self):
+        failing = mock.Mock(side_effect=OSError('disk error'))
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'checksum': failing}), override_settings(JOB_MAX_ATTEMPTS=2), \
+                self.assertLogs('artifacts.jobs', 'WARNING'):
+            jobs.process_batch('worker')
+            job = ProcessingJob.objects.get(artifact=self.artifact, kind='checksum')
+            self.assertEqual((job.status, job.attempts, job.last_error), ('pending', 1, 'disk error'))
+            self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=20))
+            # 대기 시간 전에는 다시 가져가지 않음
+            self.assertEqual(jobs.process_batch('worker'), 0)
+
+            ProcessingJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            jobs.process_batch('worker')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertEqual(self.history()['status'], 'failed')
+        self.assertEqual(jobs.retry_delay(3), timedelta(seconds=120))
+
+    def test_claim_is_exclusive_and_stale_jobs_reclaimed(self):
+        claimed = jobs.claim('a', limit=10)
+        self.assertEqual(len(claimed), len(jobs.JOB_HANDLERS))
+        self.assertEqual(jobs.claim('b', limit=10), [])
+        ProcessingJob.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(jobs.reclaim_stale(), len(claimed))
+        self.assertEqual(len(jobs.claim('b', limit=10)), len(claimed))
+
+    def test_claim_skips_jobs_taken_after_select(self):
+        taken = ProcessingJob.objects.order_by('run_after', 'id').first()
+        done = []
+
+        def other_worker(execute, sql, params, many, context):
+            # 대기 작업을 조회한 뒤 첫 UPDATE 직전에 다른 워커가 같은 작업을 먼저 가져감
+            if sql.startswith('UPDATE') and not done:
+                done.append(True)
+                ProcessingJob.objects.filter(pk=taken.pk).update(status='running', locked_by='b')
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(other_worker):
+            claimed = jobs.claim('a', limit=10)
+        self.assertEqual(len(claimed), len(jobs.JOB_HANDLERS) - 1)
+        self.assertNotIn(taken.pk, [job.pk for job in claimed])
+        taken.refresh_from_db()
+        self.assertEqual((taken.locked_by, taken.attempts), ('b', 0))
+
+    def test_pdf_page_count(self):
+        pdf = (b'%PDF-1.4\n1 0 obj << /Type /Pages /Kids [2 0 R 3 0 R] /Count 2 >> endobj\n'
+               b'2 0 obj << /Type /Page /Parent 1 0 R >> endobj\n3 0 obj << /Type/Page >> endobj\n%%EOF')
+        self.assertEqual(extract.page_count(BytesIO(pdf), 'a.pdf'), {'page_count': 2, 'unit': 'page'})
+        self.assertIsNone(extract.page_count(BytesIO(b'plain'), 'a.txt'))
+
+    def test_extract_input_is_capped(self):
+        xlsx = make_ooxml({'xl/workbook.xml': '<workbook><sheets>' + '<sheet/>' * 100 + '</sheets></workbook>'})
+        with self.assertRaises(extract.ExtractLimitError):
+            extract.page_count(BytesIO(xlsx), 'a.xlsx', max_bytes=100)
+        self.assertEqual(extract.page_count(BytesIO(xlsx), 'a.xlsx')['page_count'], 100)
+        with self.assertRaises(extract.ExtractLimitError):
+            extract.thumbnail(BytesIO(make_pptx()), 'a.pptx', max_bytes=1)
+
+        # 작게 압축되지만 풀면 큰 스트림(압축 폭탄)은 max_bytes까지만 풂
+        bomb = zlib.compress(b'/Type /Page ' * 10000)
+        pdf = b'%PDF-1.5\n1 0 obj << /Filter /FlateDecode >>\nstream\n' + bomb + b'\nendstream\nendobj'
+        self.assertLess(len(pdf), 10000)
+        with self.assertRaises(extract.ExtractLimitError):
+            extract.page_count(BytesIO(pdf), 'a.pdf', max_bytes=10000)
+        self.assertEqual(extract.page_count(BytesIO(pdf), 'a.pdf')['page_count'], 10000)
+        with self.assertRaises(extract.ExtractLimitError):
+            extract.page_count(BytesIO(pdf), 'a.pdf', max_bytes=len(pdf) - 1)
+
+    def test_permanent_error_fails_without_retry(self):
+        broken = Artifact.objects.create(
+            country=self.kr, product=self.product, category=self.category, version_string='2.0',
+            uploader=self.user, file=ContentFile(b'not a zip', name='Sparrow_Brochure_v2.0.pptx'),
+        )
+        with self.assertLogs('artifacts.jobs', 'WARNING'):
+            jobs.process_batch('worker', limit=100)
+        job = ProcessingJob.objects.get(artifact=broken, kind='page_count')
+        self.assertEqual((job.status, job.attempts), ('failed', 1))
+        self.assertIn('zip', job.last_error)
+
+        # 처리 함수의 다른 오류(코드 오류 등)는 재시도
+        failing = mock.Mock(side_effect=KeyError('result'))
+        ProcessingJob.objects.filter(artifact=broken, kind='checksum').update(status='pending', run_after=timezone.now())
+        with mock.patch.dict(jobs.JOB_HANDLERS, {'checksum': failing}), self.assertLogs('artifacts.jobs', 'WARNING'):
+            jobs.process_batch('worker', limit=100)
+        self.assertEqual(ProcessingJob.objects.get(artifact=broken, kind='checksum').status, 'pending')
+        with self.assertRaises(extract.ExtractError):
+            extract.page_count(BytesIO(make_ooxml({'a.xml': '<a/>'})), 'a.xlsx')
+
+        with override_settings(EXTRACT_MAX_BYTES=5):
+            ProcessingJob.objects.filter(artifact=self.artifact, kind='thumbnail').update(
+                status='pending', attempts=0, run_after=timezone.now(),
+            )
+            with self.assertLogs('artifacts.jobs', 'WARNING'):
+                jobs.process_batch('worker', limit=100)
+        job = ProcessingJob.objects.get(artifact=self.artifact, kind='thumbnail')
+        self.assertEqual((job.status, job.attempts), ('failed', 1))
+
+
+def make_ooxml(parts):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, xml in parts.items():
+            archive.writestr(name, xml)
+    return buffer.getvalue()
+
+
+def make_docx(*paragraphs):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    return make_ooxml({'word/document.xml': f'<w:document xmlns:w="w"><w:body>{body}</w:body></w:document>'})
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, AUDIT_LOG_MODE='sync')
+class ContentSearchTests(TestCase):
+    """산출물 본문 추출과 FTS5 내용 검색 (업로드/삭제 시 색인 갱신, 필터, 강조 표시)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='pw')
+        cls.kr = Country.objects.create(code='KR', name='한국')
+        cls.us = Country.objects.create(code='US', name='미국')
+        cls.product = Product.objects.create(name='Sparrow', color_class='bg-red-500')
+        cls.category = Category.objects.create(name='Brochure')
+        cls.manual = Category.objects.create(name='Manual')
+
+    def setUp(self):
+        reference.invalidate()
+        self.client.force_login(self.user)
+
+    def upload(self, content, version, country=None, category=None, ext='docx'):
+        artifact = Artifact.objects.create(
+            country=country or self.kr, product=self.product, category=category or self.category,
+            version_string=version, uploader=self.user,
+            file=ContentFile(content, name=f'Sparrow_Brochure_v{version}.{ext}'),
+        )
+        jobs.process_batch('worker', limit=100)
+        return artifact
+
+    def search(self, **params):
+        response = self.client.get(reverse('artifacts:search'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_extract_text(self):
+        xlsx = make_ooxml({'xl/sharedStrings.xml': '<sst xmlns="s"><si><t>매출</t></si><si><r><t>합계</t></r></si></sst>'})
+        self.assertEqual(extract.extract_text(BytesIO(xlsx), 'a.xlsx'), '매출\n합계')
+        self.assertEqual(extract.extract_text(BytesIO(make_docx('첫 단락', 'A &amp; B')), 'a.docx'), '첫 단락\nA & B')
+        content = b'BT (Hello \\(PDF\\)) Tj [(Wor) -20 (ld)] TJ ET'
+        pdf = b'%PDF-1.4\n1 0 obj << /Filter /FlateDecode >>\nstream\n' + zlib.compress(content) + b'\nendstream\nendobj'
+        self.assertEqual(extract.extract_text(BytesIO(pdf), 'a.pdf'), 'Hello (PDF)\nWorld')
+        self.assertEqual(extract.extract_text(BytesIO(b'x'), 'a.txt'), '')
+
+    def test_extract_text_input_is_capped(self):
+        # 슬라이드 하나하나는 작아도 합이 max_bytes를 넘으면 거부
+        pptx = make_pptx(slides=20)
+        with self.assertRaises(extract.ExtractLimitError):
+            extract.extract_text(BytesIO(pptx), 'a.pptx', max_bytes=1000)
+        self.assertIn('슬라이드 20', extract.extract_text(BytesIO(pptx), 'a.pptx'))
+
+        content = b'BT (bomb) Tj ET ' * 10000
+        pdf = b'%PDF-1.5\n1 0 obj << /Filter /FlateDecode >>\nstream\n' + zlib.compress(content) + b'\nendstream\nendobj'
+        with self.assertRaises(extract.ExtractLimitError):
+            extract.extract_text(BytesIO(pdf), 'a.pdf', max_bytes=len(content) - 1)
+        with self.assertRaises(extract.ExtractLimitError):
+            extract.extract_text(BytesIO(pdf), 'a.pdf', max_bytes=len(pdf) - 1)
+
+        with override_settings(EXTRACT_MAX_BYTES=100), self.assertLogs('artifacts.jobs', 'WARNING'):
+            artifact = self.upload(make_docx('긴 본문 ' * 100), '1.0')
+        job = ProcessingJob.objects.get(artifact=artifact, kind='text')
+        self.assertEqual((job.status, job.attempts), ('failed', 1))
+        self.assertFalse(ArtifactText.objects.filter(artifact=artifact).exists())
+
+    def test_search_ranked_with_snippets_and_filters(self):
+        first = self.upload(make_docx('정적 분석 도구 소개', '보안 취약점을 찾아 &lt;script&gt; 보고합니다'), '1.0')
+        second = self.upload(make_docx('취약점 취약점 취약점 목록'), '1.0', category=self.manual)
+        self.upload(make_docx('취약점 안내'), '1.0', country=self.us)
+
+        results = self.search(q='취약', country='KR')
+        self.assertEqual([result['id'] for result in results], [second.id, first.id])
+        snippet = next(result['snippet'] for result in results if result['id'] == first.id)
+        self.assertIn('<mark>취약점을</mark>', snippet)
+        self.assertIn('&lt;script&gt;', snippet)
+
+        self.assertEqual([r['id'] for r in self.search(q='취약', country='KR', category=self.category.id)], [first.id])
+        self.assertEqual([r['id'] for r in self.search(q='정적 보안', country='KR')], [first.id])
+        self.assertEqual(self.search(q='정적 목록', country='KR'), [])
+        # 파일명으로도 검색
+        self.assertEqual(len(self.search(q='Sparrow_Brochure', country='KR')), 2)
+        self.assertEqual(self.search(q='"*(', country='KR'), [])
+
+        second.delete()
+        self.assertEqual([r['id'] for r in self.search(q='취약', country='KR')], [first.id])
+        self.assertFalse(ArtifactText.objects.filter(artifact_id=second.id).exists())
+
+    def test_search_without_fts_index(self):
+        artifact = self.upload(make_docx('보안 취약점 보고'), '1.0')
+        with mock.patch.object(search, 'fts_available', return_value=False):
+            results = self.search(q='취약', country='KR')
+        self.assertEqual([result['id'] for result in results], [artifact.id])
+        self.assertIn('<mark>취약</mark>', results[0]['snippet'])
@@ -0,0 +1,409 @@
+"""
+산출물 업로드 검증과 분할(재개 가능) 업로드
+
+대용량 파일은 한 번의 multipart POST 대신 세션 단위로 나누어 받습니다.
+1. POST upload-sessions/<product>/<category>/ : 파일명 양식, 해당 없음 셀, 중복 버전을 바이트 전송 전에 검사하고 세션 생성
+   (같은 사용자/셀/버전/파일명/크기의 진행 중인 세션이 있으면 그 세션을 이어서 사용)
+2. PUT  upload-sessions/<token>/ (Content-Range: bytes 시작-끝/전체) : 요청 본문을 스테이징 파일에 바로 이어 씀
+3. GET  upload-sessions/<token>/ : 지금까지 받은 바이트 수 (연결이 끊기면 이 위치부터 다시 전송)
+4. POST upload-sessions/<token>/finalize/ : 스테이징 파일을 저장소로 옮기고 Artifact와 업로드 로그를 한 트랜잭션으로 생성
+
+스테이징 파일은 MEDIA_ROOT/UPLOAD_STAGING_DIR/<token>.part 이며, 세션마다 청크는 순서대로 하나씩 보냅니다.
+
+한 번의 multipart POST(upload/<product>/<category>/)는 UploadPreflightHandler가 본문 앞부분의
+폼 필드와 파일 파트 헤더만 보고 먼저 검사하므로, 거부될 업로드의 파일 내용은 받지 않습니다.
+"""
+from django.conf import settings
+from django.core.files import File
+from django.core.files.uploadhandler import FileUploadHandler
+from django.db import transaction
+from django.http import HttpRequest, QueryDict
+from django.http.multipartparser import MultiPartParser
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils import timezone
+from django.utils.datastructures import MultiValueDict
+from django.utils.http import parse_header_parameters
+from datetime import timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+from .models import Artifact, ArtifactActivityLog, UploadSession
+import os
+import re
+import shutil
+
+
+class UploadError(Exception):
+    """업로드 거부 (message는 사용자에게 그대로 표시)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+def chunk_size():
+    return getattr(settings, 'UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)
+
+
+def staging_dir():
+    return Path(settings.MEDIA_ROOT) / getattr(settings, 'UPLOAD_STAGING_DIR', 'upload_staging')
+
+
+def staging_path(session):
+    return staging_dir() / f'{session.token}.part'
+
+
+def finalize_backup_path(session):
+    """finalize_session 중 스테이징 파일을 보존하는 하드 링크(또는 사본) 경로"""
+    return staging_dir() / f'{session.token}.finalizing'
+
+
+def expected_filename_prefix(product, category, country, version_string):
+    """
+    파일명 양식: 제품명_카테고리명_v버전.확장자
+    US의 경우: EN_제품명_카테고리명_v버전.확장자
+    """
+    if country and country.code == 'US':
+        return f"EN_{product.name}_{category.name}_v{version_string}"
+    return f"{product.name}_{category.name}_v{version_string}"
+
+
+def validate_upload(ref, product, category, country, version_string, filename):
+    """
+    업로드 가능 여부 검사 (파일 내용은 보지 않음)
+
+    ref: reference.current() 스냅샷. 거부 사유가 있으면 UploadError
+    """
+    if ref.is_disabled(country, product.id, category.id):
+        raise UploadError('이 셀은 해당 없음으로 설정되어 업로드가 불가능합니다.', status=403)
+
+    if not version_string or not filename:
+        raise UploadError('버전과 파일을 모두 입력해주세요.')
+
+    # Note: 파일명에서 공백은 언더스코어(_)로 대체 가능
+    filename_without_ext = filename.rsplit('.', 1)[0] if '.' in filename else filename
+    expected_prefix = expected_filename_prefix(product, category, country, version_string)
+    if filename_without_ext.replace(' ', '_') != expected_prefix.replace(' ', '_'):
+        raise UploadError(
+            f'파일명 양식이 올바르지 않습니다.\n\n'
+            f'올바른 형식: {expected_prefix.replace(" ", "_")}.확장자\n'
+            f'현재 파일명: {filename}'
+        )
+
+    if Artifact.objects.filter(
+        country=country,
+        product=product,
+        category=category,
+        version_string=version_string
+    ).exists():
+        raise UploadError(f'버전 {version_string}이(가) 이미 존재합니다. 다른 버전을 입력해주세요.')
+
+
+def preflight_bytes():
+    return getattr(settings, 'UPLOAD_PREFLIGHT_BYTES', 64 * 1024)
+
+
+def leading_parts(head, boundary, encoding):
+    """
+    multipart 본문 앞부분에서 첫 파일 파트 앞의 폼 필드와 그 파일 파트의 파일명 읽기
+
+    반환값: ([(이름, 값), ...], 파일명). 파일 파트 헤더를 아직 다 받지 못했으면 파일명은 None
+    """
+    fields = []
+    parts = head.split(b'--' + boundary)
+    for index, part in enumerate(parts[1:], start=1):
+        header_end = part.find(b'\r\n\r\n')
+        if header_end < 0:
+            break
+        disposition = ''
+        for line in part[:header_end].decode(encoding, 'replace').split('\r\n'):
+            name, _, value = line.partition(':')
+            if name.strip().lower() == 'content-disposition':
+                disposition = value.strip()
+        _, params = parse_header_parameters(disposition)
+        if 'filename' in params:
+            return fields, params['filename']
+        # 다음 구분자까지 받은 필드만 사용 (마지막 조각은 값이 잘렸을 수 있음)
+        if index == len(parts) - 1 or 'name' not in params:
+            break
+        value = part[header_end + 4:]
+        if value.endswith(b'\r\n'):
+            value = value[:-2]
+        fields.append((params['name'], value.decode(encoding, 'replace')))
+    return fields, None
+
+
+class PrefixedStream:
+    """이미 읽은 본문 앞부분 + 나머지 본문"""
+
+    def __init__(self, head, stream):
+        self._head = head
+        self._stream = stream
+
+    def read(self, size=-1):
+        if not self._head:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._head = self._head + self._stream.read(), b''
+        else:
+            data, self._head = self._head[:size], self._head[size:]
+        return data
+
+
+def csrf_passes(request, fields, encoding):
+    """
+    본문 파싱 중 CSRF 검사 (request.POST를 읽지 않음)
+
+    같은 헤더/쿠키/세션과 본문 앞부분에서 읽은 폼 필드만 가진 요청으로 CsrfViewMiddleware 검사를 실행합니다.
+    """
+    check = HttpRequest()
+    check.method = request.method
+    check.path = request.path
+    check.META = request.META
+    check.COOKIES = request.COOKIES
+    if hasattr(request, 'session'):
+        check.session = request.session
+    # 테스트 클라이언트의 CSRF 검사 생략 표시 (csrf_protect와 같은 결과가 되도록)
+    check._dont_enforce_csrf_checks = getattr(request, '_dont_enforce_csrf_checks', False)
+    check.POST = QueryDict(urlencode(fields), encoding=encoding)
+    return CsrfViewMiddleware(lambda r: None).process_view(check, None, (), {}) is None
+
+
+class UploadPreflightHandler(FileUploadHandler):
+    """
+    파일 내용을 받기 전에 업로드 가능 여부 검사
+
+    본문 앞부분(UPLOAD_PREFLIGHT_BYTES 이내)에서 파일 파트 앞의 폼 필드(country, version_string)와
+    파일 파트 헤더의 파일명을 읽어 validate_upload로 검사합니다.
+    검사(DB 조회)는 CSRF 토큰(X-CSRFToken 헤더 또는 앞부분의 csrfmiddlewaretoken)이 확인된 경우에만 하며,
+    확인되지 않으면 검사 없이 그대로 파싱하고 뷰의 csrf_protect가 403으로 거부합니다.
+    - 거부: 나머지 본문은 읽지 않고(StopUpload(connection_reset=True)와 같은 처리) error에 사유를 남김.
+      request.POST에는 앞에서 읽은 폼 필드(csrfmiddlewaretoken 포함)만 들어감
+    - 통과 또는 판단 불가(version_string이 파일 뒤에 옴 등): 읽은 앞부분과 나머지 본문을
+      다음 업로드 핸들러(해시 계산, 임시 파일)로 그대로 파싱하고 뷰에서 다시 검사
+    request.POST/FILES에 접근하기 전에 request.upload_handlers 맨 앞에 추가해야 합니다.
+    """
+
+    def __init__(self, request, ref, product, category):
+        super().__init__(request)
+        self.ref = ref
+        self.product = product
+        self.category = category
+        self.error = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        encoding = encoding or settings.DEFAULT_CHARSET
+        limit = min(preflight_bytes(), content_length)
+        head, fields, filename = b'', [], None
+        while filename is None and len(head) < limit:
+            block = input_data.read(min(COPY_BLOCK_SIZE, limit - len(head)))
+            if not block:
+                break
+            head += block
+            fields, filename = leading_parts(head, boundary, encoding)
+
+        handlers = [handler for handler in self.request.upload_handlers if handler is not self]
+        parser = MultiPartParser(META, PrefixedStream(head, input_data), handlers, encoding)
+        values = dict(fields)
+        if filename is not None and 'version_string' in values and csrf_passes(self.request, fields, encoding):
+            try:
+                validate_upload(self.ref, self.product, self.category, self.ref.country(values.get('country')),
+                                values['version_string'], parser.sanitize_file_name(filename))
+            except UploadError as e:
+                self.error = e
+                return QueryDict(urlencode(fields), encoding=encoding), MultiValueDict()
+        return parser.parse()
+
+    def receive_data_chunk(self, raw_data, start):
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def start_session(user, ref, product, category, country, version_string, filename, size):
+    """검사를 통과하면 분할 업로드 세션 생성 (진행 중인 같은 업로드가 있으면 재사용)"""
+    filename = os.path.basename(filename or '')
+    validate_upload(ref, product, category, country, version_string, filename)
+    if size < 0:
+        raise UploadError('파일 크기가 올바르지 않습니다.')
+
+    session = UploadSession.objects.filter(
+        user=user, country=country, product=product, category=category,
+        version_string=version_string, filename=filename, size=size, status='uploading',
+    ).first()
+    if session is not None and staging_path(session).exists():
+        session.received = staging_path(session).stat().st_size
+        return session
+
+    session = UploadSession.objects.create(
+        user=user, country=country, product=product, category=category,
+        version_string=version_string, filename=filename, size=size,
+    )
+    staging_dir().mkdir(parents=True, exist_ok=True)
+    staging_path(session).touch()
+    return session
+
+
+def parse_content_range(header):
+    """'bytes 0-1023/5000' -> (0, 1023, 5000), 형식이 틀리면 None"""
+    match = CONTENT_RANGE.match(header or '')
+    if not match:
+        return None
+    start, end, total = (int(value) for value in match.groups())
+    if end < start or end >= total:
+        return None
+    return start, end, total
+
+
+def write_chunk(session, stream, content_range, content_length):
+    """
+    요청 본문(stream)을 스테이징 파일의 start 위치부터 기록
+
+    시작 위치가 지금까지 받은 크기와 다르면 409 (클라이언트는 GET으로 위치를 확인 후 재전송).
+    전송이 중간에 끊겨도 실제로 기록된 만큼 received에 반영합니다.
+    반환값: 받은 크기
+    """
+    parsed = parse_content_range(content_range)
+    if parsed is None:
+        raise UploadError('Content-Range 헤더가 올바르지 않습니다.')
+    start, end, total = parsed
+    length = end - start + 1
+    if total != session.size:
+        raise UploadError('전체 크기가 세션과 다릅니다.')
+    if content_length != length:
+        raise UploadError('Content-Length가 Content-Range와 다릅니다.')
+    if length > chunk_size():
+        raise UploadError(f'청크는 {chunk_size()} bytes 이하로 보내주세요.', status=413)
+
+    path = staging_path(session)
+    if not path.exists():
+        raise UploadError('업로드 세션이 만료되었습니다. 처음부터 다시 업로드해주세요.', status=410)
+    with open(path, 'r+b') as staging:
+        received = os.fstat(staging.fileno()).st_size
+        if start != received:
+            raise UploadError(f'{received} bytes 위치부터 보내주세요.', status=409)
+        staging.seek(start)
+        remaining = length
+        try:
+            while remaining:
+                block = stream.read(min(COPY_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                staging.write(block)
+                remaining -= len(block)
+        finally:
+            staging.flush()
+            received = staging.tell()
+            UploadSession.objects.filter(pk=session.pk).update(received=received, updated_at=timezone.now())
+            session.received = received
+    if remaining:
+        raise UploadError('청크 전송이 중간에 끊겼습니다.', status=400)
+    return received
+
+
+class StagedFile(File):
+    """스테이징 파일 - 저장소가 복사 대신 이동(file_move_safe)하도록 temporary_file_path 제공"""
+
+    def __init__(self, path, name):
+        super().__init__(open(path, 'rb'), name=name)
+        self._path = str(path)
+
+    def temporary_file_path(self):
+        return self._path
+
+
+def finalize_session(session, ref, ip_address, user_agent):
+    """
+    모든 바이트를 받은 세션으로 산출물 생성
+
+    중복 버전은 트랜잭션 안에서 다시 검사합니다 (세션 시작 후 다른 사용자가 올렸을 수 있음).
+    Artifact(Blob 참조 수 포함)와 ArtifactActivityLog는 함께 커밋됩니다.
+    저장소가 스테이징 파일을 Blob 경로로 옮긴 뒤 트랜잭션이 실패하면 스테이징 파일을 되살려
+    같은 세션으로 다시 완료할 수 있습니다.
+    """
+    if session.status != 'uploading':
+        raise UploadError('이미 완료된 업로드입니다.', status=409)
+    path = staging_path(session)
+    received = path.stat().st_size if path.exists() else -1
+    if received != session.size:
+        raise UploadError(f'아직 모든 바이트를 받지 않았습니다 ({max(received, 0)}/{session.size}).', status=409)
+
+    backup = finalize_backup_path(session)
+    backup.unlink(missing_ok=True)
+    try:
+        os.link(path, backup)
+    except OSError:
+        shutil.copyfile(path, backup)
+    staged = StagedFile(path, session.filename)
+    try:
+        with transaction.atomic():
+            validate_upload(ref, session.product, session.category, session.country,
+                            session.version_string, session.filename)
+            artifact = Artifact.objects.create(
+                country=session.country,
+                product=session.product,
+                category=session.category,
+                version_string=session.version_string,
+                file=staged,
+                uploader=session.user,
+            )
+            ArtifactActivityLog.objects.create(
+                artifact=artifact,
+                user=session.user,
+                username=session.user.username,
+                action='upload',
+                ip_address=ip_address,
+                user_agent=user_agent,
+                details={
+                    'country': session.country.code if session.country else None,
+                    'product': session.product.name,
+                    'category': session.category.name,
+                    'version': session.version_string,
+                    'filename': artifact.filename,
+                    'chunked': True,
+                    'size': session.size,
+                },
+            )
+            session.status = 'completed'
+            session.received = session.size
+            session.artifact = artifact
+            session.save(update_fields=['status', 'received', 'artifact', 'updated_at'])
+    except BaseException:
+        staged.close()
+        if not path.exists():
+            os.replace(backup, path)
+        raise
+    finally:
+        staged.close()
+        backup.unlink(missing_ok=True)
+    # 같은 내용의 Blob이 이미 있으면 스테이징 파일은 이동되지 않고 남아 있음
+    path.unlink(missing_ok=True)
+    return artifact
+
+
+def abort_session(session):
+    """진행 중인 세션과 스테이징 파일 삭제"""
+    staging_path(session).unlink(missing_ok=True)
+    session.delete()
+
+
+def prune_sessions(hours=None):
+    """
+    오래된 세션 정리: 마지막 수신 후 hours시간이 지난 진행 중 세션(스테이징 파일 포함)과 완료된 세션
+    반환값: 삭제한 세션 수
+    """
+    if hours is None:
+        hours = getattr(settings, 'UPLOAD_SESSION_EXPIRE_HOURS', 24)
+    cutoff = timezone.now() - timedelta(hours=hours)
+    stale = list(UploadSession.objects.filter(updated_at__lt=cutoff))
+    for session in stale:
+        staging_path(session).unlink(missing_ok=True)
+        finalize_backup_path(session).unlink(missing_ok=True)
+    UploadSession.objects.filter(pk__in=[session.pk for session in stale]).delete()
+    return len(stale)
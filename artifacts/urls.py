@@ -9,7 +9,11 @@ urlpatterns = [
     path('logout/', views.user_logout, name='logout'),
     path('change-password/', views.change_password, name='change_password'),
     path('history/<int:product_id>/<int:category_id>/', views.artifact_history, name='history'),
+    path('search/', views.artifact_search, name='search'),
     path('upload/<int:product_id>/<int:category_id>/', views.artifact_upload, name='upload'),
+    path('upload-sessions/<int:product_id>/<int:category_id>/', views.upload_session_create, name='upload_session_create'),
+    path('upload-sessions/<uuid:token>/', views.upload_session_detail, name='upload_session_detail'),
+    path('upload-sessions/<uuid:token>/finalize/', views.upload_session_finalize, name='upload_session_finalize'),
     path('download/<int:artifact_id>/', views.artifact_download, name='download'),
     path('download-product-bulk/<int:product_id>/', views.product_bulk_download, name='product_bulk_download'),
     path('delete/<int:artifact_id>/', views.artifact_delete, name='delete'),
@@ -37,4 +41,5 @@ urlpatterns = [
     # Download Logs URLs (Superuser only)
     path('manage/download-logs/', manage_views.download_logs_view, name='download_logs'),
     path('manage/api/download-logs/', manage_views.get_download_logs_api, name='get_download_logs_api'),
+    path('manage/api/download-analytics/', manage_views.get_download_analytics_api, name='get_download_analytics_api'),
 ]
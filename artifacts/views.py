@@ -1,14 +1,17 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse, FileResponse, HttpResponseForbidden
+from django.http import JsonResponse, FileResponse, StreamingHttpResponse, HttpResponseForbidden
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import never_cache, cache_control
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.db.models import Max
 from django.utils import timezone
-from .models import Country, Product, ProductVersion, Category, Artifact, ProductCategoryDisabled, LoginAttempt, ArtifactActivityLog, DownloadLog
+from .models import ProductVersion, Artifact, UploadSession, LoginAttempt, ArtifactActivityLog, DownloadLog
+from . import matrix, bulk_kits, downloads, audit, reference, uploads, jobs, search
 import json
 
 
@@ -42,25 +45,25 @@ def user_login(request):
             login(request, user)
             
             # 로그인 성공 기록
-            LoginAttempt.objects.create(
+            audit.record(LoginAttempt(
                 username=username,
                 user=user,
                 ip_address=ip_address,
                 user_agent=user_agent,
                 success=True
-            )
+            ))
             
             # 로그인 성공 시 항상 대시보드로 리다이렉트
             return redirect('artifacts:dashboard')
         else:
             # 로그인 실패 기록
-            LoginAttempt.objects.create(
+            audit.record(LoginAttempt(
                 username=username,
                 ip_address=ip_address,
                 user_agent=user_agent,
                 success=False,
                 failure_reason='잘못된 사용자명 또는 비밀번호'
-            )
+            ))
             
             return render(request, 'artifacts/login.html', {
                 'error': '아이디 또는 비밀번호가 올바르지 않습니다.'
@@ -102,16 +105,13 @@ def change_password(request):
 @cache_control(max_age=0, no_cache=True, no_store=True, must_revalidate=True)
 def dashboard(request):
     """메인 대시보드 - 매트릭스 그리드 뷰"""
+    ref = reference.current()
+    
     # 국가 목록 가져오기
-    countries = Country.objects.all()
+    countries = ref.countries
     
     # 선택된 국가 가져오기 (GET 파라미터 또는 한국 기본값)
-    country_code = request.GET.get('country')
-    if country_code:
-        selected_country = Country.objects.filter(code=country_code).first()
-    else:
-        # 기본값: 한국
-        selected_country = Country.objects.filter(code='KR').first()
+    selected_country = ref.country(request.GET.get('country'))
     
     # 부서 필터 가져오기
     selected_department = request.GET.get('department', '')
@@ -124,83 +124,15 @@ def dashboard(request):
         ('marketing', '마케팅'),
     ]
     
-    products = Product.objects.all()
-    
-    # 카테고리 필터링 (부서별)
-    if selected_department:
-        categories = Category.objects.filter(department=selected_department)
-    else:
-        categories = Category.objects.all()
-    
-    # Get version filters from GET params (format: version_1=1.0.0&version_2=1.1.0)
-    version_filters = {}
-    for product in products:
-        version_param = request.GET.get(f'version_{product.id}')
-        if version_param:
-            version_filters[product.id] = version_param
-    
-    # Get all unique versions per product for this country
-    product_versions = {}
-    for product in products:
-        versions = Artifact.objects.filter(
-            country=selected_country,
-            product=product
-        ).values_list('version_string', flat=True).distinct().order_by('-version_string')
-        product_versions[product.id] = list(versions)
-    
-    # Get disabled cells for the selected country
-    disabled_cells = ProductCategoryDisabled.objects.filter(
-        country=selected_country
-    ).select_related('product', 'category')
-    disabled_set = {(dc.product.id, dc.category.id) for dc in disabled_cells}
-    
-    # 매트릭스 데이터 구성
-    matrix_data = []
-    for category in categories:
-        row_data = {
-            'category': category,
-            'cells': []
-        }
-        
-        for product in products:
-            # Check if there's a version filter for this product
-            version_filter = version_filters.get(product.id)
-            
-            # 해당 국가/제품/카테고리의 최신 산출물 가져오기
-            query = Artifact.objects.filter(
-                country=selected_country,
-                product=product,
-                category=category
-            )
-            
-            # Apply version filter if specified
-            if version_filter:
-                query = query.filter(version_string=version_filter)
-            
-            latest_artifact = query.order_by('-version_string').first()
-            
-            # Check if this cell is disabled
-            is_disabled = (product.id, category.id) in disabled_set
-            
-            row_data['cells'].append({
-                'product': product,
-                'artifact': latest_artifact,
-                'is_disabled': is_disabled,
-            })
-        
-        matrix_data.append(row_data)
+    # 매트릭스 데이터 구성 (국가/부서/버전 필터 단위로 캐시됨)
+    matrix_context = matrix.dashboard_matrix(selected_country, selected_department, request.GET)
     
     context = {
         'countries': countries,
         'selected_country': selected_country,
-        'products': products,
-        'categories': categories,
-        'matrix_data': matrix_data,
-        'product_versions': product_versions,
-        'version_filters': version_filters,
         'departments': departments,
         'selected_department': selected_department,
-        'disabled_set': disabled_set,
+        **matrix_context,
     }
     
     return render(request, 'artifacts/index.html', context)
@@ -209,21 +141,20 @@ def dashboard(request):
 @cache_control(max_age=0, no_cache=True, no_store=True, must_revalidate=True)
 def artifact_history(request, product_id, category_id):
     """특정 제품/카테고리의 산출물 히스토리 조회 (AJAX)"""
-    product = get_object_or_404(Product, id=product_id)
-    category = get_object_or_404(Category, id=category_id)
+    product = reference.get_product_or_404(product_id)
+    category = reference.get_category_or_404(category_id)
     
     # 국가 파라미터 가져오기 (기본값: 한국)
-    country_code = request.GET.get('country')
-    if country_code:
-        country = Country.objects.filter(code=country_code).first()
-    else:
-        country = Country.objects.filter(code='KR').first()
+    country = reference.current().country(request.GET.get('country'))
     
     artifacts = Artifact.objects.filter(
         country=country,
         product=product,
         category=category
-    ).select_related('uploader').order_by('-version_string')
+    ).select_related('uploader').order_by('-version_key')
+    
+    # 업로드 후 처리 상태 (처리 중/실패, 페이지 수, 썸네일)
+    processing = jobs.processing_status([artifact.id for artifact in artifacts])
     
     history_data = [{
         'id': artifact.id,
@@ -233,6 +164,7 @@ def artifact_history(request, product_id, category_id):
         'version': artifact.version_string,
         'filename': artifact.filename,
         'download_url': artifact.file.url if artifact.file else None,
+        'processing': processing[artifact.id],
     } for artifact in artifacts]
     
     return JsonResponse({
@@ -245,74 +177,93 @@ def artifact_history(request, product_id, category_id):
     })
 
 
+@login_required
+@cache_control(max_age=0, no_cache=True, no_store=True, must_revalidate=True)
+def artifact_search(request):
+    """
+    산출물 내용 검색 (AJAX)
+
+    q: 검색어, country/product/category: 필터 (국가 코드, 제품 id, 카테고리 id)
+    """
+    ref = reference.current()
+    country = None
+    if request.GET.get('country'):
+        country = ref.country(request.GET['country'])
+        if country is None:
+            return JsonResponse({'results': []})
+    try:
+        product_id = int(request.GET['product']) if request.GET.get('product') else None
+        category_id = int(request.GET['category']) if request.GET.get('category') else None
+    except ValueError:
+        return JsonResponse({'error': '제품/카테고리 id가 올바르지 않습니다.'}, status=400)
+    
+    hits = search.search_artifacts(
+        request.GET.get('q', ''), country, product_id, category_id,
+        limit=getattr(settings, 'SEARCH_RESULTS_LIMIT', 20),
+    )
+    artifacts = Artifact.objects.in_bulk([artifact_id for artifact_id, _ in hits])
+    
+    results = []
+    for artifact_id, snippet in hits:
+        artifact = artifacts.get(artifact_id)
+        if artifact is None:
+            continue
+        product = ref.products_by_id.get(artifact.product_id)
+        category = ref.categories_by_id.get(artifact.category_id)
+        artifact_country = ref.countries_by_id.get(artifact.country_id)
+        results.append({
+            'id': artifact.id,
+            'filename': artifact.filename,
+            'version': artifact.version_string,
+            'country': artifact_country.code if artifact_country else None,
+            'product_id': artifact.product_id,
+            'product': product.name if product else None,
+            'category_id': artifact.category_id,
+            'category': category.name if category else None,
+            'snippet': snippet,
+        })
+    return JsonResponse({'results': results})
+
+
 @login_required
 @require_http_methods(["POST"])
+@csrf_exempt
 def artifact_upload(request, product_id, category_id):
-    """산출물 업로드"""
-    product = get_object_or_404(Product, id=product_id)
-    category = get_object_or_404(Category, id=category_id)
-    
+    """
+    산출물 업로드
+
+    CSRF 검사가 request.POST를 읽기 전에 업로드 핸들러를 추가해야 하므로
+    CSRF 미들웨어는 건너뛰고 _artifact_upload에서 검사합니다.
+    본문 파싱 중 사전 검사(파일명 양식, 중복 버전 조회)는 UploadPreflightHandler가 CSRF 토큰을 먼저
+    확인한 경우에만 실행하므로, 토큰 없는 요청은 DB를 조회하지 않고 403만 반환합니다.
+    """
+    ref = reference.current()
+    product = reference.get_product_or_404(product_id)
+    category = reference.get_category_or_404(category_id)
+    
+    # 파일 내용을 받기 전에 본문 앞부분의 폼 필드와 파일명으로 먼저 검사
+    preflight = uploads.UploadPreflightHandler(request, ref, product, category)
+    request.upload_handlers.insert(0, preflight)
+    return _artifact_upload(request, ref, product, category, preflight)
+
+
+@csrf_protect
+def _artifact_upload(request, ref, product, category, preflight):
     # 국가 파라미터 가져오기 (기본값: 한국)
-    country_code = request.POST.get('country')
-    if country_code:
-        country = Country.objects.filter(code=country_code).first()
-    else:
-        country = Country.objects.filter(code='KR').first()
-    
-    # Check if this cell is disabled for this specific country
-    is_disabled = ProductCategoryDisabled.objects.filter(
-        country=country,
-        product=product,
-        category=category
-    ).exists()
-    
-    if is_disabled:
-        return JsonResponse({'error': '이 셀은 해당 없음으로 설정되어 업로드가 불가능합니다.'}, status=403)
+    country = ref.country(request.POST.get('country'))
     
     version_string = request.POST.get('version_string')
     file = request.FILES.get('file')
     
-    if not version_string or not file:
-        return JsonResponse({'error': '버전과 파일을 모두 입력해주세요.'}, status=400)
-    
-    # Validate filename format: 제품명_카테고리명_버전명.확장자
-    # US의 경우: EN_제품명_카테고리명_버전명.확장자
-    # Note: 파일명에서 공백은 언더스코어(_)로 대체 가능
-    filename = file.name
-    filename_without_ext = filename.rsplit('.', 1)[0] if '.' in filename else filename
+    # 본문 파싱 중 거부된 경우 파일은 받지 않았음
+    if preflight.error is not None:
+        return JsonResponse({'error': preflight.error.message}, status=preflight.error.status)
     
-    # Expected format based on country
-    if country and country.code == 'US':
-        # US format: EN_ProductName_CategoryName_vX.Y.Z
-        expected_prefix = f"EN_{product.name}_{category.name}_v{version_string}"
-    else:
-        # Default (KR) format: ProductName_CategoryName_vX.Y.Z
-        expected_prefix = f"{product.name}_{category.name}_v{version_string}"
-    
-    # Normalize both filenames: replace spaces with underscores for comparison
-    # This allows users to use either spaces or underscores in filenames
-    normalized_expected = expected_prefix.replace(' ', '_')
-    normalized_actual = filename_without_ext.replace(' ', '_')
-    
-    if normalized_actual != normalized_expected:
-        return JsonResponse({
-            'error': f'파일명 양식이 올바르지 않습니다.\n\n'
-                    f'올바른 형식: {expected_prefix.replace(" ", "_")}.확장자\n'
-                    f'현재 파일명: {filename}'
-        }, status=400)
-    
-    # Check for duplicate version
-    existing = Artifact.objects.filter(
-        country=country,
-        product=product,
-        category=category,
-        version_string=version_string
-    ).first()
-    
-    if existing:
-        return JsonResponse({
-            'error': f'버전 {version_string}이(가) 이미 존재합니다. 다른 버전을 입력해주세요.'
-        }, status=400)
+    # 해당 없음 셀, 파일명 양식(제품명_카테고리명_v버전.확장자), 중복 버전 검사
+    try:
+        uploads.validate_upload(ref, product, category, country, version_string, file.name if file else None)
+    except uploads.UploadError as e:
+        return JsonResponse({'error': e.message}, status=e.status)
     
     artifact = Artifact.objects.create(
         country=country,
@@ -322,12 +273,14 @@ def artifact_upload(request, product_id, category_id):
         file=file,
         uploader=request.user
     )
+    matrix.invalidate_matrix_cache()
+    bulk_kits.invalidate_kits(product, country)
     
     # Log upload activity
     ip_address = get_client_ip(request)
     user_agent = get_user_agent(request)
     
-    ArtifactActivityLog.objects.create(
+    audit.record(ArtifactActivityLog(
         artifact=artifact,
         user=request.user,
         username=request.user.username,
@@ -341,7 +294,7 @@ def artifact_upload(request, product_id, category_id):
             'version': version_string,
             'filename': artifact.filename
         }
-    )
+    ))
     
     return JsonResponse({
         'success': True,
@@ -356,43 +309,82 @@ def artifact_upload(request, product_id, category_id):
 
 def artifact_download(request, artifact_id):
     """산출물 다운로드"""
-    from urllib.parse import quote
-    
-    artifact = get_object_or_404(Artifact, id=artifact_id)
+    artifact = get_object_or_404(
+        Artifact.objects.select_related('product', 'category', 'country'), id=artifact_id
+    )
     
     if not artifact.file:
         return JsonResponse({'error': '파일이 존재하지 않습니다.'}, status=404)
     
-    # Log the download
-    DownloadLog.objects.create(
-        user=request.user if request.user.is_authenticated else None,
-        download_type='single',
-        artifact=artifact,
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request)
-    )
+    # 파일 본문 전송은 DOWNLOAD_BACKEND에 따라 웹 서버(X-Accel-Redirect/X-Sendfile)에 위임
+    # 조건부 요청은 304, Range 요청은 206으로 응답
+    response = downloads.artifact_file_response(artifact, request)
+    
+    # Log the download (부분 전송/캐시 확인은 별도 유형으로 구분)
+    download_type = downloads.download_log_type(request, response)
+    if download_type:
+        details = None
+        if download_type == 'partial':
+            details = {'range': request.META.get('HTTP_RANGE', '')[:200]}
+        audit.record(DownloadLog(
+            user=request.user if request.user.is_authenticated else None,
+            username=request.user.username if request.user.is_authenticated else '',
+            download_type=download_type,
+            artifact=artifact,
+            snapshot=artifact.snapshot(),
+            ip_address=get_client_ip(request),
+            user_agent=get_user_agent(request),
+            details=details
+        ))
     
-    response = FileResponse(artifact.file.open('rb'))
-    # Support Korean filenames using RFC 5987
-    encoded_filename = quote(artifact.filename)
-    response['Content-Disposition'] = f"attachment; filename*=UTF-8''{encoded_filename}"
     return response
 
 
+class _BulkDownloadLog:
+    """
+    ZIP 스트림을 감싸 전송이 끝나거나 응답이 닫힐 때 일괄 다운로드 로그를 한 번 기록
+
+    항목별 압축 통계(stats)는 스트림 생성이 끝나야 확정되므로 전송 후에 기록합니다.
+    HEAD 요청이나 전송 시작 전에 끊긴 연결도 응답을 닫을 때(close) completed=False로 기록합니다.
+    """
+
+    def __init__(self, chunks, log_fields, stats, kit_cache):
+        self.chunks = chunks
+        self.log_fields = log_fields
+        self.stats = stats
+        self.kit_cache = kit_cache
+        self.completed = False
+        self.recorded = False
+
+    def __iter__(self):
+        try:
+            yield from self.chunks
+            self.completed = True
+        finally:
+            self.close()
+
+    def close(self):
+        if self.recorded:
+            return
+        self.recorded = True
+        try:
+            if hasattr(self.chunks, 'close'):
+                self.chunks.close()
+        finally:
+            audit.record(DownloadLog(
+                **self.log_fields,
+                details={'kit_cache': self.kit_cache, 'completed': self.completed, **self.stats}
+            ))
+
+
 def product_bulk_download(request, product_id):
-    """제품별 산출물 일괄 다운로드 (ZIP)"""
-    import zipfile
-    import io
+    """제품별 산출물 일괄 다운로드 (ZIP 스트리밍)"""
     from django.utils.text import slugify
     
-    product = get_object_or_404(Product, id=product_id)
+    product = reference.get_product_or_404(product_id)
     
     # Get country parameter
-    country_code = request.GET.get('country')
-    if country_code:
-        country = Country.objects.filter(code=country_code).first()
-    else:
-        country = Country.objects.filter(code='KR').first()
+    country = reference.current().country(request.GET.get('country'))
     
     # Get version filter if provided
     version_filter = request.GET.get('version')
@@ -408,55 +400,148 @@ def product_bulk_download(request, product_id):
         query = query.filter(version_string=version_filter)
     
     # Get all artifacts for this product and country
-    artifacts = query.select_related('category').order_by('category__display_order')
+    artifacts = list(query.select_related('category').order_by('category__display_order', '-version_key'))
     
-    if not artifacts.exists():
+    if not artifacts:
         return JsonResponse({'error': '다운로드할 자료가 없습니다.'}, status=404)
     
-    # Count artifacts for logging
-    artifact_count = artifacts.count()
-    
-    # Create ZIP file in memory
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for artifact in artifacts:
-            if artifact.file:
-                try:
-                    # Create folder structure: category_name/filename
-                    folder_name = slugify(artifact.category.name)
-                    file_name = artifact.filename
-                    archive_name = f"{folder_name}/{file_name}"
-                    
-                    # Add file to ZIP
-                    with artifact.file.open('rb') as f:
-                        zip_file.writestr(archive_name, f.read())
-                except Exception as e:
-                    # Skip files that can't be read
-                    continue
-    
-    # Log the bulk download
-    DownloadLog.objects.create(
-        user=request.user if request.user.is_authenticated else None,
-        download_type='bulk',
-        product=product,
-        country=country,
-        artifact_count=artifact_count,
-        ip_address=get_client_ip(request),
-        user_agent=get_user_agent(request)
-    )
+    log_fields = {
+        'user': request.user if request.user.is_authenticated else None,
+        'username': request.user.username if request.user.is_authenticated else '',
+        'download_type': 'bulk',
+        'product': product,
+        'country': country,
+        'artifact_count': len(artifacts),
+        'snapshot': {'product': product.name, 'country': country.code if country else None},
+        'ip_address': get_client_ip(request),
+        'user_agent': get_user_agent(request),
+    }
     
     # Prepare response
-    zip_buffer.seek(0)
     country_name = country.code if country else 'Global'
     filename = f"{slugify(product.name)}_{country_name}_saleskit.zip"
     
-    response = FileResponse(zip_buffer, content_type='application/zip')
+    stats = bulk_kits.new_kit_stats()
+    if bulk_kits.kit_cache_enabled():
+        # 구성 파일이 같은 킷이 이미 만들어져 있으면 파일 그대로 전송
+        kit_path = bulk_kits.kit_path(product, country, artifacts)
+        kit_file = bulk_kits.open_cached_kit(kit_path)
+        if kit_file:
+            # Log the bulk download (압축 통계는 킷 생성 당시 값)
+            audit.record(DownloadLog(
+                **log_fields,
+                details={'kit_cache': 'hit', **bulk_kits.cached_kit_stats(kit_path)}
+            ))
+            response = FileResponse(kit_file, content_type='application/zip')
+        else:
+            response = StreamingHttpResponse(
+                _BulkDownloadLog(
+                    bulk_kits.iter_kit_zip_and_store(artifacts, kit_path, stats),
+                    log_fields, stats, kit_cache='miss'
+                ),
+                content_type='application/zip'
+            )
+    else:
+        response = StreamingHttpResponse(
+            _BulkDownloadLog(
+                bulk_kits.iter_kit_zip(artifacts, stats), log_fields, stats, kit_cache='off'
+            ),
+            content_type='application/zip'
+        )
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     
     return response
 
 
+def _upload_session_data(session):
+    return {
+        'token': str(session.token),
+        'offset': session.received,
+        'size': session.size,
+        'chunk_size': uploads.chunk_size(),
+        'status': session.status,
+    }
+
+
+@login_required
+@require_http_methods(["POST"])
+def upload_session_create(request, product_id, category_id):
+    """분할 업로드 시작 - 파일 전송 전에 업로드 가능 여부 검사"""
+    ref = reference.current()
+    product = reference.get_product_or_404(product_id)
+    category = reference.get_category_or_404(category_id)
+    country = ref.country(request.POST.get('country'))
+    
+    try:
+        size = int(request.POST.get('size', ''))
+    except ValueError:
+        return JsonResponse({'error': '파일 크기가 올바르지 않습니다.'}, status=400)
+    
+    try:
+        session = uploads.start_session(
+            request.user, ref, product, category, country,
+            request.POST.get('version_string'), request.POST.get('filename'), size,
+        )
+    except uploads.UploadError as e:
+        return JsonResponse({'error': e.message}, status=e.status)
+    
+    return JsonResponse({'success': True, **_upload_session_data(session)})
+
+
+@login_required
+@require_http_methods(["GET", "PUT", "DELETE"])
+def upload_session_detail(request, token):
+    """분할 업로드 상태 조회(GET), 청크 전송(PUT), 취소(DELETE)"""
+    session = get_object_or_404(UploadSession, token=token, user=request.user)
+    
+    if request.method == 'GET':
+        return JsonResponse({'success': True, **_upload_session_data(session)})
+    
+    if session.status != 'uploading':
+        return JsonResponse({'error': '이미 완료된 업로드입니다.'}, status=409)
+    
+    if request.method == 'DELETE':
+        uploads.abort_session(session)
+        return JsonResponse({'success': True})
+    
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        uploads.write_chunk(session, request, request.META.get('HTTP_CONTENT_RANGE'), content_length)
+    except uploads.UploadError as e:
+        return JsonResponse({'error': e.message, **_upload_session_data(session)}, status=e.status)
+    
+    return JsonResponse({'success': True, **_upload_session_data(session)})
+
+
+@login_required
+@require_http_methods(["POST"])
+def upload_session_finalize(request, token):
+    """분할 업로드 완료 - 산출물과 업로드 로그 생성"""
+    session = get_object_or_404(
+        UploadSession.objects.select_related('product', 'category', 'country'),
+        token=token, user=request.user
+    )
+    
+    try:
+        artifact = uploads.finalize_session(
+            session, reference.current(), get_client_ip(request), get_user_agent(request)
+        )
+    except uploads.UploadError as e:
+        return JsonResponse({'error': e.message}, status=e.status)
+    matrix.invalidate_matrix_cache()
+    bulk_kits.invalidate_kits(session.product, session.country)
+    
+    return JsonResponse({
+        'success': True,
+        'message': '파일이 업로드되었습니다.',
+        'artifact': {
+            'id': artifact.id,
+            'version': artifact.version_string,
+            'filename': artifact.filename
+        }
+    })
+
+
 @login_required
 @require_http_methods(["POST"])
 def artifact_delete(request, artifact_id):
@@ -469,12 +554,7 @@ def artifact_delete(request, artifact_id):
     
     # Save artifact info before deletion for logging
     artifact_snapshot = {
-        'id': artifact.id,
-        'filename': artifact.filename,
-        'country': artifact.country.code if artifact.country else None,
-        'product': artifact.product.name,
-        'category': artifact.category.name,
-        'version': artifact.version_string,
+        **artifact.snapshot(),
         'uploader': artifact.uploader.username if artifact.uploader else None
     }
     
@@ -483,10 +563,14 @@ def artifact_delete(request, artifact_id):
     user_agent = get_user_agent(request)
     
     # Delete the artifact
+    # 버퍼에 남은 이 산출물의 다운로드 로그를 먼저 기록해야 삭제 시 SET_NULL이 적용됨
+    audit.flush()
     artifact.delete()
+    matrix.invalidate_matrix_cache()
+    bulk_kits.invalidate_kits(artifact.product, artifact.country)
     
     # Log deletion activity (artifact is now None)
-    ArtifactActivityLog.objects.create(
+    audit.record(ArtifactActivityLog(
         artifact=None,  # File is deleted
         artifact_snapshot=artifact_snapshot,
         user=request.user,
@@ -495,7 +579,7 @@ def artifact_delete(request, artifact_id):
         ip_address=ip_address,
         user_agent=user_agent,
         details={'deleted_by_role': 'admin' if request.user.is_staff else 'uploader'}
-    )
+    ))
     
     return JsonResponse({
         'success': True,
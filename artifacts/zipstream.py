@@ -0,0 +1,300 @@
+"""
+스트리밍 ZIP 생성기
+
+아카이브 전체를 메모리에 만들지 않고, 파일을 고정 크기 블록 단위로 읽어
+압축한 결과를 바로 bytes 청크로 내보냅니다. 출력이 시크 불가능하다고 가정하므로
+각 항목의 CRC/크기는 데이터 뒤의 data descriptor에 기록합니다 (ZIP 사양 4.3.9).
+4GB를 넘는 항목과 아카이브는 ZIP64 레코드로 처리합니다.
+
+compress_file()로 다른 스레드에서 미리 압축해 둔 항목은
+write_compressed()로 크기/CRC를 헤더에 바로 기록해 그대로 복사합니다.
+"""
+import struct
+import tempfile
+import time
+import zlib
+from zipfile import ZIP_STORED, ZIP_DEFLATED
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP32_COUNT_LIMIT = 0xFFFF
+# 압축 불가능한 데이터는 deflate 후 약간 커질 수 있으므로 여유를 두고 ZIP64로 전환
+ZIP64_ENTRY_THRESHOLD = 0xF0000000
+# 미리 압축한 데이터를 메모리에 둘 최대 크기 (초과분은 임시 파일로)
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+FLAG_DATA_DESCRIPTOR = 0x08
+FLAG_UTF8 = 0x800
+
+LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+DATA_DESCRIPTOR = struct.Struct('<4sL2L')
+DATA_DESCRIPTOR64 = struct.Struct('<4sL2Q')
+CENTRAL_DIR = struct.Struct('<4s4B4HL2L5H2L')
+END_OF_CENTRAL_DIR = struct.Struct('<4s4H2LH')
+END_OF_CENTRAL_DIR64 = struct.Struct('<4sQ2H2L4Q')
+END_OF_CENTRAL_DIR64_LOCATOR = struct.Struct('<4sLQL')
+
+
+def dos_datetime(date_time):
+    """(년, 월, 일, 시, 분, 초) -> (DOS date, DOS time)"""
+    year, month, day, hour, minute, second = date_time[:6]
+    year = max(year, 1980)
+    return ((year - 1980) << 9 | month << 5 | day,
+            hour << 11 | minute << 5 | second // 2)
+
+
+class ZipEntry:
+    """중앙 디렉터리 작성을 위한 항목 정보"""
+
+    def __init__(self, arcname, date_time, compress_type, offset, zip64, data_descriptor=True):
+        self.arcname = arcname
+        self.encoded_name, self.flags = _encode_name(arcname)
+        if data_descriptor:
+            self.flags |= FLAG_DATA_DESCRIPTOR
+        self.date, self.time = dos_datetime(date_time)
+        self.compress_type = compress_type
+        self.offset = offset
+        self.zip64 = zip64
+        self.crc = 0
+        self.compress_size = 0
+        self.file_size = 0
+        # 압축에 사용한 CPU 시간 (초)
+        self.cpu_time = 0.0
+
+    @property
+    def extract_version(self):
+        return 45 if self.zip64 else 20
+
+
+class CompressedData:
+    """compress_file() 결과 - 압축된 바이트(스풀 파일)와 CRC/크기 정보"""
+
+    def __init__(self, spool, compress_type, crc, file_size, compress_size, cpu_time):
+        self.spool = spool
+        self.compress_type = compress_type
+        self.crc = crc
+        self.file_size = file_size
+        self.compress_size = compress_size
+        self.cpu_time = cpu_time
+
+    def close(self):
+        self.spool.close()
+
+
+def compress_file(fileobj, compress_type=ZIP_DEFLATED, chunk_size=DEFAULT_CHUNK_SIZE,
+                  compresslevel=zlib.Z_DEFAULT_COMPRESSION, spool_max_size=SPOOL_MAX_SIZE):
+    """
+    파일을 블록 단위로 읽어 압축한 결과를 스풀 파일에 기록
+
+    zlib 압축과 CRC 계산은 GIL을 해제하므로 작업 스레드에서 병렬로 실행할 수 있습니다.
+    결과가 spool_max_size를 넘으면 디스크 임시 파일로 넘어가 메모리 사용량이 제한됩니다.
+    """
+    if compress_type == ZIP_DEFLATED:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    elif compress_type == ZIP_STORED:
+        compressor = None
+    else:
+        raise ValueError(f'지원하지 않는 압축 방식입니다: {compress_type}')
+
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+    crc = 0
+    file_size = 0
+    cpu_time = 0.0
+    try:
+        while True:
+            block = fileobj.read(chunk_size)
+            if not block:
+                break
+            file_size += len(block)
+            started = time.thread_time()
+            crc = zlib.crc32(block, crc)
+            data = compressor.compress(block) if compressor else block
+            cpu_time += time.thread_time() - started
+            spool.write(data)
+        if compressor:
+            started = time.thread_time()
+            spool.write(compressor.flush())
+            cpu_time += time.thread_time() - started
+    except BaseException:
+        spool.close()
+        raise
+    compress_size = spool.tell()
+    spool.seek(0)
+    return CompressedData(spool, compress_type, crc, file_size, compress_size, cpu_time)
+
+
+def _encode_name(arcname):
+    try:
+        return arcname.encode('ascii'), 0
+    except UnicodeEncodeError:
+        return arcname.encode('utf-8'), FLAG_UTF8
+
+
+class ZipStream:
+    """
+    시크 불가능한 출력(HTTP 응답 등)을 위한 ZIP 작성기
+
+    사용법:
+        stream = ZipStream()
+        for chunk in stream.write_file('a/b.pdf', fileobj, size=...):
+            yield chunk
+        yield from stream.close()
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, compresslevel=zlib.Z_DEFAULT_COMPRESSION):
+        self.chunk_size = chunk_size
+        self.compresslevel = compresslevel
+        self.entries = []
+        self.offset = 0
+
+    def _emit(self, data):
+        self.offset += len(data)
+        return data
+
+    def write_file(self, arcname, fileobj, size=None, date_time=None, compress_type=ZIP_DEFLATED):
+        """
+        파일 객체를 chunk_size 단위로 읽어 ZIP 항목으로 기록 (bytes 청크 제너레이터)
+
+        size를 알면 4GB 미만 항목에 ZIP64 확장을 생략해 호환성을 높입니다.
+        """
+        zip64 = size is None or size >= ZIP64_ENTRY_THRESHOLD
+        entry = ZipEntry(arcname, date_time or time.localtime()[:6], compress_type, self.offset, zip64)
+
+        yield self._emit(self._local_header(entry))
+
+        if compress_type == ZIP_DEFLATED:
+            compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, -15)
+        elif compress_type == ZIP_STORED:
+            compressor = None
+        else:
+            raise ValueError(f'지원하지 않는 압축 방식입니다: {compress_type}')
+
+        crc = 0
+        file_size = compress_size = 0
+        cpu_time = 0.0
+        while True:
+            block = fileobj.read(self.chunk_size)
+            if not block:
+                break
+            file_size += len(block)
+            started = time.thread_time()
+            crc = zlib.crc32(block, crc)
+            data = compressor.compress(block) if compressor else block
+            cpu_time += time.thread_time() - started
+            if data:
+                compress_size += len(data)
+                yield self._emit(data)
+        if compressor:
+            started = time.thread_time()
+            data = compressor.flush()
+            cpu_time += time.thread_time() - started
+            if data:
+                compress_size += len(data)
+                yield self._emit(data)
+
+        entry.cpu_time = cpu_time
+        entry.crc = crc
+        entry.file_size = file_size
+        entry.compress_size = compress_size
+        yield self._emit(self._data_descriptor(entry))
+        self.entries.append(entry)
+
+    def write_compressed(self, arcname, data, date_time=None):
+        """
+        compress_file()로 미리 압축한 항목 기록 (bytes 청크 제너레이터)
+
+        CRC와 크기를 이미 알고 있으므로 data descriptor 없이 로컬 헤더에 기록합니다.
+        """
+        zip64 = data.file_size >= ZIP64_ENTRY_THRESHOLD or data.compress_size >= ZIP64_ENTRY_THRESHOLD
+        entry = ZipEntry(arcname, date_time or time.localtime()[:6], data.compress_type,
+                         self.offset, zip64, data_descriptor=False)
+        entry.crc = data.crc
+        entry.file_size = data.file_size
+        entry.compress_size = data.compress_size
+        entry.cpu_time = data.cpu_time
+
+        yield self._emit(self._local_header(entry))
+        while True:
+            block = data.spool.read(self.chunk_size)
+            if not block:
+                break
+            yield self._emit(block)
+        self.entries.append(entry)
+
+    def _local_header(self, entry):
+        known_sizes = not entry.flags & FLAG_DATA_DESCRIPTOR
+        if entry.zip64:
+            # data descriptor를 쓰는 경우 실제 크기는 descriptor(8바이트 필드)에 기록
+            if known_sizes:
+                extra = struct.pack('<2H2Q', 0x0001, 16, entry.file_size, entry.compress_size)
+            else:
+                extra = struct.pack('<2H2Q', 0x0001, 16, 0, 0)
+            crc = entry.crc if known_sizes else 0
+            compress_size = file_size = ZIP32_LIMIT
+        elif known_sizes:
+            extra = b''
+            crc, compress_size, file_size = entry.crc, entry.compress_size, entry.file_size
+        else:
+            extra = b''
+            crc = compress_size = file_size = 0
+        header = LOCAL_HEADER.pack(
+            b'PK\x03\x04', entry.extract_version, 0, entry.flags, entry.compress_type,
+            entry.time, entry.date, crc, compress_size, file_size,
+            len(entry.encoded_name), len(extra),
+        )
+        return header + entry.encoded_name + extra
+
+    def _data_descriptor(self, entry):
+        if entry.zip64:
+            return DATA_DESCRIPTOR64.pack(b'PK\x07\x08', entry.crc, entry.compress_size, entry.file_size)
+        if entry.compress_size > ZIP32_LIMIT or entry.file_size > ZIP32_LIMIT:
+            raise ValueError(f'{entry.arcname}: 선언된 크기보다 큰 파일입니다.')
+        return DATA_DESCRIPTOR.pack(b'PK\x07\x08', entry.crc, entry.compress_size, entry.file_size)
+
+    def _central_dir_record(self, entry):
+        extra_values = []
+        file_size, compress_size, offset = entry.file_size, entry.compress_size, entry.offset
+        if file_size >= ZIP32_LIMIT:
+            extra_values.append(file_size)
+            file_size = ZIP32_LIMIT
+        if compress_size >= ZIP32_LIMIT:
+            extra_values.append(compress_size)
+            compress_size = ZIP32_LIMIT
+        if offset >= ZIP32_LIMIT:
+            extra_values.append(offset)
+            offset = ZIP32_LIMIT
+        extra = b''
+        if extra_values:
+            extra = struct.pack(f'<2H{len(extra_values)}Q', 0x0001, 8 * len(extra_values), *extra_values)
+        version = 45 if extra_values or entry.zip64 else 20
+        record = CENTRAL_DIR.pack(
+            b'PK\x01\x02', version, 0, version, 0, entry.flags, entry.compress_type,
+            entry.time, entry.date, entry.crc, compress_size, file_size,
+            len(entry.encoded_name), len(extra), 0, 0, 0, 0, offset,
+        )
+        return record + entry.encoded_name + extra
+
+    def close(self):
+        """중앙 디렉터리와 종료 레코드 기록 (bytes 청크 제너레이터)"""
+        cd_offset = self.offset
+        for entry in self.entries:
+            yield self._emit(self._central_dir_record(entry))
+        cd_size = self.offset - cd_offset
+        count = len(self.entries)
+
+        if count >= ZIP32_COUNT_LIMIT or cd_offset >= ZIP32_LIMIT or cd_size >= ZIP32_LIMIT:
+            eocd64_offset = self.offset
+            yield self._emit(END_OF_CENTRAL_DIR64.pack(
+                b'PK\x06\x06', END_OF_CENTRAL_DIR64.size - 12, 45, 45, 0, 0,
+                count, count, cd_size, cd_offset,
+            ))
+            yield self._emit(END_OF_CENTRAL_DIR64_LOCATOR.pack(b'PK\x06\x07', 0, eocd64_offset, 1))
+            count = min(count, ZIP32_COUNT_LIMIT)
+            cd_size = min(cd_size, ZIP32_LIMIT)
+            cd_offset = min(cd_offset, ZIP32_LIMIT)
+
+        yield self._emit(END_OF_CENTRAL_DIR.pack(
+            b'PK\x05\x06', 0, 0, count, count, cd_size, cd_offset, 0,
+        ))
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
+import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -80,11 +81,45 @@ WSGI_APPLICATION = 'docsparrow.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# 환경 변수 DB_ENGINE으로 선택 (artifacts.db 참고)
+# - 'sqlite'     : DB_NAME 파일 (기본 BASE_DIR/db.sqlite3), 연결 시 SQLITE_PRAGMAS 적용
+# - 'postgresql' : DB_NAME/DB_USER/DB_PASSWORD/DB_HOST/DB_PORT 사용, psycopg 패키지 필요
+# DB_CONN_MAX_AGE: 연결 재사용 시간(초), 요청마다 연결을 새로 여는 비용 제거 (0이면 요청마다 닫음)
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'docsparrow'),
+            'USER': os.getenv('DB_USER', 'docsparrow'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            # 쓰기 트랜잭션이 시작 시점에 잠금을 잡아, 읽다가 쓰기로 바뀔 때 busy_timeout 없이 실패하는 경우 방지
+            # (Django 5.1+)
+            'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+        }
     }
+
+# SQLite 연결마다 적용할 PRAGMA (artifacts.db 참고)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 10000,  # ms
+    'mmap_size': 256 * 1024 * 1024,  # bytes
 }
 
 
@@ -128,6 +163,90 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 개별 다운로드 파일 전송 방식 (artifacts.downloads 참고)
+# - 'django'     : Django가 직접 전송 (WSGI 서버가 지원하면 os.sendfile 사용)
+# - 'x-accel'    : nginx X-Accel-Redirect, DOWNLOAD_ACCEL_REDIRECT_PREFIX는 MEDIA_ROOT를 가리키는 internal location
+# - 'x-sendfile' : Apache mod_xsendfile / lighttpd X-Sendfile
+DOWNLOAD_BACKEND = 'django'
+DOWNLOAD_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+# 일괄 다운로드(ZIP 스트리밍) 시 파일을 읽는 블록 크기 (bytes)
+BULK_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# 완성된 일괄 다운로드 킷 캐시 (MEDIA_ROOT 하위 디렉토리)
+# 전체 용량이 예산을 넘으면 오래 사용되지 않은 킷부터 삭제, 0이면 캐시 사용 안 함
+BULK_KIT_CACHE_DIR = 'bulk_kits'
+BULK_KIT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+
+# 일괄 다운로드 ZIP 항목별 압축 방식
+# - BULK_ZIP_STORED_EXTENSIONS: 이미 압축된 형식, 무압축(STORED)으로 저장
+#   (미지정 시 artifacts.bulk_kits.DEFAULT_STORED_EXTENSIONS 사용)
+# - BULK_ZIP_DEFLATED_EXTENSIONS: 항상 압축할 확장자 (위 목록보다 우선)
+# - 그 외 파일은 앞부분 BULK_ZIP_SAMPLE_SIZE 바이트를 압축해 보고
+#   절감률이 BULK_ZIP_MIN_SAVINGS 미만이면 무압축으로 저장
+BULK_ZIP_DEFLATED_EXTENSIONS = []
+BULK_ZIP_SAMPLE_SIZE = 64 * 1024
+BULK_ZIP_MIN_SAVINGS = 0.1
+
+# 일괄 다운로드 ZIP 생성 시 deflate 항목의 읽기/압축 병렬 작업 스레드 수 (1이면 순차 처리)
+# 요청마다 스레드를 만들므로 CPU 여유가 있고 압축되는 파일이 많을 때만 늘림
+BULK_ZIP_WORKERS = 1
+
+# 업로드 파일을 받으면서 SHA-256 계산 (Blob 중복 제거용, artifacts.blobs 참고)
+FILE_UPLOAD_HANDLERS = [
+    'artifacts.blobs.HashingMemoryFileUploadHandler',
+    'artifacts.blobs.HashingTemporaryFileUploadHandler',
+]
+
+# 분할(재개 가능) 업로드 (artifacts.uploads 참고)
+# 업로드 중인 파일은 MEDIA_ROOT/UPLOAD_STAGING_DIR에 이어 쓰고, 완료되면 저장 위치로 이동
+# UPLOAD_CHUNK_SIZE: PUT 요청 하나의 최대 크기 (nginx client_max_body_size보다 작아야 함)
+# UPLOAD_SESSION_EXPIRE_HOURS: 마지막 수신 후 이 시간이 지난 세션은 prune_upload_sessions 명령으로 삭제
+UPLOAD_STAGING_DIR = 'upload_staging'
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_SESSION_EXPIRE_HOURS = 24
+
+# 한 번의 multipart 업로드에서 파일 내용 전에 검사할 본문 앞부분 크기 (폼 필드 + 파일 파트 헤더)
+# 해당 없음 셀, 파일명 양식, 중복 버전이면 파일 내용을 받지 않고 바로 거부 (uploads.UploadPreflightHandler)
+UPLOAD_PREFLIGHT_BYTES = 64 * 1024
+
+# 업로드 후 처리 작업 큐 (artifacts.jobs 참고, process_jobs 명령이 처리)
+# 실패하면 JOB_RETRY_BASE_DELAY초부터 두 배씩(최대 JOB_RETRY_MAX_DELAY초) 늘려 재시도, JOB_MAX_ATTEMPTS번 실패하면 중단
+# JOB_LOCK_TIMEOUT: 워커가 이 시간(초) 넘게 처리 중인 작업은 비정상 종료로 보고 다시 대기 상태로 돌림
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_DELAY = 30
+JOB_RETRY_MAX_DELAY = 3600
+JOB_LOCK_TIMEOUT = 600
+JOB_POLL_INTERVAL = 2
+# 페이지 수/썸네일/본문 추출 시 읽을 최대 크기(바이트): PDF 파일, zip 파트의 압축 해제 크기, 압축을 푼 PDF 스트림 합계
+EXTRACT_MAX_BYTES = 64 * 1024 * 1024
+
+# 산출물 내용 검색 (artifacts.search.search_artifacts)
+# SEARCH_TEXT_MAX_CHARS: 파일당 색인할 본문 최대 글자 수, SEARCH_RESULTS_LIMIT: 검색 결과 최대 건수
+SEARCH_TEXT_MAX_CHARS = 1000000
+SEARCH_RESULTS_LIMIT = 20
+
+# 감사 로그(로그인/다운로드/파일 활동) 기록 방식 (artifacts.audit 참고)
+# - 'async' : 프로세스 내 버퍼에 모아 백그라운드 스레드가 bulk_create (요청이 로그 쓰기를 기다리지 않음)
+#             AUDIT_LOG_BATCH_SIZE건 또는 AUDIT_LOG_FLUSH_INTERVAL초마다 기록, 종료 시 남은 로그 기록
+#             프로세스가 강제 종료되면 마지막 주기의 로그는 유실될 수 있음
+# - 'sync'  : 요청 안에서 즉시 기록 (유실 없음)
+AUDIT_LOG_MODE = 'async'
+AUDIT_LOG_BATCH_SIZE = 100
+AUDIT_LOG_FLUSH_INTERVAL = 1.0  # seconds
+AUDIT_LOG_MAX_PENDING = 10000  # 버퍼가 이만큼 쌓이면 요청 스레드에서 직접 기록
+
+# 감사 로그 보관 기간 (prune_audit_logs 명령, artifacts.retention 참고)
+# 기간이 지난 로그는 일별 집계(DailyActivityRollup)로 남기고 AUDIT_ARCHIVE_DIR에 gzip JSONL로 내보낸 뒤 삭제
+AUDIT_RETENTION_DAYS = 365
+AUDIT_ARCHIVE_DIR = BASE_DIR / 'archive'
+AUDIT_RETENTION_BATCH_SIZE = 500  # 삭제 트랜잭션 하나당 행 수 (쓰기 잠금 시간 제한)
+
+# 로그 화면 사용자명/제품명 검색 기본 방식 (artifacts.search 참고)
+# - 'prefix'   : 앞부분 일치, LOWER(username) 표현식 인덱스 범위 조회 (대소문자 무시)
+# - 'contains' : 부분 일치, SQLite FTS5 trigram 보조 인덱스 사용 (없으면 icontains)
+LOG_SEARCH_MATCH = 'prefix'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -137,16 +256,43 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CACHE CONFIGURATION
 # ==============================================================================
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'docsparrow-cache',
-        'TIMEOUT': 300,  # 5 minutes default
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000
+# 환경 변수 CACHE_BACKEND로 선택
+# - 'sqlite' : 같은 서버의 모든 gunicorn 워커가 CACHE_LOCATION 파일을 공유 (artifacts.cache_backends 참고)
+#              세대 카운터 무효화가 모든 워커에 바로 반영됨, MAX_SIZE(bytes)를 넘으면 오래된 항목부터 삭제
+# - 'locmem' : 프로세스별 메모리 캐시 (워커가 1개일 때만 사용)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'sqlite')
+
+if CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'docsparrow-cache',
+            'TIMEOUT': 300,  # 5 minutes default
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000
+            }
         }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'artifacts.cache_backends.SQLiteCache',
+            'LOCATION': os.getenv('CACHE_LOCATION') or BASE_DIR / 'cache.sqlite3',
+            'TIMEOUT': 300,  # 5 minutes default
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000,
+                'MAX_SIZE': 64 * 1024 * 1024,  # bytes
+            }
+        }
+    }
+
+# 테스트는 위 설정 대신 메모리 캐시 사용 (cache.sqlite3 파일을 건드리지 않음)
+TEST_RUNNER = 'artifacts.test_runner.TestRunner'
+
+# 대시보드 매트릭스 캐시 보관 시간 (초)
+# 최신성은 세대 카운터(artifacts.matrix.invalidate_matrix_cache)로 보장되며,
+# 이 값은 지난 세대 항목을 정리하기 위한 용도입니다.
+MATRIX_CACHE_TIMEOUT = 60 * 60 * 24
 
 # Cache middleware settings
 CACHE_MIDDLEWARE_ALIAS = 'default'